@@ -11,9 +11,18 @@ EXISTING PICKS ANALYSIS:
 - Need 6 new pairs using all remaining euro combinations
 """
 
+import os
 import random
+import sys
 from itertools import combinations
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data_Analysis'))
+from game_config import EUROJACKPOT
+
+# Game the picks are generated for; euro groups have euro_drawn numbers and
+# euro_total / euro_drawn new groups cover every euro number once
+GAME = EUROJACKPOT
+
 def parse_existing_picks():
     """Parse the existing 12 picks."""
     existing_picks = [
@@ -66,14 +75,17 @@ def get_forbidden_main_numbers(existing_picks, new_euro_numbers):
     
     return forbidden_numbers
 
-def generate_new_euro_pairs(used_pairs):
+def generate_new_euro_pairs(used_pairs, game=GAME):
     """
     Generate 6 new euro pairs that:
     1. Are different from existing pairs
     2. Use all 12 euro numbers exactly once
     """
+    euro_total = game['euro_total']
+    n_pairs = euro_total // game['euro_drawn']
+    
     # Get all possible euro pairs
-    all_possible_pairs = list(combinations(range(1, 13), 2))
+    all_possible_pairs = list(combinations(range(1, euro_total + 1), game['euro_drawn']))
     
     # Remove already used pairs
     available_pairs = [pair for pair in all_possible_pairs if pair not in used_pairs]
@@ -85,33 +97,33 @@ def generate_new_euro_pairs(used_pairs):
     max_attempts = 10000
     for attempt in range(max_attempts):
         # Randomly select 6 pairs
-        if len(available_pairs) < 6:
+        if len(available_pairs) < n_pairs:
             raise Exception("Not enough available pairs")
             
-        candidate_pairs = random.sample(available_pairs, 6)
+        candidate_pairs = random.sample(available_pairs, n_pairs)
         
         # Check if all 12 euro numbers are used
         used_euros = set()
         for pair in candidate_pairs:
             used_euros.update(pair)
         
-        if len(used_euros) == 12:  # All euro numbers used
+        if len(used_euros) == euro_total:  # All euro numbers used
             return candidate_pairs
     
     # If no valid combination found, try systematic approach
     print("Random approach failed, trying systematic approach...")
     
     # Try to find valid combination systematically
-    for combo in combinations(available_pairs, 6):
+    for combo in combinations(available_pairs, n_pairs):
         used_euros = set()
         for pair in combo:
             used_euros.update(pair)
-        if len(used_euros) == 12:
+        if len(used_euros) == euro_total:
             return list(combo)
     
-    raise Exception("Could not find 6 euro pairs that use all 12 numbers")
+    raise Exception(f"Could not find {n_pairs} euro pairs that use all {euro_total} numbers")
 
-def generate_6_additional_picks():
+def generate_6_additional_picks(game=GAME):
     """Generate 6 additional picks with the specified constraints."""
     existing_picks = parse_existing_picks()
     
@@ -129,7 +141,7 @@ def generate_6_additional_picks():
     print("GENERATING NEW EURO PAIRS")
     print("="*60)
     
-    new_euro_pairs = generate_new_euro_pairs(used_euro_pairs)
+    new_euro_pairs = generate_new_euro_pairs(used_euro_pairs, game)
     print(f"\nSelected new euro pairs: {new_euro_pairs}")
     
     # Verify all 12 euro numbers are used
@@ -137,7 +149,7 @@ def generate_6_additional_picks():
     for pair in new_euro_pairs:
         all_euros_in_new.update(pair)
     print(f"Euro numbers in new pairs: {sorted(all_euros_in_new)}")
-    print(f"All 12 euro numbers used: {len(all_euros_in_new) == 12}")
+    print(f"All {game['euro_total']} euro numbers used: {len(all_euros_in_new) == game['euro_total']}")
     
     # Generate picks
     print(f"\n" + "="*60)
@@ -153,16 +165,17 @@ def generate_6_additional_picks():
         forbidden_numbers = get_forbidden_main_numbers(existing_picks, euro_pair)
         
         # Get available main numbers
-        available_numbers = [num for num in range(1, 51) if num not in forbidden_numbers]
+        available_numbers = [num for num in range(1, game['main_total'] + 1) if num not in forbidden_numbers]
         
         print(f"  Forbidden main numbers: {sorted(forbidden_numbers)} (total: {len(forbidden_numbers)})")
         print(f"  Available main numbers: {len(available_numbers)} numbers")
         
-        if len(available_numbers) < 5:
-            raise Exception(f"Not enough available main numbers for pick {13+i}. Need 5, have {len(available_numbers)}")
+        if len(available_numbers) < game['main_drawn']:
+            raise Exception(f"Not enough available main numbers for pick {13+i}. "
+                            f"Need {game['main_drawn']}, have {len(available_numbers)}")
         
         # Generate 5 random main numbers from available ones
-        main_numbers = sorted(random.sample(available_numbers, 5))
+        main_numbers = sorted(random.sample(available_numbers, game['main_drawn']))
         
         pick = {
             'pick_number': 13 + i,
@@ -183,7 +196,7 @@ def display_pick(pick):
     euro_str = ' '.join(f"{num:2d}" for num in pick['euro_numbers'])
     print(f"Pick {pick['pick_number']:2d}: Main: {main_str} | Euro: {euro_str}")
 
-def verify_constraints(existing_picks, new_picks):
+def verify_constraints(existing_picks, new_picks, game=GAME):
     """Verify all constraints are met."""
     print(f"\n" + "="*60)
     print("CONSTRAINT VERIFICATION")
@@ -209,9 +222,9 @@ def verify_constraints(existing_picks, new_picks):
     for pick in new_picks:
         all_euros_in_new.update(pick['euro_numbers'])
     
-    print(f"\n2. All 12 euro numbers used in new picks:")
+    print(f"\n2. All {game['euro_total']} euro numbers used in new picks:")
     print(f"   Euro numbers in new picks: {sorted(all_euros_in_new)}")
-    print(f"   ✓ Constraint satisfied: {len(all_euros_in_new) == 12}")
+    print(f"   ✓ Constraint satisfied: {len(all_euros_in_new) == game['euro_total']}")
     
     # Constraint 3: Main numbers different from overlapping picks
     print(f"\n3. Main number constraints:")
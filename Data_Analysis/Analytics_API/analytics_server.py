@@ -0,0 +1,316 @@
+"""
+Local JSON API for parameterized analytics queries.
+
+The draw history is loaded once into memory together with prefix sums of
+the number indicators, so frequency queries for any date range are two
+lookups and a subtraction. Responses are cached (LRU) and carry an ETag.
+Queries are computed in worker threads, so a slow backtest does not block
+other connections, and a semaphore limits how many run at the same time.
+
+Endpoints:
+  GET /health
+  GET /frequencies?start=2022-03-25&end=2025-08-29
+  GET /sums?era=2022_present
+  GET /backtest?main=3,5,19,23,48&euro=1,5&start=2022-03-25
+  GET /segments?by=weekday&start=2022-03-25
+  GET /segments?bins=2012-01-01,2020-01-01,2026-01-01
+
+Usage: python Data_Analysis/Analytics_API/analytics_server.py [port]
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import traceback
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+sys.path.insert(0, os.path.join(base_dir, '..', 'Segment_Analysis'))
+sys.path.insert(0, os.path.join(base_dir, '..', 'Sum_Number_Analysis'))
+
+from bitmask import encode, popcount, to_indicator
+from data_validation import DataValidationError
+from draw_store import DrawStore, DRAWING_RESULTS_FILE
+from game_config import (
+    MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN,
+    EURO_ERAS, PRIZE_CLASSES, get_era, prize_class_lookup
+)
+from segment_analysis import SEGMENTS, date_bins, segment_aggregates, segments_to_json
+from sum_number_analysis import theoretical_sum_distribution
+
+HOST = '127.0.0.1'
+PORT = 8765
+
+RESPONSE_CACHE_SIZE = 512
+MAX_CONCURRENT_REQUESTS = 32
+MAX_EURO_NUMBER = max(era['max_euro'] for era in EURO_ERAS)
+
+
+class QueryError(Exception):
+    """Invalid query parameters, answered with 400"""
+
+
+def sum_distribution_payload(n_total, drawn):
+    """JSON payload of the exact sum distribution of `drawn` distinct numbers from 1..n_total"""
+    distribution = theoretical_sum_distribution(n_total, drawn)
+    return {
+        'sum': distribution['sum'].tolist(),
+        'probability': distribution['probability'].tolist(),
+        'count': distribution['count'].tolist()
+    }
+
+
+class AnalyticsStore:
+    """Draw history plus precomputed aggregates, shared by all requests"""
+
+    def __init__(self, draws):
+        self.draws = draws
+        self.dates = draws.dates
+        self.eras = draws.era_names()
+        self.main_masks = encode(draws.main)
+        self.euro_masks = encode(draws.euro)
+        self.main_sums = draws.main.sum(axis=1).astype(np.int64)
+        self.euro_sums = draws.euro.sum(axis=1).astype(np.int64)
+
+        # Prefix sums: frequencies of draws [i, j) are prefix[j] - prefix[i]
+        main_indicator = to_indicator(self.main_masks, MAIN_NUMBERS_TOTAL).astype(np.int64)
+        euro_indicator = to_indicator(self.euro_masks, MAX_EURO_NUMBER).astype(np.int64)
+        self.main_prefix = np.vstack([np.zeros(MAIN_NUMBERS_TOTAL, dtype=np.int64), main_indicator.cumsum(axis=0)])
+        self.euro_prefix = np.vstack([np.zeros(MAX_EURO_NUMBER, dtype=np.int64), euro_indicator.cumsum(axis=0)])
+
+    def date_range(self, params):
+        """Row range [first, last) selected by optional start/end query dates"""
+        try:
+            start = np.datetime64(params.get('start', [str(self.dates[0])])[0], 'D')
+            end = np.datetime64(params.get('end', [str(self.dates[-1])])[0], 'D')
+        except ValueError:
+            raise QueryError("Dates must be formatted as YYYY-MM-DD")
+        first = int(np.searchsorted(self.dates, start, side='left'))
+        last = int(np.searchsorted(self.dates, end, side='right'))
+        return first, max(first, last)
+
+    def frequencies(self, params):
+        first, last = self.date_range(params)
+        main = self.main_prefix[last] - self.main_prefix[first]
+        euro = self.euro_prefix[last] - self.euro_prefix[first]
+        eras = sorted(set(self.eras[first:last]))
+        return {
+            'draws': last - first,
+            'start': str(self.dates[first]) if last > first else None,
+            'end': str(self.dates[last - 1]) if last > first else None,
+            'eras': eras,
+            'main': {'numbers': list(range(1, MAIN_NUMBERS_TOTAL + 1)), 'absoluteFrequency': main.tolist()},
+            'euro': {'numbers': list(range(1, MAX_EURO_NUMBER + 1)), 'absoluteFrequency': euro.tolist()}
+        }
+
+    def sums(self, params):
+        era_name = params.get('era', [EURO_ERAS[-1]['name']])[0]
+        try:
+            era = get_era(era_name)
+        except KeyError:
+            raise QueryError(f"Unknown era '{era_name}', expected one of {[e['name'] for e in EURO_ERAS]}")
+        selected = self.eras == era['name']
+
+        def empirical(values):
+            sums, counts = np.unique(values, return_counts=True)
+            return {'sum': sums.tolist(), 'frequency': counts.tolist(),
+                    'probability': (counts / max(len(values), 1)).tolist()}
+
+        return {
+            'era': era['name'],
+            'draws': int(selected.sum()),
+            'main': {
+                'empirical': empirical(self.main_sums[selected]),
+                'theoretical': sum_distribution_payload(MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN)
+            },
+            'euro': {
+                'empirical': empirical(self.euro_sums[selected]),
+                'theoretical': sum_distribution_payload(era['max_euro'], EURO_NUMBERS_DRAWN)
+            }
+        }
+
+    def backtest(self, params):
+        try:
+            main = sorted({int(n) for n in params['main'][0].split(',')})
+            euro = sorted({int(n) for n in params['euro'][0].split(',')})
+        except (KeyError, ValueError):
+            raise QueryError("Parameters 'main' and 'euro' must be comma separated numbers")
+        if len(main) != MAIN_NUMBERS_DRAWN or not all(1 <= n <= MAIN_NUMBERS_TOTAL for n in main):
+            raise QueryError(f"'main' needs {MAIN_NUMBERS_DRAWN} distinct numbers from 1-{MAIN_NUMBERS_TOTAL}")
+        if len(euro) != EURO_NUMBERS_DRAWN or not all(1 <= n <= MAX_EURO_NUMBER for n in euro):
+            raise QueryError(f"'euro' needs {EURO_NUMBERS_DRAWN} distinct numbers from 1-{MAX_EURO_NUMBER}")
+
+        first, last = self.date_range(params)
+        ticket_main = encode([main])[0]
+        ticket_euro = encode([euro])[0]
+        main_hits = popcount(self.main_masks[first:last] & ticket_main).astype(np.int64)
+        euro_hits = popcount(self.euro_masks[first:last] & ticket_euro).astype(np.int64)
+
+        classes = prize_class_lookup()[main_hits, euro_hits]
+        class_counts = np.bincount(classes, minlength=len(PRIZE_CLASSES) + 1)
+
+        winning = np.nonzero(classes)[0]
+        return {
+            'ticket': {'main': main, 'euro': euro},
+            'draws': last - first,
+            'prizeClassCounts': {f"{m}+{e}": int(class_counts[i])
+                                 for i, (m, e) in enumerate(PRIZE_CLASSES, start=1)},
+            'winningDraws': [
+                {'id': int(self.draws.ids[first + i]), 'date': str(self.dates[first + i]),
+                 'priceCategory': int(classes[i])}
+                for i in winning
+            ]
+        }
+
+    def segments(self, params):
+        first, last = self.date_range(params)
+        if 'bins' in params:
+            try:
+                by = date_bins(params['bins'][0].split(','))
+            except ValueError:
+                raise QueryError("'bins' must be comma separated dates formatted as YYYY-MM-DD")
+            name = 'bins'
+        else:
+            name = params.get('by', ['weekday'])[0]
+            if name not in SEGMENTS:
+                raise QueryError(f"Unknown segmentation '{name}', expected one of {list(SEGMENTS)} or bins")
+            by = name
+
+        selected = DrawStore(self.draws.ids[first:last], self.dates[first:last],
+                             self.draws.main[first:last], self.draws.euro[first:last])
+        return {
+            'by': name,
+            'draws': last - first,
+            'groups': segments_to_json(segment_aggregates(selected, by))
+        }
+
+
+class AnalyticsServer:
+    """Minimal HTTP/1.1 server on asyncio streams with response cache and ETags"""
+
+    def __init__(self, store, cache_size=RESPONSE_CACHE_SIZE, max_concurrent=MAX_CONCURRENT_REQUESTS):
+        self.store = store
+        self.routes = {
+            '/health': lambda params: {'status': 'ok', 'draws': len(store.draws)},
+            '/frequencies': store.frequencies,
+            '/sums': store.sums,
+            '/backtest': store.backtest,
+            '/segments': store.segments
+        }
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.cache_size = cache_size
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    def cache_key(self, path, params):
+        return path + '?' + '&'.join(f"{key}={','.join(values)}" for key, values in sorted(params.items()))
+
+    def respond(self, path, params):
+        """
+        Return (status, body, etag), using the LRU response cache. Runs in a
+        worker thread; failures other than QueryError are answered with 500.
+        """
+        key = self.cache_key(path, params)
+        with self.cache_lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                return cached
+
+        handler = self.routes.get(path)
+        if handler is None:
+            return 404, json.dumps({'error': f"Unknown endpoint {path}"}).encode(), None
+        try:
+            body = json.dumps(handler(params), separators=(',', ':')).encode()
+        except QueryError as e:
+            return 400, json.dumps({'error': str(e)}).encode(), None
+        except Exception as e:
+            traceback.print_exc()
+            return 500, json.dumps({'error': f"Internal error: {type(e).__name__}"}).encode(), None
+
+        result = (200, body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        with self.cache_lock:
+            self.cache[key] = result
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return result
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    await self.send(writer, 400, json.dumps({'error': 'Malformed request'}).encode())
+                    break
+
+                if method != 'GET':
+                    await self.send(writer, 405, json.dumps({'error': 'Only GET is supported'}).encode())
+                else:
+                    url = urlsplit(target)
+                    async with self.semaphore:
+                        status, body, etag = await asyncio.to_thread(self.respond, url.path, parse_qs(url.query))
+                    if etag is not None and headers.get('if-none-match') == etag:
+                        await self.send(writer, 304, b'', etag)
+                    else:
+                        await self.send(writer, status, body, etag)
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, body, etag=None):
+        reasons = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                   500: 'Internal Server Error'}
+        head = [f"HTTP/1.1 {status} {reasons[status]}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}",
+                "Access-Control-Allow-Origin: *",
+                "Cache-Control: no-cache"]
+        if etag is not None:
+            head.append(f"ETag: {etag}")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+
+
+async def serve(host=HOST, port=PORT, data_file=DRAWING_RESULTS_FILE):
+    store = AnalyticsStore(DrawStore.load_validated(data_file))
+    server = AnalyticsServer(store)
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Loaded {len(store.draws)} draws from {data_file}")
+    print(f"Serving analytics on http://{host}:{port}/")
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    try:
+        asyncio.run(serve(port=port))
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+    except DataValidationError as e:
+        print(f"Error: The file {DRAWING_RESULTS_FILE} failed validation")
+        print(e)
+        raise SystemExit(1)
@@ -0,0 +1,121 @@
+"""
+Load test for analytics_server.py.
+
+Opens a number of keep-alive connections and sends a mix of queries,
+then reports throughput and p50/p99 latency per endpoint.
+
+Usage: python Data_Analysis/Analytics_API/load_test.py [requests] [concurrency] [port]
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+import numpy as np
+
+HOST = '127.0.0.1'
+PORT = 8765
+
+
+def build_queries(count, seed=42):
+    """Random mix of frequency, sum, backtest and segment queries"""
+    rng = random.Random(seed)
+    years = list(range(2012, 2026))
+    eras = ['2012_2014', '2014_2022', '2022_present']
+    queries = []
+    for _ in range(count):
+        kind = rng.choice(['frequencies', 'sums', 'backtest', 'segments'])
+        if kind == 'frequencies':
+            start, end = sorted(rng.sample(years, 2))
+            queries.append(('frequencies', f"/frequencies?start={start}-01-01&end={end}-12-31"))
+        elif kind == 'sums':
+            queries.append(('sums', f"/sums?era={rng.choice(eras)}"))
+        elif kind == 'segments':
+            by = rng.choice(['weekday', 'year', 'month', 'season', 'era'])
+            queries.append(('segments', f"/segments?by={by}&start={rng.choice(years)}-01-01"))
+        else:
+            main = ','.join(str(n) for n in sorted(rng.sample(range(1, 51), 5)))
+            euro = ','.join(str(n) for n in sorted(rng.sample(range(1, 13), 2)))
+            queries.append(('backtest', f"/backtest?main={main}&euro={euro}"))
+    return queries
+
+
+async def fetch(reader, writer, path):
+    """Send one GET on an open connection and return (status, latency)"""
+    started = time.perf_counter()
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode())
+    await writer.drain()
+
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value.strip())
+    await reader.readexactly(length)
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+async def worker(queue, results, port):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        while True:
+            try:
+                kind, path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            status, latency = await fetch(reader, writer, path)
+            results.append((kind, status, latency))
+    finally:
+        writer.close()
+
+
+async def run_load_test(total_requests, concurrency, port):
+    queue = asyncio.Queue()
+    for query in build_queries(total_requests):
+        queue.put_nowait(query)
+
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(queue, results, port) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def report(results, elapsed):
+    print("\n" + "="*60)
+    print("LOAD TEST RESULTS")
+    print("="*60)
+    print(f"Requests: {len(results)} in {elapsed:.2f}s ({len(results) / elapsed:,.0f} req/s)")
+    failed = sum(1 for _, status, _ in results if status != 200)
+    print(f"Non-200 responses: {failed}")
+
+    kinds = ['all'] + sorted({kind for kind, _, _ in results})
+    for kind in kinds:
+        latencies = np.array([latency for k, _, latency in results if kind in ('all', k)]) * 1000
+        if len(latencies) == 0:
+            continue
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"  {kind:12s} n={len(latencies):6d}  p50={p50:7.2f} ms  p99={p99:7.2f} ms")
+
+
+def main():
+    total_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    port = int(sys.argv[3]) if len(sys.argv) > 3 else PORT
+
+    print(f"Sending {total_requests} requests with {concurrency} connections to {HOST}:{port}")
+    try:
+        results, elapsed = asyncio.run(run_load_test(total_requests, concurrency, port))
+    except ConnectionRefusedError:
+        print("Error: Could not connect - start analytics_server.py first")
+        return
+    report(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
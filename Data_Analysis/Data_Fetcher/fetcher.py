@@ -0,0 +1,352 @@
+"""
+Asynchronous fetcher for new draws and prize breakdowns.
+
+Missing draws and prize tables are requested concurrently through an
+aiohttp session that keeps at most --pool connections alive. Every
+response's ETag/Last-Modified is stored, so repeated runs send
+conditional requests and unchanged resources cost a 304. Connection
+errors, timeouts and 429/5xx answers are retried with exponential backoff
+and jitter, honoring Retry-After.
+
+Fetched rows go through the regular ingestion path: draws are validated
+and appended to the versioned history, prize rows are joined to the
+draws in a PrizeStore and saved to price_breakdown.csv.
+
+Providers are pluggable: subclass JsonDrawSource and override the paths
+and parse_* methods. The default layout is the one of mock_server.py.
+
+Usage:
+  python Data_Analysis/Data_Fetcher/fetcher.py URL [--publish VERSION] [--pool N] [--data-dir DIR]
+  python Data_Analysis/Data_Fetcher/fetcher.py --benchmark [--latency MS] [--failure-rate P] [--pool N]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import aiohttp
+import pandas as pd
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from draw_store import DATA_DIR, PrizeStore, PAYOUT_COLUMNS, WINNER_COLUMNS
+from game_config import MAIN_COLUMNS, EURO_COLUMNS, PRIZE_CLASSES
+from memo_cache import CACHE_DIR
+from versioned_dataset import VersionedDataset
+
+FETCH_STATE_FILE = os.path.join(CACHE_DIR, 'fetch_state.json')
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_TIMEOUT = 10.0
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Prize tables the provider did not have are asked for again only for the newest draws
+PRIZE_RECHECK_DRAWS = 4
+
+
+class FetchError(Exception):
+    """A request that still failed after all retries"""
+
+
+class JsonDrawSource:
+    """Paths and payload parsing of a provider, here the JSON layout of mock_server.py"""
+
+    index_path = '/draws'
+
+    def draw_path(self, draw_id):
+        return f'/draws/{draw_id}'
+
+    def prize_path(self, draw_id):
+        return f'/prizes/{draw_id}'
+
+    def parse_index(self, payload):
+        """Draw ids offered by the provider"""
+        return sorted(int(entry['id']) for entry in payload['draws'])
+
+    def parse_draw(self, payload):
+        """One row in drawing_results.csv layout"""
+        row = {'id': int(payload['id']), 'Datum': str(payload['date'])[:10]}
+        row.update(zip(MAIN_COLUMNS, (int(n) for n in payload['main'])))
+        row.update(zip(EURO_COLUMNS, (int(n) for n in payload['euro'])))
+        return row
+
+    def parse_prizes(self, payload):
+        """One row in price_breakdown.csv layout"""
+        classes = sorted(payload['classes'], key=lambda entry: entry['class'])
+        if len(classes) != len(PRIZE_CLASSES):
+            raise ValueError(f"Draw {payload['id']}: {len(classes)} prize classes, expected {len(PRIZE_CLASSES)}")
+        row = {'id': int(payload['id'])}
+        row.update(zip(PAYOUT_COLUMNS, (float(entry['prize']) for entry in classes)))
+        row.update(zip(WINNER_COLUMNS, (int(entry['winners']) for entry in classes)))
+        return row
+
+
+class DrawFetcher:
+    """
+    Fetches what the local data is missing. Validators and bodies of
+    earlier responses are kept in `state_file` for conditional requests,
+    together with the draws the provider has no prize table for.
+    """
+
+    def __init__(self, url, source=None, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF_BASE, state_file=FETCH_STATE_FILE, seed=None):
+        self.url = url.rstrip('/')
+        self.source = source or JsonDrawSource()
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.state_file = state_file
+        self.rng = random.Random(seed)
+        self.state = self._load_state()
+        self.stats = {'requests': 0, 'retries': 0, 'not_modified': 0, 'not_found': 0}
+        # Messages of requests that failed for good in the last fetch_missing
+        self.failures = []
+        self.session = None
+
+    def _load_state(self):
+        state = {'responses': {}, 'unavailable_prizes': []}
+        if self.state_file is not None and os.path.exists(self.state_file):
+            with open(self.state_file, encoding='utf-8') as f:
+                state.update(json.load(f).get(self.url, {}))
+        return state
+
+    def save_state(self):
+        if self.state_file is None:
+            return
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        states = {}
+        if os.path.exists(self.state_file):
+            with open(self.state_file, encoding='utf-8') as f:
+                states = json.load(f)
+        states[self.url] = self.state
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(states, f)
+
+    def _delay(self, attempt, response=None):
+        """Exponential backoff with jitter, or the server's Retry-After if it sent one"""
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            return float(response.headers['Retry-After'])
+        return min(BACKOFF_MAX, self.backoff * 2 ** attempt) * (0.5 + self.rng.random())
+
+    async def get_json(self, path):
+        """
+        Conditional GET with retries. Returns the payload (from the stored
+        body on 304) or None for 404.
+        """
+        cached = self.state['responses'].get(path)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        for attempt in range(self.max_retries + 1):
+            self.stats['requests'] += 1
+            response = None
+            try:
+                async with self.session.get(self.url + path, headers=headers) as response:
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                response, error = None, e
+            else:
+                if response.status == 304 and cached:
+                    self.stats['not_modified'] += 1
+                    return json.loads(cached['body'])
+                if response.status == 404:
+                    self.stats['not_found'] += 1
+                    return None
+                if response.status == 200:
+                    payload = json.loads(body)
+                    if 'ETag' in response.headers or 'Last-Modified' in response.headers:
+                        self.state['responses'][path] = {'etag': response.headers.get('ETag'),
+                                            'last_modified': response.headers.get('Last-Modified'),
+                                            'body': body.decode('utf-8')}
+                    return payload
+                error = FetchError(f"GET {path}: HTTP {response.status}")
+                if response.status not in RETRY_STATUSES:
+                    raise error
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._delay(attempt, response))
+        raise FetchError(f"GET {path} failed after {self.max_retries + 1} attempts: {error}")
+
+    async def fetch_missing(self, known_draw_ids, known_prize_ids):
+        """
+        Draws newer than the known ones plus prize tables missing for any
+        draw. Returns (draws, prizes) as DataFrames in CSV layout.
+
+        Requests that fail for good do not discard the others; they are
+        listed in self.failures. New draws end before the first one that
+        failed (a draw listed in the index but answered with 404 counts as
+        failed), so the history never gets a gap and the next run asks for
+        that draw again. Prize tables are kept for the draws that are known
+        or fetched.
+        """
+        self.failures = []
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size),
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                             headers={'Accept': 'application/json'})
+        try:
+            offered = self.source.parse_index(await self.get_json(self.source.index_path))
+            last_known = max(known_draw_ids, default=0)
+            new_ids = [draw_id for draw_id in offered if draw_id > last_known]
+            skipped = set(self.state['unavailable_prizes']) - set(offered[-PRIZE_RECHECK_DRAWS:])
+            prize_ids = sorted(set(offered) - set(int(i) for i in known_prize_ids) - skipped)
+
+            draw_payloads, prize_payloads = await asyncio.gather(
+                asyncio.gather(*(self.get_json(self.source.draw_path(i)) for i in new_ids), return_exceptions=True),
+                asyncio.gather(*(self.get_json(self.source.prize_path(i)) for i in prize_ids), return_exceptions=True))
+            unavailable = skipped | {i for i, p in zip(prize_ids, prize_payloads) if p is None}
+            self.state['unavailable_prizes'] = sorted(unavailable)
+        finally:
+            await self.session.close()
+            self.save_state()
+
+        fetched_draws = []
+        for draw_id, payload in zip(new_ids, draw_payloads):
+            if isinstance(payload, Exception) or payload is None:
+                reason = 'listed in the index but not found' if payload is None else str(payload)
+                self.failures.append(f"Draw {draw_id}: {reason}")
+                dropped = len(new_ids) - len(fetched_draws) - 1
+                if dropped:
+                    self.failures.append(f"Draws after {draw_id} ({dropped}) are not ingested until it is fetched")
+                break
+            fetched_draws.append(self.source.parse_draw(payload))
+        last_draw = max([last_known] + [draw['id'] for draw in fetched_draws])
+
+        fetched_prizes = []
+        for draw_id, payload in zip(prize_ids, prize_payloads):
+            if isinstance(payload, Exception):
+                self.failures.append(f"Prize table {draw_id}: {payload}")
+            elif payload is not None and draw_id <= last_draw:
+                fetched_prizes.append(self.source.parse_prizes(payload))
+
+        draws = pd.DataFrame(fetched_draws, columns=['id', 'Datum'] + MAIN_COLUMNS + EURO_COLUMNS)
+        prizes = pd.DataFrame(fetched_prizes, columns=['id'] + PAYOUT_COLUMNS + WINNER_COLUMNS)
+        return draws.sort_values('id', ignore_index=True), prizes.sort_values('id', ignore_index=True)
+
+
+def ingest(draws, prizes, dataset, prizes_csv, publish=None):
+    """
+    Append fetched draws to the versioned history and prize rows to the
+    prize file, optionally publishing a new dataset version.
+    """
+    if len(draws) > 0:
+        dataset.append(draws)
+    if len(prizes) > 0:
+        store = PrizeStore.from_csv(dataset.store, prizes_csv)
+        for row in prizes.itertuples(index=False):
+            store.append(row.id, [getattr(row, c) for c in PAYOUT_COLUMNS], [getattr(row, c) for c in WINNER_COLUMNS])
+        store.save(prizes_csv)
+    if publish is not None:
+        return dataset.publish(publish)
+    return None
+
+
+async def run_benchmark(pool_size, latency, failure_rate):
+    """Fetch the full history from an in-process mock server into memory"""
+    from mock_server import MockDrawServer, start_mock_server
+
+    server = MockDrawServer.from_csv(latency=latency, failure_rate=failure_rate)
+    listener, port = await start_mock_server(server)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        fetcher = DrawFetcher(url, pool_size=pool_size, backoff=0.01, state_file=None, seed=0)
+        started = time.perf_counter()
+        draws, prizes = await fetcher.fetch_missing([], [])
+        elapsed = time.perf_counter() - started
+        connections = server.stats['connections']
+
+        # A second run only revalidates the index
+        again = DrawFetcher(url, pool_size=pool_size, state_file=None)
+        again.state = fetcher.state
+        await again.fetch_missing(draws['id'], prizes['id'])
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    return draws, prizes, elapsed, connections, fetcher, again
+
+
+def main():
+    args = sys.argv[1:]
+    url = publish = None
+    data_dir = DATA_DIR
+    pool_size, latency, failure_rate, benchmark = DEFAULT_POOL_SIZE, 0.0, 0.0, False
+    while args:
+        arg = args.pop(0)
+        if arg == '--benchmark':
+            benchmark = True
+        elif arg == '--publish':
+            publish = args.pop(0)
+        elif arg == '--pool':
+            pool_size = int(args.pop(0))
+        elif arg == '--data-dir':
+            data_dir = args.pop(0)
+        elif arg == '--latency':
+            latency = float(args.pop(0)) / 1000
+        elif arg == '--failure-rate':
+            failure_rate = float(args.pop(0))
+        else:
+            url = arg
+
+    if benchmark:
+        print(f"Benchmark against the mock server: pool {pool_size}, latency {latency * 1000:.0f} ms, "
+              f"failure rate {failure_rate:.0%}")
+        draws, prizes, elapsed, connections, fetcher, again = asyncio.run(run_benchmark(pool_size, latency, failure_rate))
+        print(f"Fetched {len(draws)} draws and {len(prizes)} prize tables with {fetcher.stats['requests']} requests "
+              f"in {elapsed:.2f}s ({fetcher.stats['requests'] / max(elapsed, 1e-9):,.0f} req/s)")
+        print(f"Connections opened: {connections}, retries: {fetcher.stats['retries']}, "
+              f"not found: {fetcher.stats['not_found']}, failed for good: {len(fetcher.failures)}")
+        for failure in fetcher.failures[:10]:
+            print(f"  {failure}")
+        print(f"Second run: {again.stats['requests']} request(s), {again.stats['not_modified']} not modified")
+        return 0
+    if url is None:
+        print(__doc__)
+        return 1
+
+    dataset = VersionedDataset(os.path.join(data_dir, 'drawing_results.csv'),
+                               os.path.join(data_dir, 'dataset_versions.json'))
+    prizes_csv = os.path.join(data_dir, 'price_breakdown.csv')
+    known_prizes = pd.read_csv(prizes_csv, usecols=['id'])['id']
+    print(f"Fetching from {url}: history ends at draw {dataset.store.ids[-1]}, "
+          f"{len(known_prizes)} prize tables stored")
+
+    fetcher = DrawFetcher(url, pool_size=pool_size)
+    started = time.perf_counter()
+    try:
+        draws, prizes = asyncio.run(fetcher.fetch_missing(dataset.store.ids, known_prizes))
+    except (FetchError, aiohttp.ClientError, OSError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    print(f"{fetcher.stats['requests']} requests in {elapsed:.2f}s "
+          f"({fetcher.stats['not_modified']} not modified, {fetcher.stats['retries']} retries)")
+
+    for failure in fetcher.failures:
+        print(f"⚠️  {failure}")
+
+    marker = ingest(draws, prizes, dataset, prizes_csv, publish)
+    print(f"Added {len(draws)} draws and {len(prizes)} prize tables")
+    if len(draws):
+        print(f"  Draws {draws['id'].iloc[0]}-{draws['id'].iloc[-1]}, last on {draws['Datum'].iloc[-1]}")
+    if marker is not None:
+        print(f"Published dataset version {marker['version']} ({marker['draws']} draws)")
+    elif len(draws):
+        print("Run with --publish VERSION (or versioned_dataset.py --publish) to publish the new draws")
+    if fetcher.failures:
+        print(f"❌ {len(fetcher.failures)} request(s) failed, run again to fetch the rest")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
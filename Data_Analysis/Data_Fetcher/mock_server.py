@@ -0,0 +1,187 @@
+"""
+Local stand-in for the results provider, used to test and benchmark
+fetcher.py offline.
+
+Fixture data is the draw history and price_breakdown.csv, served as JSON
+in the layout JsonDrawSource expects. Every response carries an ETag and
+a Last-Modified date and conditional requests are answered with 304.
+Latency and a share of failing requests (503 with Retry-After) can be
+injected to exercise the fetcher's pool, retries and backoff.
+
+Endpoints:
+  GET /draws               index of all draws: {"draws": [{"id", "date"}]}
+  GET /draws/<id>          {"id", "date", "main": [...], "euro": [...]}
+  GET /prizes/<id>         {"id", "classes": [{"class", "prize", "winners"}]}, 404 if unknown
+
+Usage: python Data_Analysis/Data_Fetcher/mock_server.py [port] [--until ID] [--latency MS] [--failure-rate P]
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+from email.utils import format_datetime
+
+import pandas as pd
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from draw_store import DRAWING_RESULTS_FILE, PRICE_BREAKDOWN_FILE, PAYOUT_COLUMNS, WINNER_COLUMNS
+from game_config import MAIN_COLUMNS, EURO_COLUMNS
+
+HOST = '127.0.0.1'
+PORT = 8766
+
+
+def _http_date(date):
+    return format_datetime(pd.Timestamp(date).tz_localize('UTC').to_pydatetime(), usegmt=True)
+
+
+def build_fixtures(draws_df, prizes_df):
+    """Response bodies keyed by path, each with its ETag and Last-Modified date"""
+    fixtures = {}
+
+    def add(path, payload, date):
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        fixtures[path] = (body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"', _http_date(date))
+
+    dates = dict(zip(draws_df['id'], draws_df['Datum']))
+    add('/draws', {'draws': [{'id': int(i), 'date': d} for i, d in dates.items()]}, draws_df['Datum'].iloc[-1])
+    for row in draws_df.itertuples(index=False):
+        add(f'/draws/{row.id}', {
+            'id': int(row.id),
+            'date': row.Datum,
+            'main': [int(getattr(row, column)) for column in MAIN_COLUMNS],
+            'euro': [int(getattr(row, column)) for column in EURO_COLUMNS]
+        }, row.Datum)
+    for _, row in prizes_df.iterrows():
+        draw_id = int(row['id'])
+        if draw_id not in dates:
+            continue
+        add(f'/prizes/{draw_id}', {
+            'id': draw_id,
+            'classes': [{'class': i + 1, 'prize': float(row[payout]), 'winners': int(row[winners])}
+                        for i, (payout, winners) in enumerate(zip(PAYOUT_COLUMNS, WINNER_COLUMNS))]
+        }, dates[draw_id])
+    return fixtures
+
+
+class MockDrawServer:
+    """HTTP/1.1 keep-alive server on asyncio streams serving fixed responses"""
+
+    def __init__(self, fixtures, latency=0.0, failure_rate=0.0, seed=2025):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.stats = {'requests': 0, 'connections': 0, 'not_modified': 0, 'failures': 0}
+
+    @classmethod
+    def from_csv(cls, draws_csv=DRAWING_RESULTS_FILE, prizes_csv=PRICE_BREAKDOWN_FILE, until=None, **kwargs):
+        """Serve the stored history, optionally only the draws up to id `until`"""
+        draws_df = pd.read_csv(draws_csv)
+        if until is not None:
+            draws_df = draws_df[draws_df['id'] <= until]
+        return cls(build_fixtures(draws_df, pd.read_csv(prizes_csv)), **kwargs)
+
+    def respond(self, path, headers):
+        """Return (status, body, extra headers)"""
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            self.stats['failures'] += 1
+            return 503, b'{"error":"Service unavailable"}', {'Retry-After': '0'}
+        fixture = self.fixtures.get(path)
+        if fixture is None:
+            return 404, json.dumps({'error': f"Not found: {path}"}).encode(), {}
+        body, etag, last_modified = fixture
+        validators = {'ETag': etag, 'Last-Modified': last_modified}
+        if headers.get('if-none-match') == etag or (
+                'if-none-match' not in headers and headers.get('if-modified-since') == last_modified):
+            self.stats['not_modified'] += 1
+            return 304, b'', validators
+        return 200, body, validators
+
+    async def handle_connection(self, reader, writer):
+        self.stats['connections'] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                self.stats['requests'] += 1
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    await self.send(writer, 400, b'{"error":"Malformed request"}', {})
+                    break
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if method != 'GET':
+                    await self.send(writer, 405, b'{"error":"Only GET is supported"}', {})
+                else:
+                    await self.send(writer, *self.respond(target.split('?', 1)[0], headers))
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, body, extra_headers):
+        reasons = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+                   405: 'Method Not Allowed', 503: 'Service Unavailable'}
+        head = [f"HTTP/1.1 {status} {reasons[status]}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in extra_headers.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+
+
+async def start_mock_server(server, host=HOST, port=0):
+    """Start listening (port 0 picks a free port); returns the asyncio server and the port"""
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    return listener, listener.sockets[0].getsockname()[1]
+
+
+async def serve(server, host=HOST, port=PORT):
+    listener, port = await start_mock_server(server, host, port)
+    print(f"Serving {len(server.fixtures)} fixtures on http://{host}:{port}/")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    args = sys.argv[1:]
+    port, options = PORT, {}
+    while args:
+        arg = args.pop(0)
+        if arg == '--until':
+            options['until'] = int(args.pop(0))
+        elif arg == '--latency':
+            options['latency'] = float(args.pop(0)) / 1000
+        elif arg == '--failure-rate':
+            options['failure_rate'] = float(args.pop(0))
+        else:
+            port = int(arg)
+
+    server = MockDrawServer.from_csv(**options)
+    try:
+        asyncio.run(serve(server, port=port))
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,13 @@ import pandas as pd
 import numpy as np
 from scipy.special import comb
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from memo_cache import memoize
+from draw_store import DRAWING_RESULTS_FILE
+from game_config import EUROJACKPOT
+from versioned_dataset import load_version, record_artifact
 
 def count_even_numbers(numbers):
     """Count how many even numbers are in a list of numbers"""
@@ -26,15 +33,16 @@ def calculate_hypergeometric_probability(n_total, n_even, k_draw, k_even):
     
     return float(numerator) / float(denominator)
 
-def get_euro_theoretical_probabilities():
+def get_euro_theoretical_probabilities(k_draw=2, even_share=0.5):
     """
     Return theoretical probabilities for euro numbers (always the same)
-    Since euro ranges always have equal even/odd numbers
+    Since euro ranges always have equal even/odd numbers, the era does not
+    matter: each number is counted as even with probability even_share.
+    For 2 euro numbers: 0.25 (0 even), 0.50 (1 even), 0.25 (2 even)
     """
     return {
-        0: 0.25,  # 0 even, 2 odd
-        1: 0.50,  # 1 even, 1 odd  
-        2: 0.25   # 2 even, 0 odd
+        k_even: comb(k_draw, k_even, exact=True) * even_share ** k_even * (1 - even_share) ** (k_draw - k_even)
+        for k_even in range(k_draw + 1)
     }
 
 def analyze_even_odd_patterns(data, number_columns, output_file, n_total, n_even, description, is_euro=False):
@@ -58,7 +66,7 @@ def analyze_even_odd_patterns(data, number_columns, output_file, n_total, n_even
     
     # Get theoretical probabilities
     if is_euro:
-        theoretical_probs = get_euro_theoretical_probabilities()
+        theoretical_probs = get_euro_theoretical_probabilities(len(number_columns))
     else:
         theoretical_probs = {}
         for even_count in range(max_even + 1):
@@ -91,23 +99,31 @@ def analyze_even_odd_patterns(data, number_columns, output_file, n_total, n_even
     
     return df_results
 
-def calculate_combined_theoretical_probabilities():
+@memoize()
+def calculate_combined_theoretical_probabilities(main_total=50, main_drawn=5, euro_drawn=2, euro_total=None):
     """
     Calculate theoretical probabilities for combined main + euro numbers
-    This uses the fact that main and euro draws are independent
+    This uses the fact that main and euro draws are independent.
+    Without euro_total the euro numbers use the binomial model of
+    get_euro_theoretical_probabilities (the published Eurojackpot tables),
+    with euro_total they are drawn without replacement (hypergeometric).
     """
     # Main numbers probabilities (5 from 50, 25 even, 25 odd)
     main_probs = {}
-    for k in range(6):  # 0 to 5 even in main numbers
-        main_probs[k] = calculate_hypergeometric_probability(50, 25, 5, k)
+    for k in range(main_drawn + 1):  # 0 to 5 even in main numbers
+        main_probs[k] = calculate_hypergeometric_probability(main_total, main_total // 2, main_drawn, k)
     
-    # Euro numbers probabilities (always the same)
-    euro_probs = get_euro_theoretical_probabilities()
+    if euro_total is None:
+        # Euro numbers probabilities (always the same)
+        euro_probs = get_euro_theoretical_probabilities(euro_drawn)
+    else:
+        euro_probs = {k: calculate_hypergeometric_probability(euro_total, euro_total // 2, euro_drawn, k)
+                      for k in range(euro_drawn + 1)}
     
     # Combined probabilities (independent events)
     combined_probs = {}
-    for main_even in range(6):  # 0-5 even main numbers
-        for euro_even in range(3):  # 0-2 even euro numbers
+    for main_even in range(main_drawn + 1):  # 0-5 even main numbers
+        for euro_even in range(euro_drawn + 1):  # 0-2 even euro numbers
             total_even = main_even + euro_even
             prob = main_probs[main_even] * euro_probs[euro_even]
             
@@ -118,13 +134,13 @@ def calculate_combined_theoretical_probabilities():
     
     return combined_probs
 
-def main():
+def main(game=EUROJACKPOT):
     # Read the data
-    data_file = "Data_Analysis/Data/drawing_results_20250829.csv"
+    data_file = DRAWING_RESULTS_FILE
     
     try:
-        data = pd.read_csv(data_file)
-        print(f"Loaded {len(data)} draws from {data_file}")
+        data, version = load_version()
+        print(f"Loaded {len(data)} draws from {data_file} (version {version['version']})")
         print(f"Columns: {list(data.columns)}")
         
         # Display first few rows for verification
@@ -139,21 +155,21 @@ def main():
         return
     
     # Job 1: Main numbers even-odd analysis (Z1-Z5)
-    main_columns = ['Z1', 'Z2', 'Z3', 'Z4', 'Z5']
+    main_columns = game['main_columns']
     main_output = "Data_Analysis/Even_Odd_Analysis/main_numbers_even_odd_analysis.csv"
     
     analyze_even_odd_patterns(
         data, 
         main_columns, 
         main_output,
-        n_total=50,  # Main numbers range 1-50
-        n_even=25,   # Even numbers: 2,4,6...50
+        n_total=game['main_total'],       # Main numbers range 1-50
+        n_even=game['main_total'] // 2,   # Even numbers: 2,4,6...50
         description="Main Numbers (Z1-Z5)",
         is_euro=False
     )
     
     # Job 2: Euro numbers even-odd analysis (EZ1-EZ2)
-    euro_columns = ['EZ1', 'EZ2']
+    euro_columns = game['euro_columns']
     euro_output = "Data_Analysis/Even_Odd_Analysis/euro_numbers_even_odd_analysis.csv"
     
     print(f"\nEuro numbers always have equal even/odd distribution")
@@ -170,7 +186,7 @@ def main():
     )
     
     # Job 3: Combined analysis (Z1-Z5 + EZ1-EZ2)
-    combined_columns = ['Z1', 'Z2', 'Z3', 'Z4', 'Z5', 'EZ1', 'EZ2']
+    combined_columns = main_columns + euro_columns
     combined_output = "Data_Analysis/Even_Odd_Analysis/combined_numbers_even_odd_analysis.csv"
     
     print(f"\nAnalyzing Combined Numbers (Z1-Z5 + EZ1-EZ2)...")
@@ -183,13 +199,14 @@ def main():
         even_counts.append(even_count)
     
     # Get theoretical probabilities for combined analysis
-    theoretical_probs = calculate_combined_theoretical_probabilities()
+    theoretical_probs = calculate_combined_theoretical_probabilities(
+        game['main_total'], game['main_drawn'], game['euro_drawn'])
     
     # Count frequencies
     results = []
     total_draws = len(even_counts)
     
-    for even_count in range(8):  # 0 to 7 even numbers possible
+    for even_count in range(len(combined_columns) + 1):  # 0 to 7 even numbers possible
         absolute_freq = even_counts.count(even_count)
         relative_freq = absolute_freq / total_draws
         theoretical_prob = theoretical_probs.get(even_count, 0.0)
@@ -208,6 +225,7 @@ def main():
     os.makedirs(os.path.dirname(combined_output), exist_ok=True)
     df_combined.to_csv(combined_output, index=False)
     print(f"  Results saved to: {combined_output}")
+    record_artifact([main_output, euro_output, combined_output], version, "generate_even_odd_csv.py")
     
     print("\n" + "="*60)
     print("ANALYSIS COMPLETE!")
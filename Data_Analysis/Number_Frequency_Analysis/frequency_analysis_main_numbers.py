@@ -2,27 +2,27 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from versioned_dataset import load_version, record_artifact
+
+# Dataset version the published frequency files are built from
+DATASET_VERSION = '20250808'
+
 def analyze_main_numbers(df, output_dir):
     """Analyze main numbers (Z1-Z5) frequency"""
     print("\n" + "="*60)
     print("ANALYZING MAIN NUMBERS")
     print("="*60)
     
-    # Initialize frequency counter for numbers 1-50
-    absolute_frequencies = {i: 0 for i in range(1, 51)}
-    
-    # Count frequencies of each main number
+    # Count frequencies of each main number (input is validated on load)
     main_columns = ['Z1', 'Z2', 'Z3', 'Z4', 'Z5']
-    total_numbers = 0
-    
-    for column in main_columns:
-        if column in df.columns:
-            for number in df[column]:
-                if pd.notna(number) and 1 <= number <= 50:
-                    absolute_frequencies[int(number)] += 1
-                    total_numbers += 1
+    numbers = df[main_columns].to_numpy(dtype=np.int64).ravel()
+    counts = np.bincount(numbers, minlength=51)
+    absolute_frequencies = {i: int(counts[i]) for i in range(1, 51)}
+    total_numbers = len(numbers)
     
     print(f"Total main numbers processed: {total_numbers}")
     
@@ -117,19 +117,12 @@ def analyze_euro_numbers(df, max_euro, interval_name, output_dir):
     print(f"Euro numbers range: 1-{max_euro}")
     print("="*60)
     
-    # Initialize frequency counter
-    absolute_frequencies = {i: 0 for i in range(1, max_euro + 1)}
-    
-    # Count frequencies of each euro number
+    # Count frequencies of each euro number (era ranges are validated on load)
     euro_columns = ['EZ1', 'EZ2']
-    total_numbers = 0
-    
-    for column in euro_columns:
-        if column in df.columns:
-            for number in df[column]:
-                if pd.notna(number) and 1 <= number <= max_euro:
-                    absolute_frequencies[int(number)] += 1
-                    total_numbers += 1
+    numbers = df[euro_columns].to_numpy(dtype=np.int64).ravel()
+    counts = np.bincount(numbers, minlength=max_euro + 1)
+    absolute_frequencies = {i: int(counts[i]) for i in range(1, max_euro + 1)}
+    total_numbers = len(numbers)
     
     print(f"Total euro numbers processed: {total_numbers}")
     
@@ -224,10 +217,9 @@ def analyze_euro_numbers(df, max_euro, interval_name, output_dir):
 
 def main():
     # Read the CSV file
-    data_file = "Data/drawing_results_20250808.csv"
-    df = pd.read_csv(data_file)
+    df, version = load_version(DATASET_VERSION)
     
-    print(f"Loaded {len(df)} Eurojackpot picks")
+    print(f"Loaded {len(df)} Eurojackpot picks (dataset version {version['version']})")
     print(f"Columns: {list(df.columns)}")
     
     # Convert date column to datetime
@@ -275,6 +267,17 @@ def main():
             interval_3_df, 12, "Interval 3 (2022-present)", output_dir
         )
     
+    # Record the dataset version of every written file
+    artifacts = [os.path.join(output_dir, name) for name in (
+        "main_numbers_absolute_frequencies.csv", "main_numbers_relative_frequencies.csv",
+        "main_numbers_frequency_analysis.png")]
+    for interval_name in ("Interval 1 (2012-2014)", "Interval 2 (2014-2022)", "Interval 3 (2022-present)"):
+        interval_dir = os.path.join(output_dir, f"euro_numbers_{interval_name.lower().replace(' ', '_')}")
+        if os.path.isdir(interval_dir):
+            artifacts += [os.path.join(interval_dir, name) for name in (
+                "absolute_frequencies.csv", "relative_frequencies.csv", "euro_numbers_frequency_analysis.png")]
+    record_artifact(artifacts, version, "frequency_analysis_main_numbers.py")
+    
     # Print comprehensive summary
     print("\n" + "="*80)
     print("COMPREHENSIVE ANALYSIS SUMMARY")
@@ -1,5 +1,15 @@
 import pandas as pd
+import numpy as np
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data_validation import DataValidationError
+from draw_store import DRAWING_RESULTS_FILE
+from versioned_dataset import load_version, record_artifact
+
+# Dataset version the published frequency file is built from
+DATASET_VERSION = '20250808'
 
 # The file generates a single output csv with absolute and relative frequencies
 
@@ -10,7 +20,7 @@ def analyze_main_number_frequencies():
     """
     
     # File paths
-    input_file = 'Data_Analysis/Data/drawing_results_20250808.csv'
+    input_file = DRAWING_RESULTS_FILE
     output_dir = 'Data_Analysis/Number_Frequency_Analysis'
     output_file = os.path.join(output_dir, 'main_numbers_frequency_analysis.csv')
     
@@ -18,30 +28,19 @@ def analyze_main_number_frequencies():
     os.makedirs(output_dir, exist_ok=True)
     
     try:
-        # Read the CSV file
-        print(f"Reading data from {input_file}...")
-        df = pd.read_csv(input_file)
-        
-        # Check if required columns exist
+        # Read the drawing results as of the pinned version
+        print(f"Reading data from {input_file} (version {DATASET_VERSION})...")
+        # Columns, ranges and missing values are checked on load
+        df, version = load_version(DATASET_VERSION)
         main_number_columns = ['Z1', 'Z2', 'Z3', 'Z4', 'Z5']
-        missing_columns = [col for col in main_number_columns if col not in df.columns]
-        
-        if missing_columns:
-            print(f"Error: Missing columns: {missing_columns}")
-            return
         
         print(f"Loaded {len(df)} drawing records")
         
-        # Initialize frequency counter for numbers 1-50
-        frequency_dict = {i: 0 for i in range(1, 51)}
-        
         # Count frequencies across all main number columns
-        total_numbers_drawn = 0
-        for col in main_number_columns:
-            for number in df[col]:
-                if pd.notna(number) and 1 <= number <= 50:
-                    frequency_dict[int(number)] += 1
-                    total_numbers_drawn += 1
+        numbers = df[main_number_columns].to_numpy(dtype=np.int64).ravel()
+        counts = np.bincount(numbers, minlength=51)
+        frequency_dict = {i: int(counts[i]) for i in range(1, 51)}
+        total_numbers_drawn = len(numbers)
         
         print(f"Total main numbers analyzed: {total_numbers_drawn}")
         print(f"Expected total (5 numbers × {len(df)} draws): {5 * len(df)}")
@@ -62,6 +61,7 @@ def analyze_main_number_frequencies():
         
         # Save to CSV
         results_df.to_csv(output_file, index=False)
+        record_artifact(output_file, version, 'frequency_analysis_main_numbers_2.py')
         print(f"\nResults saved to: {output_file}")
         
         # Display summary statistics
@@ -94,6 +94,9 @@ def analyze_main_number_frequencies():
     except FileNotFoundError:
         print(f"Error: Could not find file {input_file}")
         print("Please ensure the file exists and the path is correct.")
+    except DataValidationError as e:
+        print(f"Error: The file {input_file} failed validation")
+        print(e)
     except pd.errors.EmptyDataError:
         print(f"Error: The file {input_file} is empty or corrupted.")
     except Exception as e:
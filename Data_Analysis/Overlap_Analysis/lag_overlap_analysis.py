@@ -0,0 +1,151 @@
+import pandas as pd
+import numpy as np
+from scipy.special import comb
+import os
+import sys
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from bitmask import encode, popcount
+from data_validation import DataValidationError
+from draw_store import DrawStore, DRAWING_RESULTS_FILE
+from game_config import MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN, EURO_ERAS
+from memo_cache import memoize
+
+# Number of previous draws compared with every draw
+MAX_LAG = 10
+
+# Rows x lags evaluated per vectorized step, bounds memory for long histories
+CHUNK_CELLS = 4_000_000
+
+
+def lag_overlap_counts(masks, max_lag, drawn):
+    """
+    Count how many numbers every draw shares with the draws 1..max_lag before it.
+
+    masks: uint64 bitmask per draw, in draw order
+    drawn: numbers per draw (maximum possible overlap)
+
+    Returns an array of shape (max_lag, drawn + 1) where entry [lag - 1, k]
+    is the number of draw pairs at that lag with exactly k common numbers.
+    """
+    masks = np.asarray(masks, dtype=np.uint64)
+    n_draws = len(masks)
+    lags = np.arange(1, max_lag + 1)
+    width = drawn + 1
+    counts = np.zeros(max_lag * width, dtype=np.int64)
+
+    rows_per_chunk = max(1, CHUNK_CELLS // max_lag)
+    for start in range(1, n_draws, rows_per_chunk):
+        current = np.arange(start, min(start + rows_per_chunk, n_draws))
+        previous = current[:, None] - lags[None, :]
+        valid = previous >= 0
+
+        overlaps = popcount(masks[current][:, None] & masks[np.maximum(previous, 0)])
+        cells = (lags - 1)[None, :] * width + overlaps
+        counts += np.bincount(cells[valid], minlength=max_lag * width)
+
+    return counts.reshape(max_lag, width)
+
+
+@memoize()
+def theoretical_overlap_distribution(n_total, drawn):
+    """
+    Overlap distribution of two independent draws of `drawn` numbers from 1..n_total.
+    The count column is the number of draws with k numbers in common with a fixed draw.
+    """
+    overlap = np.arange(drawn + 1)
+    counts = np.array([comb(drawn, k, exact=True) * comb(n_total - drawn, drawn - k, exact=True)
+                       for k in overlap])
+    return pd.DataFrame({
+        'overlap': overlap,
+        'probability': counts / comb(n_total, drawn, exact=True),
+        'count': counts
+    })
+
+
+def create_empirical_distribution(counts):
+    """Long-format empirical distribution from a (lag, overlap) count matrix"""
+    max_lag, width = counts.shape
+    totals = counts.sum(axis=1, keepdims=True)
+    probabilities = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+    return pd.DataFrame({
+        'lag': np.repeat(np.arange(1, max_lag + 1), width),
+        'overlap': np.tile(np.arange(width), max_lag),
+        'frequency': counts.ravel(),
+        'probability': probabilities.ravel()
+    })
+
+
+def print_lag_summary(counts, theoretical):
+    """Print mean overlap per lag next to the expected value"""
+    expected_mean = (theoretical['overlap'] * theoretical['probability']).sum()
+    overlaps = np.arange(counts.shape[1])
+    for lag, row in enumerate(counts, start=1):
+        if row.sum() == 0:
+            continue
+        mean = (row * overlaps).sum() / row.sum()
+        print(f"  Lag {lag:2d}: {row.sum():5d} pairs, mean overlap {mean:.4f} (expected {expected_mean:.4f})")
+
+
+def save_results(df, filename_base):
+    """Save a distribution CSV next to this script"""
+    csv_filename = os.path.join(base_dir, f"{filename_base}.csv")
+    df.to_csv(csv_filename, index=False)
+    print(f"Saved: {csv_filename}")
+
+
+def main():
+    print("Loading data...")
+    try:
+        draws = DrawStore.load_validated(DRAWING_RESULTS_FILE)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {DRAWING_RESULTS_FILE}")
+        return
+    except DataValidationError as e:
+        print(f"Error: The file {DRAWING_RESULTS_FILE} failed validation")
+        print(e)
+        return
+    print(f"Loaded {len(draws)} records")
+
+    print("\n" + "="*60)
+    print("ANALYZING MAIN NUMBER REPEATS")
+    print("="*60)
+
+    main_masks = encode(draws.main)
+    main_counts = lag_overlap_counts(main_masks, MAX_LAG, MAIN_NUMBERS_DRAWN)
+    main_theoretical = theoretical_overlap_distribution(MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN)
+    print_lag_summary(main_counts, main_theoretical)
+
+    save_results(create_empirical_distribution(main_counts), "main_numbers_lag_overlap_empirical_distribution")
+    save_results(main_theoretical, "main_numbers_lag_overlap_theoretical_distribution")
+
+    print("\n" + "="*60)
+    print("ANALYZING EURO NUMBER REPEATS")
+    print("="*60)
+
+    # Lags are only counted within an era, the euro range differs between eras
+    eras = draws.era_names()
+    for era in EURO_ERAS:
+        selected = eras == era['name']
+        print(f"\n{era['label']} (1-{era['max_euro']}): {selected.sum()} draws")
+        if selected.sum() < 2:
+            continue
+
+        euro_counts = lag_overlap_counts(encode(draws.euro[selected]), MAX_LAG, EURO_NUMBERS_DRAWN)
+        euro_theoretical = theoretical_overlap_distribution(era['max_euro'], EURO_NUMBERS_DRAWN)
+        print_lag_summary(euro_counts, euro_theoretical)
+
+        save_results(create_empirical_distribution(euro_counts),
+                     f"euro_numbers_{era['name']}_lag_overlap_empirical_distribution")
+        save_results(euro_theoretical, f"euro_numbers_{era['name']}_lag_overlap_theoretical_distribution")
+
+    print("\n" + "="*60)
+    print("ANALYSIS COMPLETE!")
+    print("="*60)
+    print(f"All files saved to: {base_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import pandas as pd
+import numpy as np
+from itertools import combinations
+import json
+import os
+import sys
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from draw_store import DRAWING_RESULTS_FILE
+from game_config import MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, MAIN_COLUMNS
+from memo_cache import memoize
+from versioned_dataset import load_version, record_artifact
+
+DECADE_SIZE = 10
+LOW_HIGH_SPLIT = MAIN_NUMBERS_TOTAL // 2  # low: 1-25, high: 26-50
+
+FEATURES = {
+    'longest_run': 'Longest run of consecutive numbers',
+    'decades_covered': 'Number of decades (1-10, 11-20, ...) covered',
+    'low_count': f'Numbers from the low half (1-{LOW_HIGH_SPLIT})',
+    'spread': 'Difference between highest and lowest number'
+}
+
+
+def draw_features(sorted_numbers):
+    """
+    Structural features of every row of a sorted (draws, k) number matrix.
+    Returns a dict of int arrays, one value per row.
+    """
+    numbers = np.asarray(sorted_numbers, dtype=np.int16)
+    rows, k = numbers.shape
+
+    # Longest run: restart counting wherever two neighbours are not consecutive
+    consecutive = np.diff(numbers, axis=1) == 1
+    run = np.ones(rows, dtype=np.int16)
+    longest = np.ones(rows, dtype=np.int16)
+    for column in range(k - 1):
+        run = np.where(consecutive[:, column], run + 1, 1)
+        longest = np.maximum(longest, run)
+
+    decades = (numbers - 1) // DECADE_SIZE
+    decades_covered = 1 + (np.diff(decades, axis=1) != 0).sum(axis=1)
+
+    return {
+        'longest_run': longest,
+        'decades_covered': decades_covered.astype(np.int16),
+        'low_count': (numbers <= LOW_HIGH_SPLIT).sum(axis=1).astype(np.int16),
+        'spread': (numbers[:, -1] - numbers[:, 0]).astype(np.int16)
+    }
+
+
+def feature_value_range(feature, n_total=MAIN_NUMBERS_TOTAL, drawn=MAIN_NUMBERS_DRAWN):
+    """All possible values of a feature"""
+    if feature == 'longest_run':
+        return np.arange(1, drawn + 1)
+    if feature == 'decades_covered':
+        return np.arange(1, min(drawn, -(-n_total // DECADE_SIZE)) + 1)
+    if feature == 'low_count':
+        return np.arange(0, drawn + 1)
+    return np.arange(drawn - 1, n_total)
+
+
+@memoize()
+def theoretical_pattern_distributions(n_total=MAIN_NUMBERS_TOTAL, drawn=MAIN_NUMBERS_DRAWN):
+    """
+    Exact feature distributions, evaluated on every possible combination.
+    Returns {feature: (values, counts)}.
+    """
+    all_combinations = np.array(list(combinations(range(1, n_total + 1), drawn)), dtype=np.int16)
+    features = draw_features(all_combinations)
+    result = {}
+    for feature, values in features.items():
+        value_range = feature_value_range(feature, n_total, drawn)
+        counts = np.bincount(values, minlength=value_range[-1] + 1)[value_range]
+        result[feature] = (value_range, counts)
+    return result
+
+
+def build_distributions(features, theoretical):
+    """Long-format table with empirical and theoretical distribution per feature"""
+    frames = []
+    for feature, (values, theoretical_counts) in theoretical.items():
+        frequency = np.bincount(features[feature], minlength=values[-1] + 1)[values]
+        frames.append(pd.DataFrame({
+            'feature': feature,
+            'value': values,
+            'frequency': frequency,
+            'empirical_probability': frequency / len(features[feature]),
+            'theoretical_probability': theoretical_counts / theoretical_counts.sum()
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_site_data(df, features, distributions, version=None):
+    """Compact JSON structure: per-draw features plus all distributions"""
+    return {
+        'draws': {
+            'ids': df['id'].tolist(),
+            'dates': df['Datum'].dt.strftime('%Y-%m-%d').tolist(),
+            **{feature: values.tolist() for feature, values in features.items()}
+        },
+        'distributions': {
+            feature: {
+                'description': FEATURES[feature],
+                'values': group['value'].tolist(),
+                'frequency': group['frequency'].tolist(),
+                'empirical': group['empirical_probability'].round(6).tolist(),
+                'theoretical': group['theoretical_probability'].round(6).tolist()
+            }
+            for feature, group in distributions.groupby('feature', sort=False)
+        },
+        'metadata': {
+            'totalDraws': len(df),
+            'datasetVersion': version,
+            'generatedBy': 'pattern_analysis.py'
+        }
+    }
+
+
+def main():
+    data_file = DRAWING_RESULTS_FILE
+
+    try:
+        df, version = load_version()
+    except FileNotFoundError:
+        print(f"Error: Could not find file {data_file}")
+        return
+    df['Datum'] = pd.to_datetime(df['Datum'])
+    print(f"Loaded {len(df)} draws from {data_file} (version {version['version']})")
+
+    print("\n" + "="*60)
+    print("ANALYZING DRAW PATTERNS")
+    print("="*60)
+
+    sorted_main = np.sort(df[MAIN_COLUMNS].to_numpy(), axis=1)
+    features = draw_features(sorted_main)
+
+    print("Calculating theoretical distributions over all combinations...")
+    theoretical = theoretical_pattern_distributions()
+    distributions = build_distributions(features, theoretical)
+
+    for feature, group in distributions.groupby('feature', sort=False):
+        print(f"\n{FEATURES[feature]}:")
+        empirical_mean = features[feature].mean()
+        theoretical_mean = (group['value'] * group['theoretical_probability']).sum()
+        print(f"  Mean: {empirical_mean:.3f} (theoretical: {theoretical_mean:.3f})")
+        if len(group) <= 6:
+            for _, row in group.iterrows():
+                print(f"  {row['value']:2d}: {row['frequency']:4d} times ({row['empirical_probability']:.4f})"
+                      f" - theoretical: {row['theoretical_probability']:.4f}")
+
+    csv_file = os.path.join(base_dir, 'pattern_distributions.csv')
+    distributions.to_csv(csv_file, index=False)
+    print(f"\nResults saved to: {csv_file}")
+
+    json_file = os.path.join(base_dir, 'pattern_analysis.json')
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(build_site_data(df, features, distributions, version['version']), f, separators=(',', ':'))
+    record_artifact([csv_file, json_file], version, 'pattern_analysis.py')
+    print(f"Results saved to: {json_file}")
+    print(f"File size: {os.path.getsize(json_file)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Player-population simulation of prize sharing.
+
+Real players do not pick uniformly: many play birthdays (numbers up to
+31), patterns on the play slip, or follow hot/cold numbers. Which numbers
+are drawn then changes how many winners share a prize class. This script
+simulates synthetic players of several pick-bias types, settles them
+against the actual draws with bitmask matching and fits the mixture of
+types to the winner counts of price_breakdown.csv.
+
+Every draw contributes only 12 winner counts, so the mixture has one
+component per bias kind, the weights come with parametric bootstrap
+intervals and the fit warns when there are few counts per parameter
+(price_breakdown.csv currently holds a single draw).
+
+Within every player type main and euro numbers are picked independently,
+so the probability of a prize class is P(main hits) * P(euro hits). The
+simulation therefore only streams two small hit histograms (plus pick
+counts) per type and draw, memory does not grow with the number of
+tickets, and the rare top classes are estimated from the much more
+frequent marginal events.
+
+Chunks of tickets are simulated in parallel processes; the draw masks and
+per-draw number weights are shared with the workers in shared memory.
+
+Usage: python Data_Analysis/Prize_Analysis/player_simulation.py [tickets_per_type] [workers]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from bitmask import encode, popcount
+from data_validation import DataValidationError
+from draw_store import DrawStore, PrizeStore, DRAWING_RESULTS_FILE, PRICE_BREAKDOWN_FILE
+from game_config import (
+    MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN, PRIZE_CLASSES, get_era
+)
+from prize_tier_calculator import prize_tier_probabilities, expected_jackpot_share
+from shared_arrays import SharedArrays, attach
+
+# Pick-bias types, one mixture component per kind of bias: a few winner
+# counts cannot tell several strengths of the same bias apart
+PLAYER_TYPES = {
+    'random': {'kind': 'random'},
+    'birthday': {'kind': 'birthday', 'boost': 4.0},
+    'pattern': {'kind': 'pattern'},
+    'hot': {'kind': 'frequency', 'exponent': 1.0},
+    'cold': {'kind': 'frequency', 'exponent': -1.0}
+}
+
+# Birthday players favour day numbers (1-31), months (1-12) a little more
+BIRTHDAY_DAYS = 31
+BIRTHDAY_MONTHS = 12
+# Arithmetic progressions on a slip with 10 numbers per row:
+# runs, diagonals and columns
+PATTERN_STEPS = np.array([1, 9, 10, 11])
+# Hot/cold followers look at the frequencies of the last draws
+FREQUENCY_LOOKBACK = 50
+
+# Parametric bootstrap of the mixture weights
+BOOTSTRAP_REPLICATES = 200
+INTERVAL = (0.05, 0.95)
+# Below this many winner counts per fitted parameter the weights are only indicative
+MIN_COUNTS_PER_PARAMETER = 5
+
+CHUNK_SIZE = 200_000
+DEFAULT_TICKETS_PER_TYPE = 10_000_000
+
+_worker = {}
+
+
+def draw_contexts(draws, prizes):
+    """
+    Per settled draw: its bitmasks, euro range and the number counts over
+    the FREQUENCY_LOOKBACK draws before it (euro counts within its era).
+    """
+    rows = prizes.draw_index
+    eras = draws.era_names()
+    max_euro = max(get_era(eras[row])['max_euro'] for row in rows)
+    main_counts = np.zeros((len(rows), MAIN_NUMBERS_TOTAL + 1), dtype=np.float64)
+    euro_counts = np.zeros((len(rows), max_euro + 1), dtype=np.float64)
+    for i, row in enumerate(rows):
+        window = np.arange(max(0, row - FREQUENCY_LOOKBACK), row)
+        np.add.at(main_counts[i], draws.main[window].ravel(), 1)
+        same_era = window[eras[window] == eras[row]]
+        np.add.at(euro_counts[i], draws.euro[same_era].ravel(), 1)
+    return {
+        'main_masks': encode(draws.main[rows]),
+        'euro_masks': encode(draws.euro[rows]),
+        'max_euro': np.array([get_era(eras[row])['max_euro'] for row in rows], dtype=np.int64),
+        'main_counts': main_counts,
+        'euro_counts': euro_counts
+    }
+
+
+def number_weights(player_type, counts, n_total):
+    """Pick weights of numbers 1..n_total for one player type, None for uniform picks"""
+    kind = player_type['kind']
+    numbers = np.arange(1, n_total + 1)
+    if kind == 'birthday':
+        boost = player_type['boost']
+        return 1.0 + (boost - 1.0) * (numbers <= BIRTHDAY_DAYS) + (numbers <= BIRTHDAY_MONTHS)
+    if kind == 'frequency':
+        return (counts[1:n_total + 1] + 1.0) ** player_type['exponent']
+    return None
+
+
+def _sample_numbers(rng, n_total, k, n, weights=None):
+    """n rows of k distinct numbers from 1..n_total (unsorted), weighted picks by Gumbel top-k"""
+    keys = rng.random((n, n_total), dtype=np.float32)
+    if weights is not None:
+        keys = np.log(weights).astype(np.float32) - np.log(-np.log(np.maximum(keys, 1e-30)))
+        return np.argpartition(-keys, k - 1, axis=1)[:, :k] + 1
+    return np.argpartition(keys, k - 1, axis=1)[:, :k] + 1
+
+
+def _pattern_numbers(rng, n_total, k, n):
+    """Arithmetic progressions of k numbers with a random slip step and start"""
+    steps = PATTERN_STEPS[rng.integers(0, len(PATTERN_STEPS), n)]
+    starts = 1 + np.floor(rng.random(n) * (n_total - (k - 1) * steps)).astype(np.int64)
+    return starts[:, None] + steps[:, None] * np.arange(k)
+
+
+def generate_tickets(rng, player_type, main_weights, euro_weights, max_euro, n):
+    """(main, euro) number arrays of n tickets of one player type"""
+    if player_type['kind'] == 'pattern':
+        main = _pattern_numbers(rng, MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, n)
+    else:
+        main = _sample_numbers(rng, MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, n, main_weights)
+    euro = _sample_numbers(rng, max_euro, EURO_NUMBERS_DRAWN, n, euro_weights)
+    return main, euro
+
+
+def _init_worker(spec):
+    _worker['context'] = attach(spec)
+
+
+def simulate_chunk(task):
+    """Hit histograms and pick counts of one chunk of tickets of one type against one draw"""
+    type_name, draw, size, seed_sequence = task
+    context = _worker['context']
+    player_type = PLAYER_TYPES[type_name]
+    max_euro = int(context['max_euro'][draw])
+    main_weights = number_weights(player_type, context['main_counts'][draw], MAIN_NUMBERS_TOTAL)
+    euro_weights = number_weights(player_type, context['euro_counts'][draw], max_euro)
+    if player_type['kind'] == 'birthday':
+        euro_weights = None  # every euro number is a possible month
+
+    rng = np.random.default_rng(seed_sequence)
+    main, euro = generate_tickets(rng, player_type, main_weights, euro_weights, max_euro, size)
+    main_hits = popcount(encode(main) & context['main_masks'][draw])
+    euro_hits = popcount(encode(euro) & context['euro_masks'][draw])
+    return (type_name, draw,
+            np.bincount(main_hits, minlength=MAIN_NUMBERS_DRAWN + 1),
+            np.bincount(euro_hits, minlength=EURO_NUMBERS_DRAWN + 1),
+            np.bincount(main.ravel(), minlength=MAIN_NUMBERS_TOTAL + 1))
+
+
+def simulate(context, tickets_per_type, workers=None, seed=2025, chunk_size=CHUNK_SIZE):
+    """
+    Stream tickets_per_type tickets of every type against every settled draw.
+    Returns accumulated histograms keyed by type name, arrays over draws.
+    """
+    n_draws = len(context['max_euro'])
+    chunks = [chunk_size] * (tickets_per_type // chunk_size)
+    if tickets_per_type % chunk_size:
+        chunks.append(tickets_per_type % chunk_size)
+    tasks = []
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(PLAYER_TYPES) * n_draws * len(chunks)))
+    for type_name in PLAYER_TYPES:
+        for draw in range(n_draws):
+            tasks += [(type_name, draw, size, next(seeds)) for size in chunks]
+
+    totals = {name: {'main_hits': np.zeros((n_draws, MAIN_NUMBERS_DRAWN + 1), dtype=np.int64),
+                     'euro_hits': np.zeros((n_draws, EURO_NUMBERS_DRAWN + 1), dtype=np.int64),
+                     'picks': np.zeros((n_draws, MAIN_NUMBERS_TOTAL + 1), dtype=np.int64)}
+              for name in PLAYER_TYPES}
+
+    def accumulate(results):
+        for type_name, draw, main_hits, euro_hits, picks in results:
+            totals[type_name]['main_hits'][draw] += main_hits
+            totals[type_name]['euro_hits'][draw] += euro_hits
+            totals[type_name]['picks'][draw] += picks
+
+    workers = workers or os.cpu_count() or 1
+    with SharedArrays(context) as shared:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.spec,)) as executor:
+                accumulate(executor.map(simulate_chunk, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+        else:
+            _init_worker(shared.spec)
+            accumulate(map(simulate_chunk, tasks))
+            _worker.clear()
+    return totals
+
+
+def class_probabilities(totals):
+    """
+    Prize class probabilities per type and draw, shape (types, draws, classes),
+    as products of the main and euro hit distributions. Hit counts get a
+    pseudo-count of 0.5 so that outcomes never seen in the simulation (5
+    main hits need ~10^7 tickets) keep a small non-zero probability.
+    """
+    mains = np.array([m for m, _ in PRIZE_CLASSES])
+    euros = np.array([e for _, e in PRIZE_CLASSES])
+
+    def distribution(counts):
+        counts = counts + 0.5
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    probabilities = []
+    for name in PLAYER_TYPES:
+        main = distribution(totals[name]['main_hits'])
+        euro = distribution(totals[name]['euro_hits'])
+        probabilities.append(main[:, mains] * euro[:, euros])
+    return np.array(probabilities)
+
+
+def _profile_deviance(class_probs, observed):
+    """Poisson deviance with the number of tickets per draw at its maximum-likelihood value"""
+    tickets = observed.sum(axis=1, keepdims=True) / class_probs.sum(axis=1, keepdims=True)
+    expected = tickets * class_probs
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(observed > 0, observed * np.log(observed / expected), 0.0)
+    return 2 * float((terms - (observed - expected)).sum()), tickets[:, 0]
+
+
+def fit_mixture(probabilities, observed, starts=8, seed=2025):
+    """
+    Mixture weights of the player types minimizing the Poisson deviance of
+    the observed winner counts. Weights are a softmax of free parameters.
+    Returns (weights, tickets per draw, deviance).
+    """
+    observed = np.asarray(observed, dtype=float)
+    n_types = probabilities.shape[0]
+
+    def objective(logits):
+        weights = np.exp(logits - logits.max())
+        weights /= weights.sum()
+        return _profile_deviance(np.tensordot(weights, probabilities, axes=1), observed)[0]
+
+    rng = np.random.default_rng(seed)
+    best = None
+    for start in range(starts):
+        initial = np.zeros(n_types) if start == 0 else rng.normal(0, 2, n_types)
+        result = minimize(objective, initial, method='Nelder-Mead',
+                          options={'maxiter': 20_000, 'xatol': 1e-6, 'fatol': 1e-9})
+        if best is None or result.fun < best.fun:
+            best = result
+    weights = np.exp(best.x - best.x.max())
+    weights /= weights.sum()
+    deviance, tickets = _profile_deviance(np.tensordot(weights, probabilities, axes=1), observed)
+    return weights, tickets, deviance
+
+
+def bootstrap_weights(probabilities, weights, tickets, replicates=BOOTSTRAP_REPLICATES, seed=2025):
+    """
+    Parametric bootstrap of the mixture weights: winner counts are redrawn as
+    Poisson counts of the fitted model and refitted. Returns the weights of
+    every replicate, shape (replicates, types).
+    """
+    rng = np.random.default_rng(seed)
+    expected = tickets[:, None] * np.tensordot(weights, probabilities, axes=1)
+    samples = np.empty((replicates, len(weights)))
+    for r in range(replicates):
+        samples[r] = fit_mixture(probabilities, rng.poisson(expected), starts=2, seed=seed + r)[0]
+    return samples
+
+
+def main():
+    tickets_per_type = int(float(sys.argv[1])) if len(sys.argv) > 1 else DEFAULT_TICKETS_PER_TYPE
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    try:
+        draws = DrawStore.load_validated(DRAWING_RESULTS_FILE)
+        prizes = PrizeStore.from_csv(draws, PRICE_BREAKDOWN_FILE)
+    except FileNotFoundError as e:
+        print(f"Error: Could not find file - {e}")
+        return
+    except DataValidationError as e:
+        print(f"Error: The file {DRAWING_RESULTS_FILE} failed validation")
+        print(e)
+        return
+    context = draw_contexts(draws, prizes)
+    total_tickets = tickets_per_type * len(PLAYER_TYPES) * len(prizes)
+    print(f"Simulating {tickets_per_type:,} tickets per player type against {len(prizes)} draw(s) "
+          f"with winner counts ({total_tickets:,} tickets)...")
+
+    started = time.perf_counter()
+    totals = simulate(context, tickets_per_type, workers)
+    elapsed = time.perf_counter() - started
+    print(f"Finished in {elapsed:.1f}s ({total_tickets / max(elapsed, 1e-9) / 1e6:.1f} million tickets/s)")
+
+    probabilities = class_probabilities(totals)
+    observed = prizes.winners.astype(float)
+    weights, tickets, deviance = fit_mixture(probabilities, observed)
+    samples = bootstrap_weights(probabilities, weights, tickets)
+    low, high = np.quantile(samples, INTERVAL, axis=0)
+    random_index = list(PLAYER_TYPES).index('random')
+    random_deviance, random_tickets = _profile_deviance(probabilities[random_index], observed)
+
+    # Free parameters: the weights (summing to 1) and the tickets of every draw
+    parameters = len(PLAYER_TYPES) - 1 + len(prizes)
+    print("\n" + "="*60)
+    print("FITTED PLAYER POPULATION")
+    print("="*60)
+    draws_text = "a single draw" if len(prizes) == 1 else f"{len(prizes)} draws"
+    print(f"Fit to {observed.size} winner counts of {draws_text} ({parameters} parameters)")
+    if observed.size < MIN_COUNTS_PER_PARAMETER * parameters:
+        print(f"Warning: fewer than {MIN_COUNTS_PER_PARAMETER} winner counts per parameter, the weights are "
+              f"not well identified; read them together with their {INTERVAL[1] - INTERVAL[0]:.0%} intervals")
+    for name, weight, lo, hi in sorted(zip(PLAYER_TYPES, weights, low, high), key=lambda x: -x[1]):
+        print(f"  {name:12s} {weight:6.1%}  [{lo:6.1%} - {hi:6.1%}]")
+    print(f"Deviance: {deviance:.1f} (uniform players only: {random_deviance:.1f})")
+
+    mixture = np.tensordot(weights, probabilities, axes=1)
+    rows = []
+    for d, draw_id in enumerate(prizes.ids):
+        uniform = prize_tier_probabilities(int(context['max_euro'][d]))
+        for c, (main_hits, euro_hits) in enumerate(PRIZE_CLASSES):
+            rows.append({
+                'draw_id': int(draw_id),
+                'price_category': c + 1,
+                'main_matches': main_hits,
+                'euro_matches': euro_hits,
+                'observed_winners': int(observed[d, c]),
+                'expected_winners': tickets[d] * mixture[d, c],
+                'expected_winners_uniform': random_tickets[d] * probabilities[random_index, d, c],
+                'uniform_probability': uniform[c]
+            })
+        p_jackpot = mixture[d, 0]
+        share = float(expected_jackpot_share(1.0, tickets[d], p_jackpot))
+        uniform_share = float(expected_jackpot_share(1.0, tickets[d], uniform[0]))
+        print(f"\nDraw {draw_id}: ~{tickets[d]:,.0f} tickets, jackpot winners expected "
+              f"{tickets[d] * p_jackpot:.3f} (uniform picks: {tickets[d] * uniform[0]:.3f})")
+        print(f"  A jackpot winner would keep {share:.1%} of the jackpot on average "
+              f"(uniform picks: {uniform_share:.1%})")
+
+    fit_df = pd.DataFrame(rows)
+    fit_file = os.path.join(base_dir, 'player_population_fit.csv')
+    fit_df.round({'expected_winners': 4, 'expected_winners_uniform': 4}).to_csv(fit_file, index=False)
+
+    mixture_file = os.path.join(base_dir, 'player_population_mixture.csv')
+    pd.DataFrame({
+        'player_type': list(PLAYER_TYPES),
+        'weight': weights.round(6),
+        'weight_low': low.round(6),
+        'weight_high': high.round(6),
+        'draws': len(prizes),
+        'winner_counts': observed.size
+    }).to_csv(mixture_file, index=False)
+
+    # Pick share of every main number in the fitted population (latest settled draw)
+    picks = sum(weight * totals[name]['picks'][-1, 1:] / totals[name]['picks'][-1, 1:].sum()
+                for name, weight in zip(PLAYER_TYPES, weights))
+    popularity_df = pd.DataFrame({
+        'number': np.arange(1, MAIN_NUMBERS_TOTAL + 1),
+        'pick_share': picks.round(6),
+        'relative_to_uniform': (picks * MAIN_NUMBERS_TOTAL).round(4)
+    })
+    popularity_file = os.path.join(base_dir, 'number_popularity.csv')
+    popularity_df.to_csv(popularity_file, index=False)
+
+    print(f"\nResults saved to: {fit_file}")
+    print(f"Mixture saved to: {mixture_file}")
+    print(f"Number popularity saved to: {popularity_file}")
+
+
+if __name__ == "__main__":
+    main()
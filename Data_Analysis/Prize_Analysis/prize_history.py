@@ -0,0 +1,196 @@
+"""
+Prize history and the pre-joined results view of the drawing results page.
+
+The view is exported as shards of draw + prize rows (one per year by
+default, or per block of N draws) in Prize_Analysis/results/, plus a small
+index.json manifest that lists the shards and embeds the latest draws, so
+the page renders after one request and loads older shards on demand.
+Shards are only rewritten when their content changes; appending a draw
+touches the newest shard and the manifest.
+
+Usage: python Data_Analysis/Prize_Analysis/prize_history.py [--draws-per-shard N]
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import sys
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from data_validation import DataValidationError
+from draw_store import DrawStore, PrizeStore, DRAWING_RESULTS_FILE, PRICE_BREAKDOWN_FILE
+
+RESULTS_DIR = os.path.join(base_dir, 'results')
+INDEX_FILE = os.path.join(RESULTS_DIR, 'index.json')
+
+# Draws embedded in the manifest for the first render
+LATEST_DRAWS = 10
+
+# Columnar fields of the view that are sliced into shards
+VIEW_COLUMNS = ['ids', 'dates', 'mainNumbers', 'euroNumbers', 'prizes', 'winners', 'totalPayout', 'rolloverChain']
+
+
+def build_results_view(draws, prizes):
+    """
+    Pre-joined columnar arrays for the drawing results page.
+    Every array is in draw order; prize fields are null for draws
+    without a stored price breakdown.
+    """
+    n_draws = len(draws)
+    n_classes = prizes.payouts.shape[1]
+
+    payouts = [None] * n_draws
+    winners = [None] * n_draws
+    total_payout = [None] * n_draws
+    rollover = [None] * n_draws
+    for row, position in enumerate(prizes.draw_index):
+        payouts[position] = prizes.payouts[row].tolist()
+        winners[position] = prizes.winners[row].tolist()
+        total_payout[position] = round(float(prizes.total_payout[row]), 2)
+        rollover[position] = int(prizes.rollover_chain[row])
+
+    return {
+        'ids': draws.ids.tolist(),
+        'dates': pd.to_datetime(draws.dates).strftime('%Y-%m-%d').tolist(),
+        'mainNumbers': np.sort(draws.main, axis=1).tolist(),
+        'euroNumbers': np.sort(draws.euro, axis=1).tolist(),
+        'prizes': payouts,
+        'winners': winners,
+        'totalPayout': total_payout,
+        'rolloverChain': rollover,
+        'metadata': {
+            'totalDraws': n_draws,
+            'drawsWithPrizes': len(prizes),
+            'prizeClasses': n_classes,
+            'generatedBy': 'prize_history.py'
+        }
+    }
+
+
+def slice_view(view, rows):
+    """Columnar view restricted to the rows of a slice"""
+    return {column: view[column][rows] for column in VIEW_COLUMNS}
+
+
+def shard_keys(view, draws_per_shard=None):
+    """Shard name of every draw: its year, or the block of draws_per_shard ids"""
+    if draws_per_shard:
+        return [f"{(draw_id - 1) // draws_per_shard * draws_per_shard + 1:06d}" for draw_id in view['ids']]
+    return [date[:4] for date in view['dates']]
+
+
+def build_result_shards(view, draws_per_shard=None):
+    """
+    Split the results view into shards of consecutive draws.
+    Returns (shards, manifest): shard payloads by file name and the index
+    describing them, oldest shard first.
+    """
+    keys = shard_keys(view, draws_per_shard)
+    shards = {}
+    entries = []
+    start = 0
+    for end in range(1, len(keys) + 1):
+        if end < len(keys) and keys[end] == keys[start]:
+            continue
+        shard = slice_view(view, slice(start, end))
+        body = json.dumps(shard, separators=(',', ':'))
+        file_name = f"results_{keys[start]}.json"
+        shards[file_name] = body
+        entries.append({
+            'key': keys[start],
+            'file': file_name,
+            'draws': end - start,
+            'firstId': shard['ids'][0],
+            'lastId': shard['ids'][-1],
+            'firstDate': shard['dates'][0],
+            'lastDate': shard['dates'][-1],
+            'hash': hashlib.sha1(body.encode()).hexdigest()[:12]
+        })
+        start = end
+
+    manifest = {
+        'shards': entries,
+        'latest': slice_view(view, slice(-LATEST_DRAWS, None)),
+        'metadata': dict(view['metadata'], shardBy=f"{draws_per_shard} draws" if draws_per_shard else 'year')
+    }
+    return shards, manifest
+
+
+def write_result_shards(shards, manifest, output_dir=RESULTS_DIR):
+    """
+    Write shards whose content changed since the last export and the manifest.
+    Shards no longer listed are removed. Returns the names of written files.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    index_file = os.path.join(output_dir, os.path.basename(INDEX_FILE))
+    try:
+        with open(index_file, encoding='utf-8') as f:
+            previous = {entry['file']: entry['hash'] for entry in json.load(f)['shards']}
+    except FileNotFoundError:
+        previous = {}
+
+    written = []
+    for entry in manifest['shards']:
+        path = os.path.join(output_dir, entry['file'])
+        if previous.get(entry['file']) == entry['hash'] and os.path.exists(path):
+            continue
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(shards[entry['file']])
+        written.append(entry['file'])
+
+    for file_name in set(previous) - set(shards):
+        path = os.path.join(output_dir, file_name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    written.append(os.path.basename(index_file))
+    return written
+
+
+def main():
+    args = sys.argv[1:]
+    draws_per_shard = int(args[args.index('--draws-per-shard') + 1]) if '--draws-per-shard' in args else None
+
+    print("Loading drawing results and price breakdowns...")
+    try:
+        draws = DrawStore.load_validated(DRAWING_RESULTS_FILE)
+        prizes = PrizeStore.from_csv(draws, PRICE_BREAKDOWN_FILE)
+    except FileNotFoundError as e:
+        print(f"Error: Could not find file - {e}")
+        return
+    except DataValidationError as e:
+        print(f"Error: The file {DRAWING_RESULTS_FILE} failed validation")
+        print(e)
+        return
+
+    print(f"Loaded {len(draws)} draws and {len(prizes)} price breakdowns")
+
+    print("\n" + "="*60)
+    print("PRIZE HISTORY")
+    print("="*60)
+
+    for draw_id, total, chain in zip(prizes.ids, prizes.total_payout, prizes.rollover_chain):
+        status = f"rollover #{chain}" if chain > 0 else "jackpot won"
+        print(f"  Draw {draw_id}: total payout {total:,.2f} EUR ({status})")
+
+    averages = prizes.class_averages_by_era()
+    averages_file = os.path.join(base_dir, 'prize_class_averages_by_era.csv')
+    averages.to_csv(averages_file, index=False)
+    print(f"\nResults saved to: {averages_file}")
+
+    shards, manifest = build_result_shards(build_results_view(draws, prizes), draws_per_shard)
+    written = write_result_shards(shards, manifest)
+    print(f"\nResults view: {len(shards)} shards in {RESULTS_DIR}")
+    print(f"Rewritten: {', '.join(written)}")
+    print(f"Index size: {os.path.getsize(INDEX_FILE)} bytes, "
+          f"largest shard: {max(len(body) for body in shards.values())} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import pandas as pd
+import numpy as np
+from scipy.special import comb
+from functools import lru_cache
+import os
+import sys
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from game_config import (
+    MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN,
+    EURO_ERAS, PRIZE_CLASSES, EUROJACKPOT, era_prize_classes
+)
+
+# Eurojackpot ticket price per field (EUR)
+TICKET_PRICE = 2.0
+
+# Upper jackpot limit of the game (EUR)
+JACKPOT_CAP = 120_000_000
+
+
+@lru_cache(maxsize=None)
+def hypergeometric_table(n_total, n_success, k_draw):
+    """
+    Exact hypergeometric probabilities for 0..k_draw successes.
+    n_total: total numbers available
+    n_success: numbers counted as success (e.g. the winning numbers)
+    k_draw: numbers drawn
+
+    Returns a read-only array indexed by the number of successes.
+    """
+    k = np.arange(k_draw + 1)
+    numerator = comb(n_success, k, exact=False) * comb(n_total - n_success, k_draw - k, exact=False)
+    table = numerator / comb(n_total, k_draw, exact=False)
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def prize_tier_probabilities(max_euro, main_total=MAIN_NUMBERS_TOTAL, main_drawn=MAIN_NUMBERS_DRAWN,
+                             euro_drawn=EURO_NUMBERS_DRAWN, prize_classes=tuple(PRIZE_CLASSES)):
+    """
+    Probability of every prize class for one ticket, in price_breakdown.csv order
+    (or the order of prize_classes, a tuple of (main, euro) matches).
+    Main and euro draws are independent, so each class probability is the
+    product of two hypergeometric terms. Cached per game configuration.
+    """
+    main_table = hypergeometric_table(main_total, main_drawn, main_drawn)
+    euro_table = hypergeometric_table(max_euro, euro_drawn, euro_drawn)
+
+    mains = np.array([m for m, _ in prize_classes], dtype=np.int64)
+    euros = np.array([e for _, e in prize_classes], dtype=np.int64)
+    probabilities = main_table[mains] * euro_table[euros]
+    probabilities.setflags(write=False)
+    return probabilities
+
+
+def estimate_tickets_sold(winners, probabilities):
+    """
+    Estimate the number of tickets played in a draw from its winner counts.
+    Uses the lower classes only, where winner counts are large enough to be stable.
+    Winner counts may carry leading scenario axes, the result has their shape.
+    """
+    winners = np.asarray(winners, dtype=float)
+    lower = slice(len(PRIZE_CLASSES) - 4, None)
+    return winners[..., lower].sum(axis=-1) / probabilities[lower].sum()
+
+
+def expected_jackpot_share(jackpot_sizes, tickets_sold, p_jackpot):
+    """
+    Expected jackpot payout given that the ticket wins class 1.
+    Other winners are Poisson distributed with mean tickets_sold * p_jackpot,
+    so the expected share is J * (1 - exp(-lambda)) / lambda.
+
+    jackpot_sizes and tickets_sold broadcast against each other.
+    """
+    jackpot_sizes = np.asarray(jackpot_sizes, dtype=float)
+    lam = np.asarray(tickets_sold, dtype=float) * p_jackpot
+    # (1 - exp(-lam)) / lam -> 1 for lam -> 0
+    share = np.where(lam > 0, -np.expm1(-lam) / np.where(lam > 0, lam, 1.0), 1.0)
+    return jackpot_sizes * share
+
+
+def shared_pool_payouts(class_pools, other_winners):
+    """
+    Per-winner payout for each class when the class pool is shared with
+    other_winners additional winners. Inputs broadcast over scenarios.
+    """
+    return np.asarray(class_pools, dtype=float) / (np.asarray(other_winners, dtype=float) + 1)
+
+
+def expected_ticket_value(probabilities, payouts, ticket_price=TICKET_PRICE):
+    """
+    Expected net value of one ticket.
+    payouts has the prize classes on its last axis, any leading axes are scenarios.
+    """
+    return np.asarray(payouts, dtype=float) @ probabilities - ticket_price
+
+
+def jackpot_scenario_payouts(base_payouts, jackpot_sizes, tickets_sold, p_jackpot):
+    """
+    Build a payout matrix of shape (jackpots, ticket scenarios, classes).
+    Class 1 is replaced by the expected jackpot share, all other classes keep
+    the payouts of the reference draw.
+    """
+    jackpot_sizes = np.asarray(jackpot_sizes, dtype=float)
+    tickets_sold = np.asarray(tickets_sold, dtype=float)
+
+    payouts = np.broadcast_to(
+        np.asarray(base_payouts, dtype=float),
+        (len(jackpot_sizes), len(tickets_sold), len(base_payouts))
+    ).copy()
+    payouts[:, :, 0] = expected_jackpot_share(jackpot_sizes[:, None], tickets_sold[None, :], p_jackpot)
+    return payouts
+
+
+def load_price_breakdown(csv_path):
+    """Load price_breakdown.csv and split it into payout and winner matrices"""
+    df = pd.read_csv(csv_path)
+    n_classes = len(PRIZE_CLASSES)
+    payout_columns = [f'price_category_{i}' for i in range(1, n_classes + 1)]
+    winner_columns = [f'winner_{i}' for i in range(1, n_classes + 1)]
+    return df['id'].to_numpy(), df[payout_columns].to_numpy(dtype=float), df[winner_columns].to_numpy(dtype=np.int64)
+
+
+def build_probability_table():
+    """
+    Prize class probabilities for every euro era as one DataFrame, each era
+    in its own class order (rarest first)
+    """
+    rows = []
+    for era in EURO_ERAS:
+        prize_classes = era_prize_classes(EUROJACKPOT, era)
+        probabilities = prize_tier_probabilities(era['max_euro'], prize_classes=prize_classes)
+        for index, ((main_hits, euro_hits), probability) in enumerate(zip(prize_classes, probabilities), start=1):
+            rows.append({
+                'era': era['name'],
+                'max_euro': era['max_euro'],
+                'price_category': index,
+                'main_matches': main_hits,
+                'euro_matches': euro_hits,
+                'probability': probability,
+                'odds_one_in': 1 / probability
+            })
+    return pd.DataFrame(rows)
+
+
+def main():
+    data_file = os.path.join(base_dir, '..', 'Data', 'price_breakdown.csv')
+    output_dir = base_dir
+
+    print("\n" + "="*60)
+    print("PRIZE CLASS PROBABILITIES")
+    print("="*60)
+
+    probability_table = build_probability_table()
+    for era in EURO_ERAS:
+        era_rows = probability_table[probability_table['era'] == era['name']]
+        print(f"\n{era['label']} (euro numbers 1-{era['max_euro']}):")
+        for _, row in era_rows.iterrows():
+            print(f"  Class {row['price_category']:2d} ({row['main_matches']}+{row['euro_matches']}): "
+                  f"1 in {row['odds_one_in']:,.0f}")
+        print(f"  Any prize: 1 in {1 / era_rows['probability'].sum():.2f}")
+
+    probability_file = os.path.join(output_dir, 'prize_tier_probabilities.csv')
+    probability_table.to_csv(probability_file, index=False)
+    print(f"\nResults saved to: {probability_file}")
+
+    print("\n" + "="*60)
+    print("EXPECTED TICKET VALUE")
+    print("="*60)
+
+    try:
+        draw_ids, payouts, winners = load_price_breakdown(data_file)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {data_file}")
+        return
+
+    # price_breakdown.csv only covers draws of the current era
+    probabilities = prize_tier_probabilities(EURO_ERAS[-1]['max_euro'])
+    draw_values = expected_ticket_value(probabilities, payouts)
+
+    for draw_id, value, draw_winners in zip(draw_ids, draw_values, winners):
+        print(f"Draw {draw_id}: expected value {value:+.4f} EUR per {TICKET_PRICE:.2f} EUR ticket "
+              f"(~{estimate_tickets_sold(draw_winners, probabilities):,.0f} tickets played)")
+
+    # Jackpot sweep based on the latest draw with prize data
+    reference_payouts = payouts[-1]
+    reference_tickets = estimate_tickets_sold(winners[-1], probabilities)
+
+    jackpot_sizes = np.arange(10_000_000, JACKPOT_CAP + 1, 1_000_000)
+    ticket_scenarios = reference_tickets * np.array([0.5, 0.75, 1.0, 1.5, 2.0, 3.0])
+
+    scenario_payouts = jackpot_scenario_payouts(reference_payouts, jackpot_sizes, ticket_scenarios, probabilities[0])
+    scenario_values = expected_ticket_value(probabilities, scenario_payouts)
+
+    sweep_df = pd.DataFrame({
+        'jackpot': np.repeat(jackpot_sizes, len(ticket_scenarios)),
+        'tickets_sold': np.tile(ticket_scenarios.round(), len(jackpot_sizes)).astype(np.int64),
+        'expected_jackpot_share': scenario_payouts[:, :, 0].ravel(),
+        'expected_value': scenario_values.ravel()
+    })
+    sweep_file = os.path.join(output_dir, 'expected_value_by_jackpot.csv')
+    sweep_df.to_csv(sweep_file, index=False)
+
+    print(f"\nJackpot sweep: {len(jackpot_sizes)} jackpot sizes x {len(ticket_scenarios)} ticket scenarios")
+    break_even = sweep_df[sweep_df['expected_value'] >= 0]
+    if len(break_even) > 0:
+        first = break_even.iloc[0]
+        print(f"Positive expected value from jackpot {first['jackpot']:,.0f} EUR "
+              f"with {first['tickets_sold']:,} tickets played")
+    else:
+        print("No scenario with positive expected value")
+    print(f"Results saved to: {sweep_file}")
+
+
+if __name__ == "__main__":
+    main()
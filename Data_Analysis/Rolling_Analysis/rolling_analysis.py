@@ -0,0 +1,334 @@
+"""
+Rolling statistics and online change-point detection over the draw sequence.
+
+For every draw the rolling mean and variance over the last WINDOW draws
+are updated in O(1) from running sums, for the main sum, the era-adjusted
+euro sum, the even counts and a chi-square deviation of the per-number
+counts in the window. A two-sided CUSUM detector per statistic flags
+drift away from the theoretical expectation.
+
+All state lives in RollingAnalyzer and is saved between runs, so new
+draws are processed incrementally. If the saved state is missing or does
+not match the output CSV, the whole history is recomputed.
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import pickle
+import sys
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from data_validation import DataValidationError
+from draw_store import DrawStore, DRAWING_RESULTS_FILE
+from game_config import MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN, get_era
+
+WINDOW = 50
+STATE_FILE = os.path.join(base_dir, '..', '.cache', 'rolling_analysis.state')
+STATISTICS_CSV = os.path.join(base_dir, 'rolling_statistics.csv')
+CHANGE_POINTS_CSV = os.path.join(base_dir, 'change_points.csv')
+
+# CUSUM parameters in units of the statistic's standard deviation:
+# drift smaller than CUSUM_SLACK is ignored, an alarm fires at CUSUM_THRESHOLD
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 8.0
+
+
+def sum_moments(n_total, drawn):
+    """Mean and variance of the sum of `drawn` distinct numbers from 1..n_total"""
+    mean = drawn * (n_total + 1) / 2
+    variance = drawn * (n_total ** 2 - 1) / 12 * (n_total - drawn) / (n_total - 1)
+    return mean, variance
+
+
+def even_count_moments(n_total, drawn):
+    """Mean and variance of the number of even values (hypergeometric)"""
+    p = (n_total // 2) / n_total
+    mean = drawn * p
+    variance = drawn * p * (1 - p) * (n_total - drawn) / (n_total - 1)
+    return mean, variance
+
+
+class RollingWindow:
+    """Rolling mean and variance over the last `size` values, O(1) per update"""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = [0.0] * size
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+
+    def push(self, value):
+        slot = self.count % self.size
+        if self.count >= self.size:
+            old = self.values[slot]
+            self.total -= old
+            self.total_squares -= old * old
+        self.values[slot] = value
+        self.total += value
+        self.total_squares += value * value
+        self.count += 1
+
+    @property
+    def filled(self):
+        return min(self.count, self.size)
+
+    @property
+    def mean(self):
+        return self.total / self.filled if self.filled else float('nan')
+
+    @property
+    def variance(self):
+        n = self.filled
+        if n < 2:
+            return float('nan')
+        return max(0.0, (self.total_squares - self.total * self.total / n) / (n - 1))
+
+
+class NumberCountWindow:
+    """
+    Per-number counts over the last `size` draws and their chi-square
+    deviation from uniform, both updated in O(numbers per draw).
+    """
+
+    def __init__(self, size, max_number, drawn):
+        self.size = size
+        self.max_number = max_number
+        self.drawn = drawn
+        self.draws = [()] * size
+        self.count = 0
+        self.counts = np.zeros(max_number + 1, dtype=np.int64)
+        self.squares = 0  # sum of counts^2, the chi-square follows from it
+
+    def _add(self, number, delta):
+        c = self.counts[number]
+        self.squares += (c + delta) ** 2 - c ** 2
+        self.counts[number] = c + delta
+
+    def push(self, numbers):
+        slot = self.count % self.size
+        if self.count >= self.size:
+            for number in self.draws[slot]:
+                self._add(number, -1)
+        for number in numbers:
+            self._add(number, 1)
+        self.draws[slot] = tuple(int(n) for n in numbers)
+        self.count += 1
+
+    @property
+    def chi_square(self):
+        """sum (count - E)^2 / E with E the expected count per number in the window"""
+        n = min(self.count, self.size)
+        expected = n * self.drawn / self.max_number
+        if expected == 0:
+            return float('nan')
+        # sum (c - E)^2 = sum c^2 - 2 E sum c + max_number E^2, with sum c = n * drawn
+        return (self.squares - 2 * expected * n * self.drawn + self.max_number * expected ** 2) / expected
+
+
+class CusumDetector:
+    """
+    Two-sided CUSUM on a standardized statistic.
+    update() returns +1 / -1 when an upward / downward drift is detected
+    (the sums are reset afterwards) and 0 otherwise.
+    """
+
+    def __init__(self, mean, std, slack=CUSUM_SLACK, threshold=CUSUM_THRESHOLD):
+        self.mean = mean
+        self.std = std
+        self.slack = slack
+        self.threshold = threshold
+        self.upper = 0.0
+        self.lower = 0.0
+
+    def update(self, value, mean=None, std=None):
+        mean = self.mean if mean is None else mean
+        std = self.std if std is None else std
+        z = (value - mean) / std
+        self.upper = max(0.0, self.upper + z - self.slack)
+        self.lower = max(0.0, self.lower - z - self.slack)
+        if self.upper > self.threshold:
+            self.upper = self.lower = 0.0
+            return 1
+        if self.lower > self.threshold:
+            self.upper = self.lower = 0.0
+            return -1
+        return 0
+
+
+class RollingAnalyzer:
+    """Rolling statistics and change-point detectors, fed one draw at a time"""
+
+    STATISTICS = ['main_sum', 'euro_sum_z', 'main_even', 'euro_even', 'main_chi_square']
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.last_id = None
+        self.windows = {name: RollingWindow(window) for name in self.STATISTICS}
+        self.main_counts = NumberCountWindow(window, MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN)
+
+        main_mean, main_variance = sum_moments(MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN)
+        even_mean, even_variance = even_count_moments(MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN)
+        # Each number is in a draw with probability k/N, so the expected
+        # chi-square of a window is N * (1 - k/N) = N - k
+        chi_mean = MAIN_NUMBERS_TOTAL - MAIN_NUMBERS_DRAWN
+        self.detectors = {
+            'main_sum': CusumDetector(main_mean, np.sqrt(main_variance)),
+            'euro_sum_z': CusumDetector(0.0, 1.0),
+            'main_even': CusumDetector(even_mean, np.sqrt(even_variance)),
+            # The euro even count depends on the era and is standardized per draw
+            'euro_even': CusumDetector(None, None),
+            # Overlapping windows are strongly correlated, so the chi-square
+            # detector only sees non-overlapping windows
+            'main_chi_square': CusumDetector(chi_mean, np.sqrt(2 * chi_mean))
+        }
+
+    def update(self, draw_id, date, era_name, main, euro):
+        """Process one draw, returns its statistics record and the list of change points"""
+        if self.last_id is not None and draw_id <= self.last_id:
+            raise ValueError(f"Draw {draw_id} is not newer than the last processed draw {self.last_id}")
+        era = get_era(era_name)
+        euro_mean, euro_variance = sum_moments(era['max_euro'], EURO_NUMBERS_DRAWN)
+        euro_even_mean, euro_even_variance = even_count_moments(era['max_euro'], EURO_NUMBERS_DRAWN)
+
+        values = {
+            'main_sum': float(sum(main)),
+            'euro_sum_z': (sum(euro) - euro_mean) / np.sqrt(euro_variance),
+            'main_even': float(sum(1 for n in main if n % 2 == 0)),
+            'euro_even': float(sum(1 for n in euro if n % 2 == 0))
+        }
+        self.main_counts.push(main)
+        values['main_chi_square'] = self.main_counts.chi_square
+
+        record = {'id': int(draw_id), 'date': str(date)}
+        change_points = []
+        for name in self.STATISTICS:
+            self.windows[name].push(values[name])
+            record[name] = values[name]
+            record[f'{name}_rolling_mean'] = self.windows[name].mean
+            record[f'{name}_rolling_var'] = self.windows[name].variance
+
+            if name == 'main_chi_square' and self.main_counts.count % self.window != 0:
+                continue
+            if name == 'euro_even':
+                direction = self.detectors[name].update(values[name], euro_even_mean, np.sqrt(euro_even_variance))
+            else:
+                direction = self.detectors[name].update(values[name])
+            if direction:
+                change_points.append({'id': int(draw_id), 'date': str(date), 'statistic': name,
+                                      'direction': 'up' if direction > 0 else 'down',
+                                      'rolling_mean': self.windows[name].mean})
+
+        self.last_id = int(draw_id)
+        return record, change_points
+
+    def process(self, draws, start=0):
+        """Feed draws[start:] of a DrawStore, returns (records, change_points)"""
+        eras = draws.era_names()
+        records, change_points = [], []
+        for i in range(start, len(draws)):
+            record, changes = self.update(draws.ids[i], draws.dates[i], eras[i],
+                                          draws.main[i].tolist(), draws.euro[i].tolist())
+            records.append(record)
+            change_points.extend(changes)
+        return records, change_points
+
+    def save(self, path=STATE_FILE):
+        """Store the state as plain data, so it loads independently of how the module was imported"""
+        state = {
+            'window': self.window,
+            'last_id': self.last_id,
+            'windows': {name: vars(w) for name, w in self.windows.items()},
+            'main_counts': vars(self.main_counts),
+            'detectors': {name: vars(d) for name, d in self.detectors.items()}
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(state, f)
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        analyzer = cls(state['window'])
+        analyzer.last_id = state['last_id']
+        for name, values in state['windows'].items():
+            analyzer.windows[name].__dict__.update(values)
+        analyzer.main_counts.__dict__.update(state['main_counts'])
+        for name, values in state['detectors'].items():
+            analyzer.detectors[name].__dict__.update(values)
+        return analyzer
+
+
+def _load_previous(window):
+    """Saved analyzer and outputs, or None if they are missing or out of sync"""
+    try:
+        analyzer = RollingAnalyzer.load()
+        statistics = pd.read_csv(STATISTICS_CSV)
+        change_points = pd.read_csv(CHANGE_POINTS_CSV)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if analyzer.window != window or len(statistics) == 0 or statistics['id'].iloc[-1] != analyzer.last_id:
+        return None
+    return analyzer, statistics, change_points
+
+
+def main():
+    data_file = DRAWING_RESULTS_FILE
+    full = '--full' in sys.argv
+    try:
+        draws = DrawStore.load_validated(data_file)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {data_file}")
+        return
+    except DataValidationError as e:
+        print(f"Error: The file {data_file} failed validation")
+        print(e)
+        return
+    print(f"Loaded {len(draws)} draws from {data_file}")
+
+    previous = None if full else _load_previous(WINDOW)
+    if previous is not None and draws.index_of([previous[0].last_id])[0] >= 0:
+        analyzer, statistics, change_points = previous
+        start = int(draws.index_of([analyzer.last_id])[0]) + 1
+        print(f"Continuing after draw {analyzer.last_id}: {len(draws) - start} new draws")
+    else:
+        analyzer = RollingAnalyzer(WINDOW)
+        statistics = change_points = None
+        start = 0
+        print(f"Processing the full history with a window of {WINDOW} draws")
+
+    records, new_change_points = analyzer.process(draws, start)
+    columns = ['id', 'date'] + [f'{name}{suffix}' for name in RollingAnalyzer.STATISTICS
+                                for suffix in ('', '_rolling_mean', '_rolling_var')]
+    new_statistics = pd.DataFrame(records, columns=columns)
+    new_change_points = pd.DataFrame(new_change_points,
+                                     columns=['id', 'date', 'statistic', 'direction', 'rolling_mean'])
+    if statistics is not None:
+        new_statistics = pd.concat([statistics, new_statistics], ignore_index=True)
+        new_change_points = pd.concat([change_points, new_change_points], ignore_index=True)
+
+    new_statistics.round(6).to_csv(STATISTICS_CSV, index=False)
+    new_change_points.round(6).to_csv(CHANGE_POINTS_CSV, index=False)
+    analyzer.save()
+
+    print("\n" + "="*60)
+    print("ROLLING STATISTICS")
+    print("="*60)
+    last = new_statistics.iloc[-1]
+    for name in RollingAnalyzer.STATISTICS:
+        print(f"{name:>16}: rolling mean {last[f'{name}_rolling_mean']:.3f}, "
+              f"rolling variance {last[f'{name}_rolling_var']:.3f}")
+
+    print(f"\nChange points detected: {len(new_change_points)}")
+    for _, row in new_change_points.tail(10).iterrows():
+        print(f"  Draw {row['id']} ({row['date']}): {row['statistic']} drifts {row['direction']}")
+    print(f"\nResults saved to: {STATISTICS_CSV}")
+    print(f"Results saved to: {CHANGE_POINTS_CSV}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+import json
+import os
+import sys
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from draw_store import DRAWING_RESULTS_FILE
+from game_config import MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN, EURO_ERAS
+from versioned_dataset import VersionedDataset, record_artifact
+
+MAX_EURO_NUMBER = max(era['max_euro'] for era in EURO_ERAS)
+MAX_MAIN_SUM = sum(range(MAIN_NUMBERS_TOTAL - MAIN_NUMBERS_DRAWN + 1, MAIN_NUMBERS_TOTAL + 1))
+MAX_EURO_SUM = sum(range(MAX_EURO_NUMBER - EURO_NUMBERS_DRAWN + 1, MAX_EURO_NUMBER + 1))
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+# Meteorological seasons, indexed by month - 1
+SEASON_OF_MONTH = ['Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+                   'Summer', 'Summer', 'Autumn', 'Autumn', 'Autumn', 'Winter']
+SEASONS = ['Spring', 'Summer', 'Autumn', 'Winter']
+
+
+def _codes(values, order=None):
+    """Integer group code per draw plus the group labels, in `order` if given"""
+    values = np.asarray(values)
+    if order is None:
+        labels, codes = np.unique(values, return_inverse=True)
+        return codes, [str(label) for label in labels]
+    observed = set(values.tolist())
+    present = [label for label in order if label in observed]
+    lookup = {label: i for i, label in enumerate(present)}
+    return np.array([lookup[v] for v in values.tolist()], dtype=np.int64), present
+
+
+def weekday_segments(draws):
+    index = pd.DatetimeIndex(draws.dates)
+    return _codes(np.array(WEEKDAYS, dtype=object)[index.dayofweek.to_numpy()], WEEKDAYS)
+
+
+def year_segments(draws):
+    return _codes(pd.DatetimeIndex(draws.dates).year.to_numpy())
+
+
+def month_segments(draws):
+    index = pd.DatetimeIndex(draws.dates)
+    return _codes(np.array(MONTHS, dtype=object)[index.month.to_numpy() - 1], MONTHS)
+
+
+def season_segments(draws):
+    index = pd.DatetimeIndex(draws.dates)
+    return _codes(np.array(SEASON_OF_MONTH, dtype=object)[index.month.to_numpy() - 1], SEASONS)
+
+
+def era_segments(draws):
+    return _codes(draws.era_names(), [era['name'] for era in EURO_ERAS])
+
+
+def date_bins(edges, labels=None):
+    """
+    User-defined segments from date boundaries.
+    Draws before edges[0] or on/after edges[-1] are not assigned to any group.
+    Returns a segment function usable like the predefined ones.
+    """
+    edges = np.array(edges, dtype='datetime64[D]')
+    labels = labels or [f"{start}..{end}" for start, end in zip(edges[:-1], edges[1:])]
+    if len(labels) != len(edges) - 1:
+        raise ValueError(f"{len(edges) - 1} bins need {len(edges) - 1} labels, got {len(labels)}")
+
+    def segments(draws):
+        codes = np.searchsorted(edges, draws.dates, side='right') - 1
+        codes[(codes < 0) | (codes >= len(labels))] = -1
+        return codes, list(labels)
+    return segments
+
+
+SEGMENTS = {
+    'weekday': weekday_segments,
+    'year': year_segments,
+    'month': month_segments,
+    'season': season_segments,
+    'era': era_segments
+}
+
+
+def _grouped_bincount(codes, values, n_groups, n_values):
+    """
+    Histogram of values per group in one bincount over combined keys.
+    codes: group per row (-1 = no group), values: (rows,) or (rows, k)
+    Returns an array of shape (n_groups, n_values).
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if values.ndim == 2:
+        codes = np.repeat(codes, values.shape[1])
+        values = values.ravel()
+    keep = codes >= 0
+    keys = codes[keep] * n_values + values[keep]
+    return np.bincount(keys, minlength=n_groups * n_values).reshape(n_groups, n_values)
+
+
+def segment_aggregates(draws, by):
+    """
+    Frequency, sum and parity aggregates for all groups of one segmentation.
+
+    by: name in SEGMENTS or a function draws -> (codes, labels)
+    All aggregates are computed with one grouped bincount each, so the cost
+    does not depend on the number of groups.
+    """
+    segment = SEGMENTS[by] if isinstance(by, str) else by
+    codes, labels = segment(draws)
+    codes = np.asarray(codes, dtype=np.int64)
+    n_groups = len(labels)
+    main = draws.main.astype(np.int64)
+    euro = draws.euro.astype(np.int64)
+
+    return {
+        'labels': labels,
+        'draws': _grouped_bincount(codes, np.zeros(len(codes)), n_groups, 1)[:, 0],
+        'main_frequency': _grouped_bincount(codes, main, n_groups, MAIN_NUMBERS_TOTAL + 1)[:, 1:],
+        'euro_frequency': _grouped_bincount(codes, euro, n_groups, MAX_EURO_NUMBER + 1)[:, 1:],
+        'main_sum': _grouped_bincount(codes, main.sum(axis=1), n_groups, MAX_MAIN_SUM + 1),
+        'euro_sum': _grouped_bincount(codes, euro.sum(axis=1), n_groups, MAX_EURO_SUM + 1),
+        'main_even': _grouped_bincount(codes, (main % 2 == 0).sum(axis=1), n_groups, MAIN_NUMBERS_DRAWN + 1),
+        'euro_even': _grouped_bincount(codes, (euro % 2 == 0).sum(axis=1), n_groups, EURO_NUMBERS_DRAWN + 1)
+    }
+
+
+def _sum_summary(counts):
+    """Sum histogram trimmed to its observed range, plus mean and std"""
+    observed = np.nonzero(counts)[0]
+    if len(observed) == 0:
+        return {'offset': 0, 'counts': [], 'mean': None, 'std': None}
+    values = np.arange(len(counts))
+    total = counts.sum()
+    mean = (values * counts).sum() / total
+    std = np.sqrt(((values - mean) ** 2 * counts).sum() / total)
+    return {
+        'offset': int(observed[0]),
+        'counts': counts[observed[0]:observed[-1] + 1].tolist(),
+        'mean': round(float(mean), 3),
+        'std': round(float(std), 3)
+    }
+
+
+def segments_to_json(aggregates):
+    """JSON structure with one entry per group"""
+    groups = []
+    for i, label in enumerate(aggregates['labels']):
+        groups.append({
+            'label': label,
+            'draws': int(aggregates['draws'][i]),
+            'mainFrequency': aggregates['main_frequency'][i].tolist(),
+            'euroFrequency': aggregates['euro_frequency'][i].tolist(),
+            'mainSum': _sum_summary(aggregates['main_sum'][i]),
+            'euroSum': _sum_summary(aggregates['euro_sum'][i]),
+            'mainEvenCount': aggregates['main_even'][i].tolist(),
+            'euroEvenCount': aggregates['euro_even'][i].tolist()
+        })
+    return groups
+
+
+def main():
+    data_file = DRAWING_RESULTS_FILE
+    try:
+        dataset = VersionedDataset(data_file)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {data_file}")
+        return
+    version = dataset.latest
+    draws = dataset.as_of(version['version'])
+    print(f"Loaded {len(draws)} draws from {data_file} (version {version['version']})")
+
+    print("\n" + "="*60)
+    print("SEGMENTED ANALYSIS")
+    print("="*60)
+
+    result = {}
+    for name in SEGMENTS:
+        aggregates = segment_aggregates(draws, name)
+        result[name] = segments_to_json(aggregates)
+        print(f"\nBy {name}:")
+        for group in result[name]:
+            print(f"  {group['label']:>14}: {group['draws']:4d} draws, "
+                  f"mean main sum {group['mainSum']['mean']}")
+
+    output = {
+        'segments': result,
+        'metadata': {
+            'totalDraws': len(draws),
+            'dataSource': os.path.basename(data_file),
+            'datasetVersion': version['version'],
+            'mainNumbers': list(range(1, MAIN_NUMBERS_TOTAL + 1)),
+            'euroNumbers': list(range(1, MAX_EURO_NUMBER + 1)),
+            'description': 'Per-group aggregates; sums are histograms starting at offset, '
+                           'even counts are indexed by the number of even values per draw',
+            'generatedBy': 'segment_analysis.py'
+        }
+    }
+    json_file = os.path.join(base_dir, 'segments.json')
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(output, f, separators=(',', ':'))
+    record_artifact(json_file, version, 'segment_analysis.py')
+    print(f"\nResults saved to: {json_file}")
+    print(f"File size: {os.path.getsize(json_file)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Walk-forward evaluation of the pick strategies.
+
+The history is replayed draw by draw. Before every draw each strategy
+sees only the draws before it: frequency counts (optionally over a
+lookback window) are updated incrementally, hot/cold sets are rebuilt
+from them, tickets are generated and then scored against the draw.
+
+Strategies mirror the site's generators:
+  random        - uniform picks (random-pick.js)
+  hot-numbers, cold-numbers, mixed, weighted
+                - hot/cold quotas of structured-pick.js, same names and
+                  quotas as alias_pick_generator.STRATEGIES
+  coverage      - disjoint main numbers and euro pairs covering all euro
+                  numbers, like the picks of 6_additional_picks.py
+
+Configurations are evaluated in parallel processes. The draws, their
+bitmasks and the prize levels are published once in shared memory and
+every worker attaches to them by name. Returns are computed
+at fixed prize levels (the latest row of price_breakdown.csv), so they
+compare strategies rather than estimate real winnings.
+
+Usage: python Data_Analysis/Strategy_Evaluation/walk_forward.py [workers]
+"""
+
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+sys.path.insert(0, os.path.join(base_dir, '..', 'structured_pick_generator'))
+
+from alias_pick_generator import STRATEGIES as QUOTA_STRATEGIES
+from bitmask import encode, popcount
+from draw_store import DrawStore, PrizeStore, DRAWING_RESULTS_FILE
+from shared_arrays import SharedArrays, attach_draws, draw_arrays
+from game_config import (
+    MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN,
+    PRIZE_CLASSES, get_era, prize_class_lookup
+)
+
+# Draws seen before the first evaluated draw
+WARMUP_DRAWS = 50
+TICKET_PRICE = 2.0
+
+_worker = {}
+
+
+class FrequencyState:
+    """
+    Number frequencies over all previous draws or the last `lookback` draws.
+    Euro counts restart at every era change, like the per-era frequency files.
+    """
+
+    def __init__(self, lookback=None):
+        self.lookback = lookback
+        self.main_counts = np.zeros(MAIN_NUMBERS_TOTAL + 1, dtype=np.int64)
+        self.euro_counts = None
+        self.era = None
+        self.history = deque()
+
+    def update(self, main, euro, era):
+        if era['name'] != self.era:
+            self.era = era['name']
+            self.euro_counts = np.zeros(era['max_euro'] + 1, dtype=np.int64)
+            # Euro numbers of the previous era are no longer counted
+            self.history = deque((m, None) for m, _ in self.history)
+
+        self.main_counts[main] += 1
+        self.euro_counts[euro] += 1
+        if self.lookback is None:
+            return
+        self.history.append((main, euro))
+        if len(self.history) > self.lookback:
+            old_main, old_euro = self.history.popleft()
+            self.main_counts[old_main] -= 1
+            if old_euro is not None:
+                self.euro_counts[old_euro] -= 1
+
+    @staticmethod
+    def categories(counts, hot_count, cold_count):
+        """hot/cold/neutral members, numbers sorted by frequency with ties towards the lower number"""
+        order = np.argsort(-counts[1:], kind='stable') + 1
+        return {
+            'hot': order[:hot_count],
+            'cold': order[len(order) - cold_count:],
+            'neutral': order[hot_count:len(order) - cold_count],
+            'all': order
+        }
+
+
+def _sample_without_replacement(rng, members, k, n, weights=None):
+    """
+    n rows of k distinct members. With weights, the Gumbel top-k trick
+    samples proportional to the weights without replacement.
+    """
+    keys = rng.random((n, len(members)))
+    if weights is not None:
+        keys = np.log(np.maximum(weights, 1e-12)) - np.log(-np.log(keys))
+        return members[np.argpartition(-keys, k - 1, axis=1)[:, :k]]
+    return members[np.argpartition(keys, k - 1, axis=1)[:, :k]]
+
+
+def _coverage_tickets(rng, n_total, drawn, n):
+    """Rows taken from consecutive random permutations, so tickets within one permutation are disjoint"""
+    per_permutation = n_total // drawn
+    permutations = -(-n // per_permutation)
+    numbers = np.argsort(rng.random((permutations, n_total)), axis=1)[:, :per_permutation * drawn] + 1
+    return numbers.reshape(-1, drawn)[:n]
+
+
+def generate_tickets(rng, config, state, max_euro, n):
+    """n tickets of one strategy as (main, euro) arrays"""
+    strategy = config['strategy']
+    if strategy == 'random':
+        main = _sample_without_replacement(rng, np.arange(1, MAIN_NUMBERS_TOTAL + 1), MAIN_NUMBERS_DRAWN, n)
+        euro = _sample_without_replacement(rng, np.arange(1, max_euro + 1), EURO_NUMBERS_DRAWN, n)
+        return main, euro
+    if strategy == 'coverage':
+        return (_coverage_tickets(rng, MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, n),
+                _coverage_tickets(rng, max_euro, EURO_NUMBERS_DRAWN, n))
+
+    quotas = QUOTA_STRATEGIES[strategy]
+    parts = {}
+    for kind, counts, drawn, hot_count, cold_count in (
+            ('main', state.main_counts, MAIN_NUMBERS_DRAWN, config['hot_count'], config['cold_count']),
+            ('euro', state.euro_counts, EURO_NUMBERS_DRAWN, config['euro_hot_count'], config['euro_cold_count'])):
+        categories = FrequencyState.categories(counts, hot_count, cold_count)
+        if quotas[kind] is None:
+            members = categories['all']
+            parts[kind] = _sample_without_replacement(rng, members, drawn, n, weights=counts[members] + 1.0)
+        else:
+            parts[kind] = np.hstack([_sample_without_replacement(rng, categories[category], k, n)
+                                     for category, k in quotas[kind].items() if k > 0])
+    return parts['main'], parts['euro']
+
+
+def publish_inputs(data_file=DRAWING_RESULTS_FILE):
+    """Draws, bitmasks and fixed prize levels in shared memory for the workers"""
+    draws = DrawStore.load_validated(data_file)
+    prizes = PrizeStore.from_csv(draws)
+    # Index 0 is "no prize"; the latest breakdown serves as fixed prize levels
+    payouts = np.concatenate([[0.0], prizes.payouts[-1]])
+    return SharedArrays(dict(draw_arrays(draws), payouts=payouts))
+
+
+def _init_worker(spec):
+    draws, arrays = attach_draws(spec)
+    _worker['draws'] = draws
+    _worker['eras'] = [get_era(name) for name in draws.era_names()]
+    _worker['main_masks'] = arrays['main_masks']
+    _worker['euro_masks'] = arrays['euro_masks']
+    _worker['payouts'] = arrays['payouts']
+
+
+def evaluate_config(config):
+    """Replay the history for one configuration and return its score row"""
+    draws, eras = _worker['draws'], _worker['eras']
+    rng = np.random.default_rng(np.random.SeedSequence(config['seed']))
+    state = FrequencyState(config['lookback'])
+    lookup = prize_class_lookup()
+    n = config['tickets_per_draw']
+
+    class_counts = np.zeros(len(PRIZE_CLASSES) + 1, dtype=np.int64)
+    main_hits_total = euro_hits_total = 0
+    for i in range(len(draws)):
+        if i >= WARMUP_DRAWS:
+            main, euro = generate_tickets(rng, config, state, eras[i]['max_euro'], n)
+            main_hits = popcount(encode(main) & _worker['main_masks'][i])
+            euro_hits = popcount(encode(euro) & _worker['euro_masks'][i])
+            class_counts += np.bincount(lookup[main_hits, euro_hits], minlength=len(PRIZE_CLASSES) + 1)
+            main_hits_total += int(main_hits.sum())
+            euro_hits_total += int(euro_hits.sum())
+        state.update(draws.main[i], draws.euro[i], eras[i])
+
+    tickets = int(class_counts.sum())
+    winnings = float(class_counts @ _worker['payouts'])
+    row = dict(config)
+    row.update({
+        'tickets': tickets,
+        'win_rate': (tickets - class_counts[0]) / tickets,
+        'mean_main_hits': main_hits_total / tickets,
+        'mean_euro_hits': euro_hits_total / tickets,
+        'return_per_ticket': winnings / tickets - TICKET_PRICE,
+        **{f'class_{i}': int(class_counts[i]) for i in range(1, len(PRIZE_CLASSES) + 1)}
+    })
+    return row
+
+
+def build_sweep(seeds=3, tickets_per_draw=10):
+    """Parameter grid: every strategy, lookbacks and hot/cold set sizes, several seeds"""
+    configs = []
+    base = {'lookback': None, 'hot_count': 10, 'cold_count': 10, 'euro_hot_count': 3, 'euro_cold_count': 3}
+    for strategy, seed in itertools.product(['random', 'coverage'], range(seeds)):
+        configs.append(dict(base, strategy=strategy, seed=seed, tickets_per_draw=tickets_per_draw))
+    for strategy, lookback, hot_count, seed in itertools.product(
+            QUOTA_STRATEGIES, [None, 25, 50, 100, 200], [5, 10, 15], range(seeds)):
+        if strategy == 'weighted' and hot_count != base['hot_count']:
+            continue  # weighted picks do not depend on the hot/cold split
+        configs.append(dict(base, strategy=strategy, lookback=lookback, hot_count=hot_count,
+                            cold_count=hot_count, seed=seed, tickets_per_draw=tickets_per_draw))
+    return configs
+
+
+def run_sweep(configs, data_file=DRAWING_RESULTS_FILE, workers=None):
+    """Evaluate all configurations; the inputs are loaded once and shared with every worker"""
+    workers = workers or os.cpu_count() or 1
+    with publish_inputs(data_file) as inputs:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(inputs.spec,)) as executor:
+                rows = list(executor.map(evaluate_config, configs, chunksize=max(1, len(configs) // (workers * 4))))
+        else:
+            _init_worker(inputs.spec)
+            rows = [evaluate_config(config) for config in configs]
+            _worker.clear()
+    return pd.DataFrame(rows)
+
+
+def summarize(results):
+    """Mean over seeds per configuration"""
+    keys = ['strategy', 'lookback', 'hot_count', 'cold_count']
+    metrics = ['win_rate', 'mean_main_hits', 'mean_euro_hits', 'return_per_ticket']
+    results = results.assign(lookback=results['lookback'].map(lambda v: 'all' if pd.isna(v) else str(int(v))))
+    summary = results.groupby(keys)[metrics].mean().reset_index()
+    return summary.sort_values('win_rate', ascending=False)
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    configs = build_sweep()
+    print(f"Evaluating {len(configs)} configurations walk-forward over {os.path.basename(DRAWING_RESULTS_FILE)}...")
+
+    started = time.perf_counter()
+    results = run_sweep(configs, workers=workers)
+    elapsed = time.perf_counter() - started
+    print(f"Finished in {elapsed:.1f}s")
+
+    results_file = os.path.join(base_dir, 'walk_forward_results.csv')
+    results.to_csv(results_file, index=False)
+    summary = summarize(results)
+    summary_file = os.path.join(base_dir, 'walk_forward_summary.csv')
+    summary.round(6).to_csv(summary_file, index=False)
+
+    print("\n" + "="*60)
+    print("WALK-FORWARD RESULTS (mean over seeds)")
+    print("="*60)
+    print(summary.head(10).to_string(index=False))
+    print("...")
+    print(summary.tail(5).to_string(index=False))
+    baseline = summary[summary['strategy'] == 'random'].iloc[0]
+    print(f"\nRandom baseline: win rate {baseline['win_rate']:.4f}, "
+          f"mean main hits {baseline['mean_main_hits']:.4f}")
+    print(f"\nResults saved to: {results_file}")
+    print(f"Summary saved to: {summary_file}")
+
+
+if __name__ == "__main__":
+    main()
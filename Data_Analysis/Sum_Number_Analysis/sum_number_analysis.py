@@ -1,20 +1,26 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from itertools import combinations
+from math import comb
 import os
+import sys
 from datetime import datetime
 
-# Set up paths
-input_file = '/Users/tobi/Documents/Lotto/Lotto_Website/Data_Analysis/Data/drawing_results_20250808.csv'
-output_dir = '/Users/tobi/Documents/Lotto/Lotto_Website/Data_Analysis/Sum_Number_Analysis'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from game_config import EUROJACKPOT, era_mask
+from memo_cache import memoize
+from versioned_dataset import load_version, record_artifact
+
+# Set up paths; the published sum files are built from a pinned dataset version
+DATASET_VERSION = '20250808'
+output_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Create output directory if it doesn't exist
 os.makedirs(output_dir, exist_ok=True)
 
 def load_data():
-    """Load the drawing results data"""
-    df = pd.read_csv(input_file)
+    """Load the drawing results data as of DATASET_VERSION"""
+    df, version = load_version(DATASET_VERSION)
     # Convert date column to datetime (assuming there's a date column)
     if 'Datum' in df.columns:
         df['Datum'] = pd.to_datetime(df['Datum'])
@@ -24,113 +30,91 @@ def load_data():
         date_col = 'Date'
     else:
         raise ValueError("No date column found (expected 'Datum' or 'Date')")
-    return df, date_col
+    return df, date_col, version
 
-def calculate_main_number_sums(df):
+def calculate_main_number_sums(df, game=EUROJACKPOT):
     """Calculate sum of main numbers (Z1-Z5) for each pick"""
-    main_cols = ['Z1', 'Z2', 'Z3', 'Z4', 'Z5']
-    return df[main_cols].sum(axis=1)
+    return df[game['main_columns']].sum(axis=1)
 
-def calculate_euro_number_sums(df, date_col='Datum'):
-    """Calculate sum of euro numbers (EZ1, EZ2) for each pick with date filtering"""
-    euro_cols = ['EZ1', 'EZ2']
-    df['euro_sum'] = df[euro_cols].sum(axis=1)
+def calculate_euro_number_sums(df, date_col='Datum', game=EUROJACKPOT):
+    """Calculate sum of euro numbers (EZ1, EZ2) for each pick, split by the euro eras of the game"""
+    df['euro_sum'] = df[game['euro_columns']].sum(axis=1)
     
-    # Filter by date ranges
+    # Filter by date ranges (2012_2014: 1-8, 2014_2022: 1-10, 2022_present: 1-12)
     euro_sums = {}
-    
-    # Period 1: 2012-03-23 to 2014-10-03 (euro numbers 1-8)
-    mask1 = (df[date_col] >= '2012-03-23') & (df[date_col] <= '2014-10-03')
-    euro_sums['2012_2014'] = df.loc[mask1, 'euro_sum']
-    
-    # Period 2: 2014-10-10 to 2022-03-18 (euro numbers 1-10)
-    mask2 = (df[date_col] >= '2014-10-10') & (df[date_col] <= '2022-03-18')
-    euro_sums['2014_2022'] = df.loc[mask2, 'euro_sum']
-    
-    # Period 3: 2022-03-25 to now (euro numbers 1-12)
-    mask3 = df[date_col] >= '2022-03-25'
-    euro_sums['2022_present'] = df.loc[mask3, 'euro_sum']
+    for era in game['eras']:
+        euro_sums[era['name']] = df.loc[era_mask(df[date_col], era), 'euro_sum']
     
     return euro_sums
 
-def theoretical_main_sum_distribution():
+@memoize()
+def theoretical_sum_distribution(n_total, k_draw):
+    """
+    Exact distribution of the sum of k_draw distinct numbers from 1..n_total.
+    Counts subsets by size and sum with one pass over the numbers instead of
+    enumerating all C(n_total, k_draw) combinations.
+    """
+    max_sum = sum(range(n_total - k_draw + 1, n_total + 1))
+    dtype = np.int64 if comb(n_total, k_draw) < 2**62 else object
+    counts = np.zeros((k_draw + 1, max_sum + 1), dtype=dtype)
+    counts[0, 0] = 1
+    for number in range(1, n_total + 1):
+        # Largest subset size first so every number is used at most once
+        for size in range(min(number, k_draw), 0, -1):
+            counts[size, number:] += counts[size - 1, :max_sum + 1 - number]
+
+    unique_sums = np.flatnonzero(counts[k_draw])
+    counts = counts[k_draw, unique_sums].astype(np.int64) if dtype is np.int64 else counts[k_draw, unique_sums]
+    return pd.DataFrame({
+        'sum': unique_sums,
+        'probability': counts / comb(n_total, k_draw),
+        'count': counts
+    })
+
+def theoretical_main_sum_distribution(game=EUROJACKPOT):
     """Calculate theoretical distribution for sum of 5 distinct main numbers from 1-50"""
+    n_total, k_draw = game['main_total'], game['main_drawn']
     print("Calculating theoretical main number sum distribution...")
-    print("Using combinations (5 distinct numbers from 1-50)")
-    
-    # Generate all possible combinations of 5 distinct numbers from 1-50
-    numbers = list(range(1, 51))
-    all_combinations = list(combinations(numbers, 5))
+    print(f"Using combinations ({k_draw} distinct numbers from 1-{n_total})")
     
-    print(f"Total number of combinations: {len(all_combinations)}")
-    print(f"Expected total: C(50,5) = {50*49*48*47*46//120}")
+    distribution = theoretical_sum_distribution(n_total, k_draw)
     
-    # Calculate sums
-    sums = [sum(combo) for combo in all_combinations]
+    print(f"Total number of combinations: {distribution['count'].sum()}")
+    print(f"Expected total: C({n_total},{k_draw}) = {comb(n_total, k_draw)}")
     
     # Verify min and max sums
-    min_sum = min(sums)
-    max_sum = max(sums)
-    expected_min = sum(range(1, 6))  # 1+2+3+4+5 = 15
-    expected_max = sum(range(46, 51))  # 46+47+48+49+50 = 240
-    
-    print(f"Minimum sum: {min_sum} (expected: {expected_min})")
-    print(f"Maximum sum: {max_sum} (expected: {expected_max})")
+    expected_min = sum(range(1, k_draw + 1))  # 1+2+3+4+5 = 15
+    expected_max = sum(range(n_total - k_draw + 1, n_total + 1))  # 46+47+48+49+50 = 240
     
-    # Create frequency distribution
-    unique_sums, counts = np.unique(sums, return_counts=True)
-    probabilities = counts / len(sums)
-    
-    print(f"Sum range: {unique_sums[0]} to {unique_sums[-1]}")
-    print(f"Number of possible sum values: {len(unique_sums)}")
+    print(f"Minimum sum: {distribution['sum'].iloc[0]} (expected: {expected_min})")
+    print(f"Maximum sum: {distribution['sum'].iloc[-1]} (expected: {expected_max})")
+    print(f"Number of possible sum values: {len(distribution)}")
     
     # Find the peak
-    max_prob_idx = np.argmax(probabilities)
-    peak_sum = unique_sums[max_prob_idx]
-    peak_prob = probabilities[max_prob_idx]
-    print(f"Peak at sum {peak_sum} with probability {peak_prob:.6f}")
+    peak = distribution.loc[distribution['probability'].idxmax()]
+    print(f"Peak at sum {peak['sum']:.0f} with probability {peak['probability']:.6f}")
     
-    return pd.DataFrame({
-        'sum': unique_sums,
-        'probability': probabilities,
-        'count': counts
-    })
+    return distribution
 
-def theoretical_euro_sum_distribution(max_euro):
+def theoretical_euro_sum_distribution(max_euro, game=EUROJACKPOT):
     """Calculate theoretical distribution for sum of 2 distinct euro numbers"""
+    k_draw = game['euro_drawn']
     print(f"Calculating theoretical euro number sum distribution (1-{max_euro})...")
     
-    # Generate all possible combinations of 2 distinct numbers from 1-max_euro
-    numbers = list(range(1, max_euro + 1))
-    all_combinations = list(combinations(numbers, 2))
-    
-    print(f"Total number of combinations: {len(all_combinations)}")
-    print(f"Expected total: C({max_euro},2) = {max_euro*(max_euro-1)//2}")
+    distribution = theoretical_sum_distribution(max_euro, k_draw)
     
-    # Calculate sums
-    sums = [sum(combo) for combo in all_combinations]
+    print(f"Total number of combinations: {distribution['count'].sum()}")
+    print(f"Expected total: C({max_euro},{k_draw}) = {comb(max_euro, k_draw)}")
     
     # Verify min and max sums
-    min_sum = min(sums)
-    max_sum = max(sums)
-    expected_min = 1 + 2  # minimum: 1+2 = 3
-    expected_max = (max_euro - 1) + max_euro  # maximum
+    expected_min = sum(range(1, k_draw + 1))  # minimum: 1+2 = 3
+    expected_max = sum(range(max_euro - k_draw + 1, max_euro + 1))  # maximum
     
-    print(f"Minimum sum: {min_sum} (expected: {expected_min})")
-    print(f"Maximum sum: {max_sum} (expected: {expected_max})")
+    print(f"Minimum sum: {distribution['sum'].iloc[0]} (expected: {expected_min})")
+    print(f"Maximum sum: {distribution['sum'].iloc[-1]} (expected: {expected_max})")
+    print(f"Number of possible sum values: {len(distribution)}")
     
-    # Create frequency distribution
-    unique_sums, counts = np.unique(sums, return_counts=True)
-    probabilities = counts / len(sums)
-    
-    print(f"Sum range: {unique_sums[0]} to {unique_sums[-1]}")
-    print(f"Number of possible sum values: {len(unique_sums)}")
-    
-    return pd.DataFrame({
-        'sum': unique_sums,
-        'probability': probabilities,
-        'count': counts
-    })
+    return distribution
 
 def create_empirical_distribution(data, title_suffix=""):
     """Create empirical distribution from data with frequency column"""
@@ -173,36 +157,43 @@ def save_results(df, filename_base, title, xlabel="Sum", ylabel_emp="Frequency",
     plt.close()
     print(f"Saved: {png_filename}")
 
-def main():
+def era_label(era):
+    """Short era label used in titles, e.g. 2012-2014"""
+    return era['name'].replace('_', '-')
+
+def main(game=EUROJACKPOT):
     print("Loading data...")
-    df, date_col = load_data()
+    df, date_col, version = load_data()
     
-    print(f"Loaded {len(df)} records")
+    print(f"Loaded {len(df)} records (dataset version {version['version']})")
     print(f"Date range: {df[date_col].min()} to {df[date_col].max()}")
     
     print("\n" + "="*60)
     print("ANALYZING MAIN NUMBER SUMS")
     print("="*60)
     
+    main_pool = f"{game['main_drawn']} numbers from 1-{game['main_total']}"
+    main_pool_distinct = f"{game['main_drawn']} distinct numbers from 1-{game['main_total']}"
+    
     # 1. Empirical main number sum distribution
-    main_sums = calculate_main_number_sums(df)
+    main_sums = calculate_main_number_sums(df, game)
     print(f"Main number sum range in data: {main_sums.min()} to {main_sums.max()}")
     
     empirical_main = create_empirical_distribution(main_sums)
     save_results(
         empirical_main, 
         "main_numbers_empirical_sum_distribution",
-        "Empirical Distribution of Main Numbers Sum (5 numbers from 1-50)",
+        f"Empirical Distribution of Main Numbers Sum ({main_pool})",
         "Sum of Main Numbers"
     )
     
     # 2. Theoretical main number sum distribution
     print("\n" + "-"*40)
-    theoretical_main = theoretical_main_sum_distribution()
+    theoretical_main = theoretical_main_sum_distribution(game)
     save_results(
         theoretical_main,
         "main_numbers_theoretical_sum_distribution", 
-        "Theoretical Distribution of Main Numbers Sum (5 distinct numbers from 1-50)",
+        f"Theoretical Distribution of Main Numbers Sum ({main_pool_distinct})",
         "Sum of Main Numbers",
         ylabel_theo="Probability"
     )
@@ -211,82 +202,41 @@ def main():
     print("ANALYZING EURO NUMBER SUMS")
     print("="*60)
     
-    euro_sums = calculate_euro_number_sums(df, date_col)
-    
-    # Period 1: 2012-2014 (1-8)
-    print(f"\nPeriod 1 (2012-2014) draws: {len(euro_sums['2012_2014'])}")
-    if len(euro_sums['2012_2014']) > 0:
-        print(f"Euro sum range: {euro_sums['2012_2014'].min()} to {euro_sums['2012_2014'].max()}")
-        
-        # 3. Empirical euro sum distribution (2012-2014)
-        empirical_euro1 = create_empirical_distribution(euro_sums['2012_2014'])
-        save_results(
-            empirical_euro1,
-            "euro_numbers_2012_2014_empirical_sum_distribution",
-            "Empirical Distribution of Euro Numbers Sum (2012-2014, 2 numbers from 1-8)",
-            "Sum of Euro Numbers"
-        )
-        
-        # 4. Theoretical euro sum distribution (2012-2014)
-        print("\n" + "-"*30)
-        theoretical_euro1 = theoretical_euro_sum_distribution(8)
-        save_results(
-            theoretical_euro1,
-            "euro_numbers_2012_2014_theoretical_sum_distribution",
-            "Theoretical Distribution of Euro Numbers Sum (2012-2014, 2 distinct numbers from 1-8)",
-            "Sum of Euro Numbers",
-            ylabel_theo="Probability"
-        )
-    
-    # Period 2: 2014-2022 (1-10)
-    print(f"\nPeriod 2 (2014-2022) draws: {len(euro_sums['2014_2022'])}")
-    if len(euro_sums['2014_2022']) > 0:
-        print(f"Euro sum range: {euro_sums['2014_2022'].min()} to {euro_sums['2014_2022'].max()}")
+    euro_sums = calculate_euro_number_sums(df, date_col, game)
+    
+    # One empirical and one theoretical distribution per era
+    for period, era in enumerate(game['eras'], start=1):
+        sums = euro_sums[era['name']]
+        label = era_label(era)
+        max_euro = era['max_euro']
+        print(f"\nPeriod {period} ({label}) draws: {len(sums)}")
+        if len(sums) == 0:
+            continue
+        print(f"Euro sum range: {sums.min()} to {sums.max()}")
         
-        # 5. Empirical euro sum distribution (2014-2022)
-        empirical_euro2 = create_empirical_distribution(euro_sums['2014_2022'])
+        empirical_euro = create_empirical_distribution(sums)
         save_results(
-            empirical_euro2,
-            "euro_numbers_2014_2022_empirical_sum_distribution",
-            "Empirical Distribution of Euro Numbers Sum (2014-2022, 2 numbers from 1-10)",
+            empirical_euro,
+            f"euro_numbers_{era['name']}_empirical_sum_distribution",
+            f"Empirical Distribution of Euro Numbers Sum ({label}, {game['euro_drawn']} numbers from 1-{max_euro})",
             "Sum of Euro Numbers"
         )
         
-        # 6. Theoretical euro sum distribution (2014-2022)
         print("\n" + "-"*30)
-        theoretical_euro2 = theoretical_euro_sum_distribution(10)
+        theoretical_euro = theoretical_euro_sum_distribution(max_euro, game)
         save_results(
-            theoretical_euro2,
-            "euro_numbers_2014_2022_theoretical_sum_distribution",
-            "Theoretical Distribution of Euro Numbers Sum (2014-2022, 2 distinct numbers from 1-10)",
+            theoretical_euro,
+            f"euro_numbers_{era['name']}_theoretical_sum_distribution",
+            f"Theoretical Distribution of Euro Numbers Sum ({label}, {game['euro_drawn']} distinct numbers from 1-{max_euro})",
             "Sum of Euro Numbers",
             ylabel_theo="Probability"
         )
     
-    # Period 3: 2022-present (1-12)
-    print(f"\nPeriod 3 (2022-present) draws: {len(euro_sums['2022_present'])}")
-    if len(euro_sums['2022_present']) > 0:
-        print(f"Euro sum range: {euro_sums['2022_present'].min()} to {euro_sums['2022_present'].max()}")
-        
-        # 7. Empirical euro sum distribution (2022-present)
-        empirical_euro3 = create_empirical_distribution(euro_sums['2022_present'])
-        save_results(
-            empirical_euro3,
-            "euro_numbers_2022_present_empirical_sum_distribution",
-            "Empirical Distribution of Euro Numbers Sum (2022-present, 2 numbers from 1-12)",
-            "Sum of Euro Numbers"
-        )
-        
-        # 8. Theoretical euro sum distribution (2022-present)
-        print("\n" + "-"*30)
-        theoretical_euro3 = theoretical_euro_sum_distribution(12)
-        save_results(
-            theoretical_euro3,
-            "euro_numbers_2022_present_theoretical_sum_distribution",
-            "Theoretical Distribution of Euro Numbers Sum (2022-present, 2 distinct numbers from 1-12)",
-            "Sum of Euro Numbers",
-            ylabel_theo="Probability"
-        )
+    # Empirical files depend on the draws, theoretical ones do not
+    empirical_files = [f"{output_dir}/{name}_empirical_sum_distribution.{ext}"
+                       for name in ["main_numbers"] + [f"euro_numbers_{era['name']}" for era in game['eras']]
+                       for ext in ("csv", "png")]
+    record_artifact([f for f in empirical_files if os.path.exists(f)], version, "sum_number_analysis.py")
     
     print("\n" + "="*60)
     print("ANALYSIS COMPLETE!")
@@ -297,12 +247,10 @@ def main():
     print(f"\nSummary:")
     print(f"Total draws analyzed: {len(df)}")
     print(f"Main number sum range: {main_sums.min()} - {main_sums.max()}")
-    if len(euro_sums['2012_2014']) > 0:
-        print(f"Period 1 (2012-2014) draws: {len(euro_sums['2012_2014'])}, sum range: {euro_sums['2012_2014'].min()}-{euro_sums['2012_2014'].max()}")
-    if len(euro_sums['2014_2022']) > 0:
-        print(f"Period 2 (2014-2022) draws: {len(euro_sums['2014_2022'])}, sum range: {euro_sums['2014_2022'].min()}-{euro_sums['2014_2022'].max()}")
-    if len(euro_sums['2022_present']) > 0:
-        print(f"Period 3 (2022-present) draws: {len(euro_sums['2022_present'])}, sum range: {euro_sums['2022_present'].min()}-{euro_sums['2022_present'].max()}")
+    for period, era in enumerate(game['eras'], start=1):
+        sums = euro_sums[era['name']]
+        if len(sums) > 0:
+            print(f"Period {period} ({era_label(era)}) draws: {len(sums)}, sum range: {sums.min()}-{sums.max()}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,284 @@
+"""
+Settlement of large ticket files against one draw.
+
+Ticket files are CSVs with one ticket per row, in the layout of the
+drawing results: ticket_id,Z1,Z2,Z3,Z4,Z5,EZ1,EZ2. They are read in
+chunks, every ticket is encoded as main/euro bitmasks, and the matches
+with the draw are two ANDs and popcounts. Match counts are mapped to the
+12 prize classes, amounts come from price_breakdown.csv.
+
+Memory stays constant regardless of file size. Several files are
+settled in parallel processes and their results merged.
+
+Usage:
+  python settle_tickets.py tickets.csv [more.csv ...] [--draw ID] [--workers N]
+  python settle_tickets.py --generate N tickets.csv   (random test file)
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from bitmask import encode, popcount
+from data_validation import DataValidationError
+from draw_store import DrawStore, PrizeStore, DRAWING_RESULTS_FILE, PRICE_BREAKDOWN_FILE
+from game_config import (
+    MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN,
+    PRIZE_CLASSES, MAIN_COLUMNS, EURO_COLUMNS, get_era, prize_class_lookup
+)
+
+TICKET_COLUMNS = ['ticket_id'] + MAIN_COLUMNS + EURO_COLUMNS
+DEFAULT_CHUNK_SIZE = 2_000_000
+OUTPUT_DIR = os.path.join(base_dir, 'output')
+
+
+class DrawOutcome:
+    """The draw to settle against: its numbers as bitmasks plus the prize amounts per class"""
+
+    def __init__(self, draw_id, main, euro, max_euro, payouts=None):
+        self.draw_id = int(draw_id)
+        self.main_mask = encode([main])[0]
+        self.euro_mask = encode([euro])[0]
+        self.max_euro = max_euro
+        # Index 0 is "no prize", the classes follow PRIZE_CLASSES
+        self.payouts = None if payouts is None else np.concatenate([[0.0], np.asarray(payouts, dtype=float)])
+
+    @classmethod
+    def load(cls, draw_id=None, draws_csv=DRAWING_RESULTS_FILE, prizes_csv=PRICE_BREAKDOWN_FILE):
+        """Draw and prize amounts by id, by default the latest draw"""
+        draws = DrawStore.load_validated(draws_csv)
+        draw_id = int(draws.ids[-1]) if draw_id is None else int(draw_id)
+        row = draws.index_of([draw_id])[0]
+        if row < 0:
+            raise KeyError(f"Draw {draw_id} not found in {os.path.basename(draws_csv)}")
+
+        payouts = None
+        prizes = PrizeStore.from_csv(draws, prizes_csv)
+        prize_row = np.nonzero(prizes.ids == draw_id)[0]
+        if len(prize_row) > 0:
+            payouts = prizes.payouts[prize_row[0]]
+        era = get_era(draws.era_names()[row])
+        return cls(draw_id, draws.main[row], draws.euro[row], era['max_euro'], payouts)
+
+
+class SettlementResult:
+    """Winner counts per prize class and the winning tickets, mergeable across chunks and files"""
+
+    def __init__(self):
+        self.tickets = 0
+        self.invalid = 0
+        self.class_counts = np.zeros(len(PRIZE_CLASSES) + 1, dtype=np.int64)
+        self.winner_files = []
+
+    def merge(self, other):
+        self.tickets += other.tickets
+        self.invalid += other.invalid
+        self.class_counts += other.class_counts
+        self.winner_files += other.winner_files
+        return self
+
+    def to_frame(self, outcome):
+        """Winners and amounts per prize class"""
+        counts = self.class_counts[1:]
+        df = pd.DataFrame({
+            'price_category': np.arange(1, len(PRIZE_CLASSES) + 1),
+            'main_matches': [m for m, _ in PRIZE_CLASSES],
+            'euro_matches': [e for _, e in PRIZE_CLASSES],
+            'winners': counts
+        })
+        if outcome.payouts is not None:
+            df['prize'] = outcome.payouts[1:]
+            df['total_amount'] = counts * outcome.payouts[1:]
+        return df
+
+
+def _number_array(chunk, columns):
+    """
+    Integer array of the given columns; empty, unparseable and non-integer
+    cells (or values beyond int16) become 0 so the ticket fails the range check.
+    """
+    values = chunk[columns]
+    if all(dtype.kind in 'iu' for dtype in values.dtypes):
+        values = values.to_numpy()
+        return np.where(np.abs(values) < 2 ** 15, values, 0).astype(np.int16)
+    values = values.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    usable = np.isfinite(values) & (values == np.floor(values)) & (np.abs(values) < 2 ** 15)
+    return np.where(usable, values, 0).astype(np.int16)
+
+
+def iter_ticket_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (ticket_ids, main, euro) arrays of at most chunk_size tickets.
+    Columns are read without a fixed dtype, so broken cells do not abort the
+    file or wrap around; they yield numbers that settle_chunk marks invalid.
+    Missing ticket ids are -1.
+    """
+    for chunk in pd.read_csv(path, usecols=TICKET_COLUMNS, chunksize=chunk_size, engine='c'):
+        ticket_ids = pd.to_numeric(chunk['ticket_id'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+        yield ticket_ids, _number_array(chunk, MAIN_COLUMNS), _number_array(chunk, EURO_COLUMNS)
+
+
+def settle_chunk(outcome, main, euro):
+    """
+    Prize class per ticket (0 = no prize, -1 = invalid ticket).
+    Invalid tickets have numbers out of range, repeated or unreadable numbers.
+    """
+    valid = ((main.min(axis=1) >= 1) & (main.max(axis=1) <= MAIN_NUMBERS_TOTAL) &
+             (euro.min(axis=1) >= 1) & (euro.max(axis=1) <= outcome.max_euro))
+    main_masks = encode(np.where(valid[:, None], main, 1))
+    euro_masks = encode(np.where(valid[:, None], euro, 1))
+    valid &= (popcount(main_masks) == MAIN_NUMBERS_DRAWN) & (popcount(euro_masks) == EURO_NUMBERS_DRAWN)
+
+    main_hits = popcount(main_masks & outcome.main_mask)
+    euro_hits = popcount(euro_masks & outcome.euro_mask)
+    classes = prize_class_lookup()[main_hits, euro_hits]
+    return np.where(valid, classes, -1)
+
+
+def settle_file(path, outcome, winners_path=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Settle one ticket file. Winning tickets are appended chunk by chunk to
+    winners_path (ticket_id, price_category, prize) if it is given.
+    """
+    result = SettlementResult()
+    if winners_path is not None:
+        pd.DataFrame(columns=['ticket_id', 'price_category', 'main_matches', 'euro_matches', 'prize']).to_csv(
+            winners_path, index=False)
+        result.winner_files.append(winners_path)
+
+    for ticket_ids, main, euro in iter_ticket_chunks(path, chunk_size):
+        classes = settle_chunk(outcome, main, euro)
+        result.tickets += len(classes)
+        result.invalid += int((classes < 0).sum())
+        result.class_counts += np.bincount(classes[classes >= 0], minlength=len(PRIZE_CLASSES) + 1)
+
+        if winners_path is not None:
+            winning = np.nonzero(classes > 0)[0]
+            won = classes[winning]
+            pd.DataFrame({
+                'ticket_id': ticket_ids[winning],
+                'price_category': won,
+                'main_matches': [PRIZE_CLASSES[c - 1][0] for c in won],
+                'euro_matches': [PRIZE_CLASSES[c - 1][1] for c in won],
+                'prize': outcome.payouts[won] if outcome.payouts is not None else np.nan
+            }).to_csv(winners_path, mode='a', header=False, index=False)
+    return result
+
+
+def winner_paths(paths, output_dir, draw_id):
+    """
+    Winners file per input file, named after its basename; inputs sharing
+    a basename (a/tickets.csv, b/tickets.csv) get a numeric suffix so no
+    two processes write the same file.
+    """
+    result, used = [], set()
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        candidate, n = name, 1
+        while candidate in used:
+            n += 1
+            candidate = f"{name}_{n}"
+        used.add(candidate)
+        result.append(os.path.join(output_dir, f"{candidate}_winners_draw_{draw_id}.csv"))
+    return result
+
+
+def _settle_job(path, outcome, winners_path, chunk_size):
+    return settle_file(path, outcome, winners_path, chunk_size)
+
+
+def settle_files(paths, outcome, output_dir, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Settle several files, in parallel processes when more than one file is given"""
+    os.makedirs(output_dir, exist_ok=True)
+    targets = winner_paths(paths, output_dir, outcome.draw_id)
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_settle_job, paths, [outcome] * len(paths),
+                                        targets, [chunk_size] * len(paths)))
+    else:
+        results = [_settle_job(path, outcome, target, chunk_size) for path, target in zip(paths, targets)]
+
+    total = SettlementResult()
+    for result in results:
+        total.merge(result)
+    return total
+
+
+def generate_ticket_file(path, n_tickets, seed=2025, max_euro=12, chunk_size=1_000_000):
+    """Write n_tickets random tickets, used to benchmark the settlement"""
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(TICKET_COLUMNS) + '\n')
+        for start in range(0, n_tickets, chunk_size):
+            size = min(chunk_size, n_tickets - start)
+            main = np.sort(np.argsort(rng.random((size, MAIN_NUMBERS_TOTAL)), axis=1)[:, :MAIN_NUMBERS_DRAWN] + 1, axis=1)
+            euro = np.sort(np.argsort(rng.random((size, max_euro)), axis=1)[:, :EURO_NUMBERS_DRAWN] + 1, axis=1)
+            rows = np.column_stack([np.arange(start + 1, start + size + 1), main, euro])
+            pd.DataFrame(rows).to_csv(f, header=False, index=False)
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['--generate']:
+        n_tickets, path = int(args[1]), args[2]
+        print(f"Writing {n_tickets:,} random tickets to {path}...")
+        generate_ticket_file(path, n_tickets)
+        return 0
+
+    draw_id = workers = None
+    paths = []
+    while args:
+        arg = args.pop(0)
+        if arg == '--draw':
+            draw_id = int(args.pop(0))
+        elif arg == '--workers':
+            workers = int(args.pop(0))
+        else:
+            paths.append(arg)
+    if not paths:
+        print(__doc__)
+        return 1
+
+    try:
+        outcome = DrawOutcome.load(draw_id)
+    except KeyError as e:
+        print(f"❌ Error: {e.args[0]}")
+        return 1
+    except DataValidationError as e:
+        print(f"❌ Error: the drawing results failed validation\n{e}")
+        return 1
+    print(f"Settling {len(paths)} ticket file(s) against draw {outcome.draw_id}")
+    if outcome.payouts is None:
+        print(f"Warning: no prize breakdown for draw {outcome.draw_id}, amounts are not available")
+
+    started = time.perf_counter()
+    result = settle_files(paths, outcome, OUTPUT_DIR, workers)
+    elapsed = time.perf_counter() - started
+
+    table = result.to_frame(outcome)
+    summary_path = os.path.join(OUTPUT_DIR, f"settlement_draw_{outcome.draw_id}.csv")
+    table.to_csv(summary_path, index=False)
+
+    print("\n" + "="*60)
+    print("SETTLEMENT RESULTS")
+    print("="*60)
+    print(f"Tickets: {result.tickets:,} ({result.invalid:,} invalid) in {elapsed:.2f}s "
+          f"({result.tickets / max(elapsed, 1e-9) * 60 / 1e6:.1f} million tickets/min)")
+    for row in table.itertuples(index=False):
+        amount = f", {row.total_amount:,.2f} EUR" if 'total_amount' in table.columns else ""
+        print(f"  Class {row.price_category:2d} ({row.main_matches}+{row.euro_matches}): {row.winners:,} winners{amount}")
+    print(f"\nResults saved to: {summary_path}")
+    for path in result.winner_files:
+        print(f"Winning tickets saved to: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,314 @@
+"""
+Transition counts between consecutive draws.
+
+For every pair of consecutive draws t, t+1 the counts record which numbers
+of draw t+1 followed which numbers of draw t:
+
+  counts[i, j]       - draws where number i was drawn and j was drawn in the next draw
+  pair_counts[p, j]  - the same for the pair p = (a, b) of draw t (higher order, sparse)
+
+Draws are expanded to 0/1 indicator rows from their bitmasks; the counts
+of a whole history are then one matrix product of the indicator rows of
+draw t with those of draw t+1, i.e. the sum of the outer products of
+consecutive rows. Pair rows are sparse (10 of 1225 pairs per draw), so the
+pair matrix is kept in CSR form.
+
+Under independence number j follows any draw with probability drawn /
+n_total, so the expected count of a cell is the number of source draws of
+its row times that probability. Residuals are reported as z-scores with
+the binomial standard deviation of the cell.
+
+Euro numbers are counted per era, only between consecutive draws of the
+same era. Counts can be updated incrementally: transitions.json stores the
+state, and a rerun only adds the draws appended since its lastDrawId.
+
+Usage: python Data_Analysis/Transition_Analysis/transition_analysis.py [--rebuild]
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+from scipy import sparse
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from bitmask import encode, to_indicator
+from draw_store import DRAWING_RESULTS_FILE
+from game_config import MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN, EURO_ERAS
+from versioned_dataset import VersionedDataset, record_artifact
+
+OUTPUT_FILE = os.path.join(base_dir, 'transitions.json')
+
+# Cells reported as notable when |z| exceeds this
+Z_THRESHOLD = 3.0
+TOP_CELLS = 10
+
+
+def pair_index_table(n_total):
+    """Table mapping numbers (a, b), a < b, to the row of the pair in lexicographic order"""
+    first, second = np.triu_indices(n_total, k=1)
+    table = np.full((n_total + 1, n_total + 1), -1, dtype=np.int64)
+    table[first + 1, second + 1] = np.arange(len(first))
+    return table, np.column_stack([first + 1, second + 1])
+
+
+class TransitionCounts:
+    """First-order (dense) and pair (sparse) transition counts of one number pool"""
+
+    def __init__(self, n_total, drawn, pairs=True):
+        self.n_total = n_total
+        self.drawn = drawn
+        self.pairs = pairs
+        self.counts = np.zeros((n_total, n_total), dtype=np.int64)
+        self.sources = np.zeros(n_total, dtype=np.int64)
+        self.transitions = 0
+        self.last_mask = None
+        self.last_id = None
+        if pairs:
+            self.pair_table, self.pair_numbers = pair_index_table(n_total)
+            self.pair_counts = sparse.csr_matrix((len(self.pair_numbers), n_total), dtype=np.int64)
+            self.pair_sources = np.zeros(len(self.pair_numbers), dtype=np.int64)
+
+    def _pair_indicator(self, masks):
+        """Sparse (rows, pairs) indicator of the number pairs in every draw"""
+        indicator = to_indicator(masks, self.n_total)
+        rows, numbers = np.nonzero(indicator)
+        numbers = numbers.reshape(len(masks), self.drawn) + 1
+        first, second = np.triu_indices(self.drawn, k=1)
+        pairs = self.pair_table[numbers[:, first], numbers[:, second]]
+        row_ids = np.repeat(np.arange(len(masks)), len(first))
+        return sparse.csr_matrix((np.ones(pairs.size, dtype=np.int64), (row_ids, pairs.ravel())),
+                                 shape=(len(masks), len(self.pair_numbers)))
+
+    def update(self, masks, ids=None):
+        """
+        Add the transitions of draws following the ones seen so far.
+        masks: bitmask per draw in draw order; ids: their draw ids (optional)
+        """
+        masks = np.asarray(masks, dtype=np.uint64)
+        if len(masks) == 0:
+            return self
+        if self.last_mask is not None:
+            masks = np.concatenate([[self.last_mask], masks])
+        if len(masks) >= 2:
+            indicator = to_indicator(masks, self.n_total).astype(np.int64)
+            source, target = indicator[:-1], indicator[1:]
+            self.counts += source.T @ target
+            self.sources += source.sum(axis=0)
+            self.transitions += len(source)
+            if self.pairs:
+                pair_source = self._pair_indicator(masks[:-1])
+                self.pair_counts = self.pair_counts + (pair_source.T @ sparse.csr_matrix(target)).tocsr()
+                self.pair_sources += np.asarray(pair_source.sum(axis=0)).ravel()
+        self.last_mask = masks[-1]
+        if ids is not None and len(ids) > 0:
+            self.last_id = int(ids[-1])
+        return self
+
+    @property
+    def probability(self):
+        """Probability of a number to be drawn in the next draw under independence"""
+        return self.drawn / self.n_total
+
+    def expected(self, sources):
+        return np.asarray(sources, dtype=float)[:, None] * self.probability
+
+    def z_scores(self, observed, sources):
+        """Standardized residuals of counts against the independence expectation"""
+        observed = np.asarray(observed, dtype=float)
+        variance = self.expected(sources) * (1 - self.probability)
+        return np.divide(observed - self.expected(sources), np.sqrt(variance),
+                         out=np.zeros(observed.shape), where=variance > 0)
+
+    def notable_cells(self, top=TOP_CELLS):
+        """Largest first-order deviations from independence as dicts"""
+        z = self.z_scores(self.counts, self.sources)
+        order = np.argsort(-np.abs(z), axis=None)[:top]
+        cells = []
+        for i, j in zip(*np.unravel_index(order, z.shape)):
+            cells.append({
+                'from': int(i + 1),
+                'to': int(j + 1),
+                'count': int(self.counts[i, j]),
+                'expected': round(float(self.sources[i] * self.probability), 3),
+                'z': round(float(z[i, j]), 3)
+            })
+        return cells
+
+    def notable_pair_cells(self, top=TOP_CELLS):
+        """Largest pair->number excesses over independence (only observed cells)"""
+        coo = self.pair_counts.tocoo()
+        expected = self.pair_sources[coo.row] * self.probability
+        z = (coo.data - expected) / np.sqrt(expected * (1 - self.probability))
+        cells = []
+        for k in np.argsort(-z)[:top]:
+            cells.append({
+                'from': self.pair_numbers[coo.row[k]].tolist(),
+                'to': int(coo.col[k] + 1),
+                'count': int(coo.data[k]),
+                'expected': round(float(expected[k]), 3),
+                'z': round(float(z[k]), 3)
+            })
+        return cells
+
+    def to_json(self):
+        """Counts and update state; the pair matrix as CSR arrays"""
+        entry = {
+            'numbers': self.n_total,
+            'drawn': self.drawn,
+            'transitions': self.transitions,
+            'lastDrawId': self.last_id,
+            'lastMask': None if self.last_mask is None else str(int(self.last_mask)),
+            'nextProbability': self.probability,
+            'sources': self.sources.tolist(),
+            'counts': self.counts.tolist()
+        }
+        if self.pairs:
+            pair_counts = self.pair_counts.tocsr()
+            pair_counts.sort_indices()
+            entry['pairs'] = {
+                'sources': self.pair_sources.tolist(),
+                'indptr': pair_counts.indptr.tolist(),
+                'indices': pair_counts.indices.tolist(),
+                'data': pair_counts.data.tolist()
+            }
+        return entry
+
+    @classmethod
+    def from_json(cls, entry):
+        counts = cls(entry['numbers'], entry['drawn'], pairs='pairs' in entry)
+        counts.transitions = entry['transitions']
+        counts.last_id = entry['lastDrawId']
+        counts.last_mask = None if entry['lastMask'] is None else np.uint64(int(entry['lastMask']))
+        counts.sources = np.array(entry['sources'], dtype=np.int64)
+        counts.counts = np.array(entry['counts'], dtype=np.int64)
+        if counts.pairs:
+            pairs = entry['pairs']
+            counts.pair_sources = np.array(pairs['sources'], dtype=np.int64)
+            counts.pair_counts = sparse.csr_matrix(
+                (np.array(pairs['data'], dtype=np.int64), np.array(pairs['indices']), np.array(pairs['indptr'])),
+                shape=(len(counts.pair_numbers), counts.n_total))
+        return counts
+
+
+def _draws_after(ids, last_id):
+    """Rows of the draws after last_id (all rows if last_id is None)"""
+    if last_id is None:
+        return slice(0, len(ids))
+    return slice(int(np.searchsorted(ids, last_id, side='right')), len(ids))
+
+
+def build_transitions(draws, previous=None):
+    """
+    Main and per-era euro transition counts of a draw history.
+    previous: result of an earlier run (from_json state) to continue from;
+    only draws after its lastDrawId are added.
+    """
+    previous = previous or {}
+    main = previous.get('main') or TransitionCounts(MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN)
+    rows = _draws_after(draws.ids, main.last_id)
+    main.update(encode(draws.main[rows]), draws.ids[rows])
+
+    eras = draws.era_names()
+    euro = {}
+    for era in EURO_ERAS:
+        counts = previous.get('euro', {}).get(era['name']) or TransitionCounts(
+            era['max_euro'], EURO_NUMBERS_DRAWN, pairs=False)
+        selected = np.flatnonzero(eras == era['name'])
+        selected = selected[_draws_after(draws.ids[selected], counts.last_id)]
+        if len(selected) > 0:
+            counts.update(encode(draws.euro[selected]), draws.ids[selected])
+        euro[era['name']] = counts
+    return {'main': main, 'euro': euro}
+
+
+def load_previous(path=OUTPUT_FILE):
+    """State of the last run, None if there is none"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return {
+        'main': TransitionCounts.from_json(data['main']),
+        'euro': {name: TransitionCounts.from_json(entry) for name, entry in data['euro'].items()}
+    }
+
+
+def print_summary(name, counts):
+    z = counts.z_scores(counts.counts, counts.sources)
+    diagonal = np.trace(counts.counts)
+    expected_diagonal = counts.sources.sum() * counts.probability
+    print(f"\n{name}: {counts.transitions} transitions")
+    print(f"  Repeats (i -> i): {diagonal} (expected {expected_diagonal:.1f})")
+    print(f"  Cells with |z| > {Z_THRESHOLD:.0f}: {(np.abs(z) > Z_THRESHOLD).sum()} of {z.size} "
+          f"(expected under independence ~{z.size * 0.0027:.1f})")
+    for cell in counts.notable_cells(3):
+        print(f"  {cell['from']:2d} -> {cell['to']:2d}: {cell['count']} (expected {cell['expected']:.2f}, "
+              f"z {cell['z']:+.2f})")
+
+
+def main():
+    data_file = DRAWING_RESULTS_FILE
+    try:
+        dataset = VersionedDataset(data_file)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {data_file}")
+        return
+    version = dataset.latest
+    draws = dataset.as_of(version['version'])
+    print(f"Loaded {len(draws)} draws from {data_file} (version {version['version']})")
+
+    previous = None if '--rebuild' in sys.argv[1:] else load_previous()
+    if previous is not None:
+        last_id = previous['main'].last_id
+        if last_id is None or draws.index_of([last_id])[0] < 0:
+            print("Stored transitions do not match the history, rebuilding")
+            previous = None
+        else:
+            print(f"Updating stored transitions after draw {last_id}")
+
+    result = build_transitions(draws, previous)
+
+    print("\n" + "="*60)
+    print("TRANSITION COUNTS")
+    print("="*60)
+    print_summary("Main numbers", result['main'])
+    for era in EURO_ERAS:
+        print_summary(f"Euro numbers {era['label']}", result['euro'][era['name']])
+
+    print("\nStrongest pair -> number transitions:")
+    for cell in result['main'].notable_pair_cells(5):
+        print(f"  {cell['from']} -> {cell['to']:2d}: {cell['count']} (expected {cell['expected']:.2f}, "
+              f"z {cell['z']:+.2f})")
+
+    output = {
+        'main': result['main'].to_json(),
+        'euro': {name: counts.to_json() for name, counts in result['euro'].items()},
+        'notable': {
+            'main': result['main'].notable_cells(),
+            'mainPairs': result['main'].notable_pair_cells(),
+            'euro': {name: counts.notable_cells(5) for name, counts in result['euro'].items()}
+        },
+        'metadata': {
+            'totalDraws': len(draws),
+            'dataSource': os.path.basename(data_file),
+            'datasetVersion': version['version'],
+            'description': 'counts[i][j]: draws with number i+1 followed by a draw with number j+1; '
+                           'expected count = sources[i] * nextProbability. pairs: CSR matrix over '
+                           'the lexicographic pairs (1,2),(1,3),...,(49,50) by the number that followed',
+            'generatedBy': 'transition_analysis.py'
+        }
+    }
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(output, f, separators=(',', ':'))
+    record_artifact(OUTPUT_FILE, version, 'transition_analysis.py')
+    print(f"\nResults saved to: {OUTPUT_FILE}")
+    print(f"File size: {os.path.getsize(OUTPUT_FILE)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Bitmask encoding of draws and tickets.
+
+Every set of numbers is stored as one uint64 with bit (n - 1) set for
+number n, so numbers 1-64 fit into a single word. Overlaps between two
+draws or tickets become a bitwise AND followed by a popcount, which numpy
+evaluates for whole arrays at once.
+"""
+
+import numpy as np
+
+# Per-byte popcount lookup for numpy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def encode(numbers):
+    """
+    Encode a (rows, k) array of numbers (1-64) as one uint64 bitmask per row.
+    """
+    numbers = np.asarray(numbers, dtype=np.uint64)
+    if numbers.ndim == 1:
+        numbers = numbers[None, :]
+    bits = np.left_shift(np.uint64(1), numbers - np.uint64(1))
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def decode(mask, max_number=64):
+    """Return the sorted numbers contained in a single bitmask"""
+    mask = int(mask)
+    return [n for n in range(1, max_number + 1) if mask >> (n - 1) & 1]
+
+
+def popcount(masks):
+    """Number of set bits of every element of a uint64 array"""
+    masks = np.asarray(masks, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.uint8)
+    as_bytes = masks.reshape(-1).view(np.uint8).reshape(-1, 8)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.uint8).reshape(masks.shape)
+
+
+def to_indicator(masks, max_number):
+    """
+    Expand bitmasks to a (rows, max_number) 0/1 matrix where column j is number j + 1.
+    """
+    masks = np.asarray(masks, dtype=np.uint64)
+    shifts = np.arange(max_number, dtype=np.uint64)
+    return ((masks[:, None] >> shifts[None, :]) & np.uint64(1)).astype(np.uint8)
@@ -0,0 +1,176 @@
+"""
+Web asset stage for the analysis charts.
+
+The analysis scripts save their charts as PNGs at dpi=300, which is far
+more than a browser needs. This stage derives every chart at several
+widths as palette-optimized PNG and WebP and writes a manifest with
+content hashes, ready for srcset/picture elements. Charts are processed
+in parallel across cores and only when the source PNG changed since the
+last run (tracked by its hash in the manifest).
+
+Requires Pillow (pip install pillow).
+
+Usage: python Data_Analysis/build_plot_assets.py [--force]
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+SOURCE_PATTERNS = ['plots/*.png', 'Data_Analysis/**/*.png']
+OUTPUT_DIR = os.path.join(REPO_DIR, 'plots', 'web')
+MANIFEST_FILE = os.path.join(OUTPUT_DIR, 'manifest.json')
+
+WIDTHS = [480, 960, 1600]
+WEBP_QUALITY = 82
+PNG_COLORS = 256
+
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_sources():
+    """All chart PNGs, as paths relative to the repository root"""
+    sources = set()
+    for pattern in SOURCE_PATTERNS:
+        for path in glob.glob(os.path.join(REPO_DIR, pattern), recursive=True):
+            if not os.path.abspath(path).startswith(OUTPUT_DIR):
+                sources.add(os.path.relpath(path, REPO_DIR))
+    return sorted(sources)
+
+
+def asset_name(source):
+    """Flat, URL-safe base name for the derived files of a chart"""
+    stem = os.path.splitext(source)[0]
+    safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in stem.replace(os.sep, '__'))
+    return safe.strip('_')
+
+
+def render_variants(source, source_hash):
+    """
+    Derive all widths and formats of one chart.
+    Runs in a worker process and returns the manifest entry.
+    """
+    from PIL import Image
+
+    with Image.open(os.path.join(REPO_DIR, source)) as image:
+        image = image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+        width, height = image.size
+        name = asset_name(source)
+
+        variants = []
+        # Never upscale: charts narrower than a target width are kept at their own width
+        for target in sorted({min(w, width) for w in WIDTHS}):
+            resized = image if target == width else image.resize(
+                (target, round(height * target / width)), Image.LANCZOS, reducing_gap=3.0)
+
+            webp_path = os.path.join(OUTPUT_DIR, f"{name}-{target}w.webp")
+            resized.save(webp_path, 'WEBP', quality=WEBP_QUALITY, method=4)
+
+            png_path = os.path.join(OUTPUT_DIR, f"{name}-{target}w.png")
+            quantized = resized.convert('RGB').quantize(colors=PNG_COLORS, method=Image.Quantize.FASTOCTREE)
+            quantized.save(png_path, 'PNG', optimize=True)
+
+            for path, fmt in ((webp_path, 'webp'), (png_path, 'png')):
+                variants.append({
+                    'width': target,
+                    'height': resized.size[1],
+                    'format': fmt,
+                    'path': os.path.relpath(path, REPO_DIR).replace(os.sep, '/'),
+                    'bytes': os.path.getsize(path),
+                    'hash': file_hash(path)[:16]
+                })
+
+    return source, {
+        'sourceHash': source_hash,
+        'sourceBytes': os.path.getsize(os.path.join(REPO_DIR, source)),
+        'width': width,
+        'height': height,
+        'variants': variants
+    }
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'charts': {}}
+
+
+def is_current(entry, source_hash):
+    """True if the manifest entry was built from this source and all files still exist"""
+    return (entry is not None and entry['sourceHash'] == source_hash and
+            all(os.path.exists(os.path.join(REPO_DIR, v['path'])) for v in entry['variants']))
+
+
+def build_assets(force=False, workers=None):
+    """Rebuild changed charts and write the manifest. Returns (rebuilt, skipped)"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    manifest = load_manifest()
+    charts = manifest.get('charts', {})
+
+    sources = find_sources()
+    hashes = {source: file_hash(os.path.join(REPO_DIR, source)) for source in sources}
+    pending = [s for s in sources if force or not is_current(charts.get(s), hashes[s])]
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for source, entry in executor.map(render_variants, pending, [hashes[s] for s in pending]):
+                charts[source] = entry
+                print(f"  Built {source}")
+
+    # Drop charts whose source PNG no longer exists
+    for source in set(charts) - set(sources):
+        for variant in charts[source]['variants']:
+            path = os.path.join(REPO_DIR, variant['path'])
+            if os.path.exists(path):
+                os.remove(path)
+        del charts[source]
+
+    manifest = {'widths': WIDTHS, 'charts': dict(sorted(charts.items()))}
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    return len(pending), len(sources) - len(pending)
+
+
+def main():
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("❌ Error: Pillow is required for the asset stage (pip install pillow)")
+        return 1
+
+    force = '--force' in sys.argv
+    print("Building web chart assets...")
+    rebuilt, skipped = build_assets(force=force)
+
+    manifest = load_manifest()
+    source_bytes = sum(entry['sourceBytes'] for entry in manifest['charts'].values())
+    smallest_webp = sum(min(v['bytes'] for v in entry['variants'] if v['format'] == 'webp')
+                        for entry in manifest['charts'].values())
+    largest_webp = sum(max(v['bytes'] for v in entry['variants'] if v['format'] == 'webp')
+                       for entry in manifest['charts'].values())
+
+    print("\n" + "="*60)
+    print("ASSET BUILD COMPLETE")
+    print("="*60)
+    print(f"Charts rebuilt: {rebuilt}, unchanged: {skipped}")
+    print(f"Source PNGs: {source_bytes / 1e6:.1f} MB")
+    print(f"WebP at {WIDTHS[0]}px: {smallest_webp / 1e6:.2f} MB, at {WIDTHS[-1]}px: {largest_webp / 1e6:.2f} MB")
+    print(f"Manifest: {MANIFEST_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
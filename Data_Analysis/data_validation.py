@@ -0,0 +1,245 @@
+"""
+Validation of drawing results before any analysis runs.
+
+All checks work on the whole draw matrix at once. Problems are collected
+in a ValidationReport instead of being filtered out silently, so the
+analysis scripts can rely on clean input and skip per-value checks.
+
+Usage: python Data_Analysis/data_validation.py [drawing_results.csv ...]
+Without arguments the versioned history and its version markers are checked.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from game_config import (
+    MAIN_NUMBERS_TOTAL, EURO_ERAS, MAIN_COLUMNS, EURO_COLUMNS, era_mask
+)
+
+# Tuesday draws were added together with the 1-12 euro range
+TUESDAY_DRAWS_START = '2022-03-25'
+FRIDAY = 4
+TUESDAY = 1
+
+
+class ValidationReport:
+    """Collected validation issues, split into errors and warnings"""
+
+    def __init__(self, source):
+        self.source = source
+        self.issues = []
+
+    def add(self, check, severity, message, ids=()):
+        self.issues.append({
+            'check': check,
+            'severity': severity,
+            'message': message,
+            'ids': [int(i) for i in ids]
+        })
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue['severity'] == 'error']
+
+    @property
+    def warnings(self):
+        return [issue for issue in self.issues if issue['severity'] == 'warning']
+
+    @property
+    def ok(self):
+        return len(self.errors) == 0
+
+    def to_frame(self):
+        return pd.DataFrame(self.issues, columns=['check', 'severity', 'message', 'ids'])
+
+    def summary(self):
+        lines = [f"Validation of {self.source}: {len(self.errors)} errors, {len(self.warnings)} warnings"]
+        for issue in self.issues:
+            ids = issue['ids']
+            shown = ', '.join(str(i) for i in ids[:10]) + (' ...' if len(ids) > 10 else '')
+            suffix = f" (ids: {shown})" if ids else ""
+            lines.append(f"  [{issue['severity'].upper()}] {issue['check']}: {issue['message']}{suffix}")
+        return '\n'.join(lines)
+
+
+class DataValidationError(ValueError):
+    """Raised when drawing results fail validation"""
+
+    def __init__(self, report):
+        super().__init__(report.summary())
+        self.report = report
+
+
+def _check_columns(df, report):
+    missing = [column for column in ['id', 'Datum'] + MAIN_COLUMNS + EURO_COLUMNS if column not in df.columns]
+    if missing:
+        report.add('columns', 'error', f"Missing columns: {missing}")
+        return False
+
+    values = df[['id'] + MAIN_COLUMNS + EURO_COLUMNS]
+    incomplete = values.isna().any(axis=1).to_numpy() | df['Datum'].isna().to_numpy()
+    if incomplete.any():
+        report.add('missing_values', 'error', f"{incomplete.sum()} draws with empty fields",
+                   df.loc[incomplete, 'id'].fillna(-1))
+        return False
+
+    non_integer = (values.to_numpy(dtype=float) % 1 != 0).any(axis=1)
+    if non_integer.any():
+        report.add('non_integer', 'error', f"{non_integer.sum()} draws with non-integer values", df.loc[non_integer, 'id'])
+        return False
+    return True
+
+
+def _check_ids(ids, report):
+    steps = np.diff(ids)
+    duplicates = ids[1:][steps == 0]
+    if len(duplicates):
+        report.add('id_duplicates', 'error', f"{len(duplicates)} duplicate draw ids", duplicates)
+    decreasing = ids[1:][steps < 0]
+    if len(decreasing):
+        report.add('id_order', 'error', f"{len(decreasing)} draw ids out of order", decreasing)
+    gaps = ids[1:][steps > 1]
+    if len(gaps):
+        missing = sum(int(s) - 1 for s in steps[steps > 1])
+        report.add('id_continuity', 'warning', f"{missing} ids skipped before {len(gaps)} draws", gaps)
+
+
+def _check_dates(ids, dates, report):
+    steps = np.diff(dates).astype('timedelta64[D]').astype(np.int64)
+    not_increasing = ids[1:][steps <= 0]
+    if len(not_increasing):
+        report.add('date_order', 'error', f"{len(not_increasing)} draws not after their predecessor", not_increasing)
+
+    weekdays = pd.DatetimeIndex(dates).dayofweek.to_numpy()
+    tuesday_era = dates >= np.datetime64(TUESDAY_DRAWS_START, 'D')
+    allowed = (weekdays == FRIDAY) | (tuesday_era & (weekdays == TUESDAY))
+    if (~allowed).any():
+        report.add('draw_weekday', 'error', f"{(~allowed).sum()} draws on an unexpected weekday", ids[~allowed])
+
+    # Longest regular gap: a week before Tuesday draws, four days after
+    expected_gap = np.where(tuesday_era[:-1], 4, 7)
+    late = ids[1:][(steps > expected_gap) & (steps > 0)]
+    if len(late):
+        report.add('draw_schedule', 'warning', f"{len(late)} draws after a longer than usual gap", late)
+
+
+def _check_numbers(ids, dates, main, euro, report):
+    main_sorted = np.sort(main, axis=1)
+    euro_sorted = np.sort(euro, axis=1)
+
+    repeated = (np.diff(main_sorted, axis=1) == 0).any(axis=1) | (np.diff(euro_sorted, axis=1) == 0).any(axis=1)
+    if repeated.any():
+        report.add('duplicate_numbers', 'error', f"{repeated.sum()} draws repeat a number", ids[repeated])
+
+    main_range = (main_sorted[:, 0] < 1) | (main_sorted[:, -1] > MAIN_NUMBERS_TOTAL)
+    if main_range.any():
+        report.add('main_range', 'error', f"{main_range.sum()} draws with main numbers outside 1-{MAIN_NUMBERS_TOTAL}",
+                   ids[main_range])
+
+    dates = pd.Series(pd.to_datetime(dates))
+    covered = np.zeros(len(ids), dtype=bool)
+    for era in EURO_ERAS:
+        in_era = era_mask(dates, era).to_numpy()
+        covered |= in_era
+        out_of_range = in_era & ((euro_sorted[:, 0] < 1) | (euro_sorted[:, -1] > era['max_euro']))
+        if out_of_range.any():
+            report.add('euro_range', 'error',
+                       f"{out_of_range.sum()} draws in {era['name']} with euro numbers outside 1-{era['max_euro']}",
+                       ids[out_of_range])
+    if (~covered).any():
+        report.add('era', 'error', f"{(~covered).sum()} draws outside all known eras", ids[~covered])
+
+
+def validate_draws(df, source='drawing results'):
+    """
+    Validate a DataFrame in drawing_results_*.csv layout.
+    Returns a ValidationReport; the DataFrame is not modified.
+    """
+    report = ValidationReport(source)
+    if not _check_columns(df, report):
+        return report
+
+    ids = df['id'].to_numpy(dtype=np.int64)
+    try:
+        dates = pd.to_datetime(df['Datum']).to_numpy(dtype='datetime64[D]')
+    except (ValueError, TypeError) as e:
+        report.add('date_format', 'error', f"Unparseable dates: {e}")
+        return report
+
+    main = df[MAIN_COLUMNS].to_numpy(dtype=np.int64)
+    euro = df[EURO_COLUMNS].to_numpy(dtype=np.int64)
+
+    _check_ids(ids, report)
+    _check_dates(ids, dates, report)
+    _check_numbers(ids, dates, main, euro, report)
+    return report
+
+
+def validate_snapshots(paths):
+    """
+    Check that snapshot files agree with each other.
+    Every draw id must have the same row in all snapshots containing it,
+    and a newer snapshot may only add draws, never drop them.
+    """
+    report = ValidationReport(', '.join(os.path.basename(p) for p in paths))
+    columns = ['id', 'Datum'] + MAIN_COLUMNS + EURO_COLUMNS
+    frames = [pd.read_csv(path)[columns] for path in sorted(paths)]
+
+    for older_path, older, newer_path, newer in zip(sorted(paths), frames, sorted(paths)[1:], frames[1:]):
+        merged = older.merge(newer, on='id', how='left', suffixes=('_old', '_new'), indicator=True)
+        dropped = merged['_merge'] == 'left_only'
+        if dropped.any():
+            report.add('snapshot_dropped', 'error',
+                       f"{dropped.sum()} draws of {os.path.basename(older_path)} missing in {os.path.basename(newer_path)}",
+                       merged.loc[dropped, 'id'])
+
+        both = merged[~dropped]
+        changed = np.zeros(len(both), dtype=bool)
+        for column in columns[1:]:
+            changed |= (both[f'{column}_old'] != both[f'{column}_new']).to_numpy()
+        if changed.any():
+            report.add('snapshot_changed', 'error',
+                       f"{changed.sum()} draws differ between {os.path.basename(older_path)} and {os.path.basename(newer_path)}",
+                       both.loc[changed, 'id'])
+    return report
+
+
+def require_valid(df, source):
+    """Return df if it passes validation (printing warnings), raise DataValidationError otherwise"""
+    report = validate_draws(df, source)
+    if not report.ok:
+        raise DataValidationError(report)
+    for issue in report.warnings:
+        print(f"Warning ({issue['check']}): {issue['message']}")
+    return df
+
+
+def main():
+    import sys
+    paths = sys.argv[1:]
+    if not paths:
+        from versioned_dataset import VersionedDataset
+        report = VersionedDataset().validate()
+        print(report.summary())
+        print("\n✓ All validations passed!" if report.ok else "\n❌ Validation failed")
+        return 0 if report.ok else 1
+
+    all_ok = True
+    for path in paths:
+        report = validate_draws(pd.read_csv(path), os.path.basename(path))
+        print(report.summary())
+        all_ok &= report.ok
+
+    if len(paths) > 1:
+        report = validate_snapshots(paths)
+        print(report.summary())
+        all_ok &= report.ok
+
+    print("\n✓ All validations passed!" if all_ok else "\n❌ Validation failed")
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,204 @@
+"""
+Columnar stores for drawing results and prize breakdowns.
+
+Both CSV files are loaded once into numpy arrays keyed by draw id, so
+analyses can work on whole columns instead of iterating over DataFrame
+rows. The prize store is joined to the draw store by id and keeps its
+per-draw aggregates up to date when new rows are appended.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+
+from data_validation import require_valid
+from game_config import EURO_ERAS, PRIZE_CLASSES, MAIN_COLUMNS, EURO_COLUMNS, era_mask
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data')
+DRAWING_RESULTS_FILE = os.path.join(DATA_DIR, 'drawing_results.csv')
+PRICE_BREAKDOWN_FILE = os.path.join(DATA_DIR, 'price_breakdown.csv')
+
+N_CLASSES = len(PRIZE_CLASSES)
+PAYOUT_COLUMNS = [f'price_category_{i}' for i in range(1, N_CLASSES + 1)]
+WINNER_COLUMNS = [f'winner_{i}' for i in range(1, N_CLASSES + 1)]
+
+
+class DrawStore:
+    """Drawing results as columnar arrays (ids, dates, main and euro numbers)"""
+
+    def __init__(self, ids, dates, main, euro):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.main = np.asarray(main, dtype=np.int16).reshape(-1, len(MAIN_COLUMNS))
+        self.euro = np.asarray(euro, dtype=np.int16).reshape(-1, len(EURO_COLUMNS))
+
+    @classmethod
+    def from_csv(cls, csv_path=DRAWING_RESULTS_FILE):
+        """Load a drawing_results_*.csv file"""
+        df = pd.read_csv(csv_path)
+        return cls.from_frame(df)
+
+    @classmethod
+    def load_validated(cls, csv_path=DRAWING_RESULTS_FILE):
+        """
+        Load a drawing results file through the validation gate, raises
+        DataValidationError if it is invalid. Analysis scripts load their
+        history this way; from_csv is for files that are validated elsewhere.
+        """
+        df = require_valid(pd.read_csv(csv_path), os.path.basename(csv_path))
+        return cls.from_frame(df)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build the store from a DataFrame in drawing_results_*.csv layout"""
+        return cls(
+            df['id'].to_numpy(),
+            pd.to_datetime(df['Datum']).to_numpy(dtype='datetime64[D]'),
+            df[MAIN_COLUMNS].to_numpy(),
+            df[EURO_COLUMNS].to_numpy()
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, draw_id, date, main_numbers, euro_numbers):
+        """Append a single draw. Draw ids must be strictly increasing."""
+        if len(self.ids) > 0 and draw_id <= self.ids[-1]:
+            raise ValueError(f"Draw id {draw_id} is not newer than the last stored draw {self.ids[-1]}")
+        self.ids = np.append(self.ids, np.int64(draw_id))
+        self.dates = np.append(self.dates, np.datetime64(date, 'D'))
+        self.main = np.vstack([self.main, np.asarray(main_numbers, dtype=np.int16)])
+        self.euro = np.vstack([self.euro, np.asarray(euro_numbers, dtype=np.int16)])
+
+    def index_of(self, draw_ids):
+        """Row positions of the given draw ids (-1 where the id is unknown)"""
+        draw_ids = np.asarray(draw_ids, dtype=np.int64)
+        positions = np.searchsorted(self.ids, draw_ids)
+        positions = np.clip(positions, 0, max(len(self.ids) - 1, 0))
+        found = (len(self.ids) > 0) & (self.ids[positions] == draw_ids)
+        return np.where(found, positions, -1)
+
+    def era_names(self):
+        """Era name for every draw, following the euro range changes"""
+        dates = pd.Series(pd.to_datetime(self.dates))
+        names = np.full(len(self), '', dtype=object)
+        for era in EURO_ERAS:
+            names[era_mask(dates, era).to_numpy()] = era['name']
+        return names
+
+    def to_frame(self):
+        """Return the draws in drawing_results_*.csv layout"""
+        df = pd.DataFrame({'id': self.ids, 'Datum': pd.to_datetime(self.dates).strftime('%Y-%m-%d')})
+        for i, column in enumerate(MAIN_COLUMNS):
+            df[column] = self.main[:, i]
+        for i, column in enumerate(EURO_COLUMNS):
+            df[column] = self.euro[:, i]
+        return df
+
+
+class PrizeStore:
+    """
+    Prize breakdowns keyed by draw id and joined to a DrawStore.
+
+    Aggregates are recomputed whenever a row is appended:
+      total_payout      - paid out amount per draw (sum of prize * winners)
+      rollover_chain    - number of consecutive draws without jackpot winner,
+                          counted up to and including each draw
+      winners_by_class  - winner counts per class in draw order
+    """
+
+    def __init__(self, draws, ids, payouts, winners):
+        self.draws = draws
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.payouts = np.asarray(payouts, dtype=float).reshape(-1, N_CLASSES)
+        self.winners = np.asarray(winners, dtype=np.int64).reshape(-1, N_CLASSES)
+        self._sort()
+        self._update_aggregates()
+
+    @classmethod
+    def from_csv(cls, draws, csv_path=PRICE_BREAKDOWN_FILE):
+        """Load price_breakdown.csv and join it to the given draw store"""
+        df = pd.read_csv(csv_path)
+        return cls(draws, df['id'].to_numpy(), df[PAYOUT_COLUMNS].to_numpy(), df[WINNER_COLUMNS].to_numpy())
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _sort(self):
+        order = np.argsort(self.ids, kind='stable')
+        self.ids = self.ids[order]
+        self.payouts = self.payouts[order]
+        self.winners = self.winners[order]
+
+    def _update_aggregates(self):
+        self.draw_index = self.draws.index_of(self.ids)
+        missing = self.ids[self.draw_index < 0]
+        if len(missing) > 0:
+            raise ValueError(f"Prize rows without matching draw: {missing.tolist()}")
+
+        self.total_payout = (self.payouts * self.winners).sum(axis=1)
+        self.winners_by_class = self.winners
+        self.rollover_chain = self._rollover_chains()
+
+    def _rollover_chains(self):
+        """Length of the running chain of draws without jackpot winner"""
+        rollover = self.winners[:, 0] == 0
+        # A chain breaks at every jackpot win and at every gap in the draw ids
+        consecutive = np.concatenate([[False], np.diff(self.draw_index) == 1])
+        previous_rollover = np.concatenate([[False], rollover[:-1]])
+        chain_start = rollover & ~(consecutive & previous_rollover)
+
+        running = np.cumsum(rollover)
+        positions = np.arange(len(rollover))
+        last_start = np.maximum.accumulate(np.where(chain_start, positions, 0))
+        offset = running[last_start] - 1
+        return np.where(rollover, running - offset, 0).astype(np.int64)
+
+    def append(self, draw_id, payouts, winners):
+        """Append the prize breakdown of one draw and refresh the aggregates"""
+        if draw_id in self.ids:
+            raise ValueError(f"Prize data for draw {draw_id} already stored")
+        self.ids = np.append(self.ids, np.int64(draw_id))
+        self.payouts = np.vstack([self.payouts, np.asarray(payouts, dtype=float)])
+        self.winners = np.vstack([self.winners, np.asarray(winners, dtype=np.int64)])
+        self._sort()
+        self._update_aggregates()
+
+    def eras(self):
+        """Era name of every stored prize row"""
+        return self.draws.era_names()[self.draw_index]
+
+    def class_averages_by_era(self):
+        """Average prize and winner count per class for every era"""
+        eras = self.eras()
+        rows = []
+        for era in EURO_ERAS:
+            selected = eras == era['name']
+            if not selected.any():
+                continue
+            payouts = self.payouts[selected]
+            winners = self.winners[selected]
+            for index, (main_hits, euro_hits) in enumerate(PRIZE_CLASSES):
+                rows.append({
+                    'era': era['name'],
+                    'price_category': index + 1,
+                    'main_matches': main_hits,
+                    'euro_matches': euro_hits,
+                    'draws': int(selected.sum()),
+                    'average_prize': payouts[:, index].mean(),
+                    'average_winners': winners[:, index].mean()
+                })
+        return pd.DataFrame(rows)
+
+    def to_frame(self):
+        """Return the prize rows in price_breakdown.csv layout"""
+        df = pd.DataFrame(self.payouts, columns=PAYOUT_COLUMNS)
+        df = pd.concat([df, pd.DataFrame(self.winners, columns=WINNER_COLUMNS)], axis=1)
+        df.insert(0, 'id', self.ids)
+        return df
+
+    def save(self, csv_path=PRICE_BREAKDOWN_FILE):
+        """Write the prize rows back to price_breakdown.csv"""
+        df = self.to_frame()
+        df[PAYOUT_COLUMNS] = df[PAYOUT_COLUMNS].map(lambda value: f"{value:.2f}")
+        df.to_csv(csv_path, index=False)
@@ -0,0 +1,153 @@
+"""
+Shared Eurojackpot game parameters.
+
+The euro number range changed twice since the first drawing, so every
+analysis that looks at euro numbers has to split the history into eras.
+The era boundaries below are the same ones used by the frequency and sum
+analysis scripts.
+
+The theoretical and empirical engines take a game configuration (see
+make_game) instead of the Eurojackpot literals, so rule changes and sister
+games (other k-of-n main / euro number pools) run through the same code.
+EUROJACKPOT is the configuration of the current game.
+"""
+
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+# Main numbers: 5 distinct numbers from 1-50
+MAIN_NUMBERS_TOTAL = 50
+MAIN_NUMBERS_DRAWN = 5
+
+# Euro numbers: 2 distinct numbers, range depends on the era
+EURO_NUMBERS_DRAWN = 2
+
+EURO_ERAS = [
+    {
+        'name': '2012_2014',
+        'label': 'Interval 1 (2012-2014)',
+        'start': '2012-03-23',
+        'end': '2014-10-03',
+        'max_euro': 8
+    },
+    {
+        'name': '2014_2022',
+        'label': 'Interval 2 (2014-2022)',
+        'start': '2014-10-10',
+        'end': '2022-03-18',
+        'max_euro': 10
+    },
+    {
+        'name': '2022_present',
+        'label': 'Interval 3 (2022-present)',
+        'start': '2022-03-25',
+        'end': None,
+        'max_euro': 12
+    }
+]
+
+# Prize classes in the column order of price_breakdown.csv
+# (price_category_1..12 / winner_1..12) as (main matches, euro matches)
+PRIZE_CLASSES = [
+    (5, 2), (5, 1), (5, 0), (4, 2), (4, 1), (3, 2),
+    (4, 0), (2, 2), (3, 1), (3, 0), (1, 2), (2, 1)
+]
+
+MAIN_COLUMNS = ['Z1', 'Z2', 'Z3', 'Z4', 'Z5']
+EURO_COLUMNS = ['EZ1', 'EZ2']
+
+
+def get_era(name):
+    """Return the era definition with the given name"""
+    for era in EURO_ERAS:
+        if era['name'] == name:
+            return era
+    raise KeyError(f"Unknown era: {name}")
+
+
+def era_mask(dates, era):
+    """Boolean mask selecting the draws of an era from a datetime Series"""
+    mask = dates >= pd.to_datetime(era['start'])
+    if era['end'] is not None:
+        mask &= dates <= pd.to_datetime(era['end'])
+    return mask
+
+
+def prize_class_lookup():
+    """
+    Table indexed by (main matches, euro matches) with the 1-based prize
+    class of PRIZE_CLASSES, 0 where the combination wins nothing.
+    """
+    lookup = np.zeros((MAIN_NUMBERS_DRAWN + 1, EURO_NUMBERS_DRAWN + 1), dtype=np.int64)
+    for index, (main_hits, euro_hits) in enumerate(PRIZE_CLASSES, start=1):
+        lookup[main_hits, euro_hits] = index
+    return lookup
+
+
+
+def match_probability(n_total, k_drawn, hits):
+    """Probability that a ticket of k_drawn numbers out of n_total matches `hits` drawn numbers"""
+    return comb(k_drawn, hits) * comb(n_total - k_drawn, k_drawn - hits) / comb(n_total, k_drawn)
+
+
+def default_prize_classes(main_total, main_drawn, euro_total=0, euro_drawn=0):
+    """
+    Prize classes for a game without published classes: every (main, euro)
+    match with at least one main number and three numbers in total, rarest
+    first. For Eurojackpot (1-12) this gives PRIZE_CLASSES.
+    """
+    classes = [(m, e) for m in range(1, main_drawn + 1) for e in range(euro_drawn + 1) if m + e >= 3]
+    return tuple(sorted(classes, key=lambda c: match_probability(main_total, main_drawn, c[0]) *
+                        match_probability(euro_total, euro_drawn, c[1])))
+
+
+def make_game(main_total, main_drawn, euro_total=0, euro_drawn=0, name=None, prize_classes=None, eras=None):
+    """
+    Game configuration: main_drawn distinct numbers out of 1..main_total plus
+    euro_drawn distinct numbers out of 1..euro_total (0 for games without a
+    second pool). `eras` optionally splits the history by euro range like
+    EURO_ERAS; column names follow the drawing_results.csv layout.
+    """
+    if not 0 < main_drawn <= main_total or not 0 <= euro_drawn <= euro_total:
+        raise ValueError(f"Invalid game: {main_drawn} of {main_total} main, {euro_drawn} of {euro_total} euro numbers")
+    if prize_classes is None:
+        prize_classes = default_prize_classes(main_total, main_drawn, euro_total, euro_drawn)
+    return {
+        'name': name or f"{main_drawn}of{main_total}" + (f"_{euro_drawn}of{euro_total}" if euro_drawn else ''),
+        'main_total': main_total,
+        'main_drawn': main_drawn,
+        'euro_total': euro_total,
+        'euro_drawn': euro_drawn,
+        'prize_classes': tuple(tuple(c) for c in prize_classes),
+        'main_columns': [f'Z{i}' for i in range(1, main_drawn + 1)],
+        'euro_columns': [f'EZ{i}' for i in range(1, euro_drawn + 1)],
+        'eras': eras if eras is not None else [
+            {'name': 'all', 'label': 'All draws', 'start': '1900-01-01', 'end': None, 'max_euro': euro_total}
+        ]
+    }
+
+
+def era_prize_classes(game, era):
+    """
+    Prize classes of a game in one era: the era's own 'prize_classes' if it
+    has them, the game's classes if the era uses the game's euro range,
+    otherwise the rarest-first default for the era's euro range (the class
+    order changes with the range, e.g. 4+0 is rarer than 3+2 with 1-8).
+    """
+    if 'prize_classes' in era:
+        return tuple(tuple(c) for c in era['prize_classes'])
+    if era['max_euro'] == game['euro_total']:
+        return game['prize_classes']
+    return default_prize_classes(game['main_total'], game['main_drawn'], era['max_euro'], game['euro_drawn'])
+
+
+def era_game(game, era):
+    """The configuration of a game restricted to the euro range of one era"""
+    return make_game(game['main_total'], game['main_drawn'], era['max_euro'], game['euro_drawn'],
+                     f"{game['name']}_{era['name']}", era_prize_classes(game, era), [era])
+
+
+EUROJACKPOT = make_game(MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_ERAS[-1]['max_euro'], EURO_NUMBERS_DRAWN,
+                        'eurojackpot', PRIZE_CLASSES, EURO_ERAS)
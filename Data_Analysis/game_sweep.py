@@ -0,0 +1,189 @@
+"""
+Batch computation of the theoretical tables for a grid of game configurations.
+
+Every configuration (main_drawn of main_total plus euro_drawn of euro_total)
+gets the same theoretical tables the analysis scripts publish for
+Eurojackpot, computed with the same engines:
+
+  sums         - sum distributions of the main and euro numbers (sum_number_analysis.py)
+  parity       - even count distributions of main, euro and combined numbers (generate_even_odd_csv.py)
+  prize_tiers  - probability and odds of every prize class (prize_tier_calculator.py)
+
+Configurations are processed in parallel and written as one long CSV per
+table with the configuration name in the first column, plus games.csv
+with one summary row per configuration.
+
+Usage: python Data_Analysis/game_sweep.py [--main 35-70] [--main-drawn 5-6] [--euro 0,8-12]
+                                          [--euro-drawn 0-2] [--workers N] [--output DIR]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+for subdir in ('Sum_Number_Analysis', 'Even_Odd_Analysis', 'Prize_Analysis'):
+    sys.path.insert(0, os.path.join(base_dir, subdir))
+
+from game_config import make_game
+from sum_number_analysis import theoretical_sum_distribution
+from generate_even_odd_csv import calculate_hypergeometric_probability, calculate_combined_theoretical_probabilities
+from prize_tier_calculator import prize_tier_probabilities
+
+OUTPUT_DIR = os.path.join(base_dir, 'Reports', 'game_sweep')
+
+DEFAULT_GRID = {
+    'main': '35-70',
+    'main-drawn': '5-6',
+    'euro': '0,8-12',
+    'euro-drawn': '0-2'
+}
+
+
+def parse_values(spec):
+    """Integers of a grid axis like '5', '40-70' or '0,8-12'"""
+    values = []
+    for part in spec.split(','):
+        start, _, end = part.partition('-')
+        values.extend(range(int(start), int(end or start) + 1))
+    return sorted(set(values))
+
+
+def game_grid(main_totals, main_drawn, euro_totals, euro_drawn):
+    """
+    Every valid configuration of the grid. Games without euro numbers appear
+    once (euro_total 0 with euro_drawn 0), euro pools need at least as many
+    numbers as are drawn.
+    """
+    games = []
+    for n, k, euro_n, euro_k in product(main_totals, main_drawn, euro_totals, euro_drawn):
+        if k > n or (euro_n == 0) != (euro_k == 0) or euro_k > euro_n:
+            continue
+        games.append(make_game(n, k, euro_n, euro_k))
+    return games
+
+
+def _parity_rows(name, pool, probabilities):
+    return [{'game': name, 'pool': pool, 'even_count': k, 'probability': p} for k, p in probabilities.items()]
+
+
+def compute_tables(game):
+    """All theoretical tables of one configuration as DataFrames"""
+    name = game['name']
+    main_total, main_drawn = game['main_total'], game['main_drawn']
+    euro_total, euro_drawn = game['euro_total'], game['euro_drawn']
+
+    sums = [theoretical_sum_distribution(main_total, main_drawn).assign(pool='main')]
+    if euro_drawn:
+        sums.append(theoretical_sum_distribution(euro_total, euro_drawn).assign(pool='euro'))
+    sums = pd.concat(sums, ignore_index=True)
+    sums.insert(0, 'game', name)
+
+    main_parity = {k: calculate_hypergeometric_probability(main_total, main_total // 2, main_drawn, k)
+                   for k in range(main_drawn + 1)}
+    parity = _parity_rows(name, 'main', main_parity)
+    if euro_drawn:
+        # Exact (hypergeometric) euro parity; the published Eurojackpot tables
+        # keep their binomial euro model
+        euro_parity = {k: calculate_hypergeometric_probability(euro_total, euro_total // 2, euro_drawn, k)
+                       for k in range(euro_drawn + 1)}
+        parity += _parity_rows(name, 'euro', euro_parity)
+        parity += _parity_rows(name, 'combined', calculate_combined_theoretical_probabilities(
+            main_total, main_drawn, euro_drawn, euro_total))
+
+    probabilities = prize_tier_probabilities(euro_total, main_total, main_drawn, euro_drawn, game['prize_classes'])
+    prize_tiers = pd.DataFrame({
+        'game': name,
+        'price_category': np.arange(1, len(probabilities) + 1),
+        'main_matches': [m for m, _ in game['prize_classes']],
+        'euro_matches': [e for _, e in game['prize_classes']],
+        'probability': probabilities,
+        'odds_one_in': 1 / probabilities
+    })
+
+    main_sums = sums[sums['pool'] == 'main']
+    mean = float((main_sums['sum'] * main_sums['probability']).sum())
+    summary = {
+        'game': name,
+        'main_total': main_total,
+        'main_drawn': main_drawn,
+        'euro_total': euro_total,
+        'euro_drawn': euro_drawn,
+        'combinations': comb(main_total, main_drawn) * comb(euro_total, euro_drawn),
+        'prize_classes': len(probabilities),
+        'jackpot_odds_one_in': float(1 / probabilities[0]),
+        'any_prize_odds_one_in': float(1 / probabilities.sum()),
+        'main_sum_mean': mean,
+        'main_sum_std': float(np.sqrt((main_sums['probability'] * (main_sums['sum'] - mean) ** 2).sum()))
+    }
+    return {'games': summary, 'sums': sums, 'parity': pd.DataFrame(parity), 'prize_tiers': prize_tiers}
+
+
+def run_sweep(games, workers=None):
+    """Compute the tables of every configuration in a process pool; returns one DataFrame per table"""
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(compute_tables, games, chunksize=max(1, len(games) // (workers * 4))))
+    else:
+        results = [compute_tables(game) for game in games]
+
+    return {
+        'games': pd.DataFrame([result['games'] for result in results]),
+        'sums': pd.concat([result['sums'] for result in results], ignore_index=True),
+        'parity': pd.concat([result['parity'] for result in results], ignore_index=True),
+        'prize_tiers': pd.concat([result['prize_tiers'] for result in results], ignore_index=True)
+    }
+
+
+def main():
+    options = dict(DEFAULT_GRID)
+    workers, output_dir = None, OUTPUT_DIR
+    args = sys.argv[1:]
+    while args:
+        arg = args.pop(0)
+        if arg == '--workers':
+            workers = int(args.pop(0))
+        elif arg == '--output':
+            output_dir = args.pop(0)
+        elif arg.startswith('--') and arg[2:] in options:
+            options[arg[2:]] = args.pop(0)
+        else:
+            print(f"Unknown argument: {arg}")
+            print(__doc__)
+            return 1
+
+    games = game_grid(parse_values(options['main']), parse_values(options['main-drawn']),
+                      parse_values(options['euro']), parse_values(options['euro-drawn']))
+    print(f"Computing theoretical tables for {len(games)} game configurations...")
+
+    started = time.perf_counter()
+    tables = run_sweep(games, workers)
+    elapsed = time.perf_counter() - started
+    print(f"Finished in {elapsed:.1f}s")
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name, df in tables.items():
+        path = os.path.join(output_dir, f"{name}.csv")
+        df.to_csv(path, index=False)
+        print(f"  {name}: {len(df):,} rows -> {path}")
+
+    games_df = tables['games']
+    print("\n" + "="*60)
+    print("EASIEST AND HARDEST JACKPOTS")
+    print("="*60)
+    ordered = games_df.sort_values('jackpot_odds_one_in')
+    for _, row in pd.concat([ordered.head(3), ordered.tail(3)]).iterrows():
+        print(f"  {row['game']:16s} jackpot 1 in {row['jackpot_odds_one_in']:>16,.0f}, "
+              f"any prize 1 in {row['any_prize_odds_one_in']:6.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
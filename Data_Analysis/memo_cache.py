@@ -0,0 +1,205 @@
+"""
+Persistent memoization for theoretical distributions.
+
+Theoretical tables (sum distributions, parity tables, ...) only depend on
+the game parameters, so they are computed once and stored on disk. Only
+table-level functions are worth memoizing: for a scalar that takes
+microseconds to compute, the key hashing and unpickling cost more than
+the computation. Entries are keyed by function name, call arguments and a
+code version derived from the source of the function and of the repository
+functions it calls, so changing the implementation invalidates old entries
+automatically. An in-process LRU sits in front of
+the disk cache and the disk cache is trimmed to a maximum size by evicting
+the least recently used entries.
+
+Set EUROJACKPOT_CACHE=off to bypass the cache completely.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SOURCE_DIR, '.cache')
+CACHE_FORMAT_VERSION = 1
+
+MEMORY_MAX_ENTRIES = 128
+DISK_MAX_BYTES = 256 * 1024 * 1024
+
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _cache_enabled():
+    return os.environ.get('EUROJACKPOT_CACHE', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+
+def _callees(func):
+    """Functions defined below SOURCE_DIR that func refers to by global name"""
+    names = set()
+    codes = [func.__code__]
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes.extend(const for const in code.co_consts if inspect.iscode(const))
+
+    callees = []
+    for name in sorted(names):
+        value = func.__globals__.get(name)
+        if callable(value):
+            value = inspect.unwrap(value)
+        if inspect.isfunction(value) and os.path.abspath(value.__code__.co_filename).startswith(SOURCE_DIR + os.sep):
+            callees.append(value)
+    return callees
+
+
+def _code_version(func, version):
+    """
+    Hash of the source of the function and (transitively) of the repository
+    functions it calls, combined with an explicit version tag
+    """
+    sources, seen, pending = [], set(), [inspect.unwrap(func)]
+    while pending:
+        current = pending.pop()
+        if current.__code__ in seen:
+            continue
+        seen.add(current.__code__)
+        try:
+            sources.append(inspect.getsource(current))
+        except (OSError, TypeError):
+            sources.append(current.__qualname__)
+        pending.extend(_callees(current))
+    source = '\n'.join(sources)
+    return hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{version}:{source}".encode()).hexdigest()[:16]
+
+
+def _make_key(func, code_version, args, kwargs):
+    """Cache key from function, call arguments and code version"""
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    parameters = repr(sorted(bound.arguments.items()))
+    name = f"{func.__module__}.{func.__qualname__}"
+    digest = hashlib.sha256(f"{name}|{parameters}|{code_version}".encode()).hexdigest()
+    return f"{func.__name__}-{digest[:32]}"
+
+
+def _remember(key, payload):
+    with _memory_lock:
+        _memory_cache[key] = payload
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_MAX_ENTRIES:
+            _memory_cache.popitem(last=False)
+
+
+def _recall(key):
+    with _memory_lock:
+        payload = _memory_cache.get(key)
+        if payload is not None:
+            _memory_cache.move_to_end(key)
+        return payload
+
+
+def _read_disk(key):
+    path = os.path.join(CACHE_DIR, f"{key}.pkl")
+    try:
+        with open(path, 'rb') as f:
+            payload = f.read()
+    except FileNotFoundError:
+        return None
+    # Touch the entry so eviction keeps recently used tables
+    try:
+        os.utime(path, None)
+    except FileNotFoundError:
+        pass
+    return payload
+
+
+def _write_disk(key, payload):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"{key}.pkl")
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(temp_path, path)
+    evict_disk_cache()
+
+
+def evict_disk_cache(max_bytes=DISK_MAX_BYTES):
+    """Delete least recently used entries until the cache fits into max_bytes"""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith('.pkl'):
+            try:
+                stat = os.stat(os.path.join(CACHE_DIR, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(CACHE_DIR, name))
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_cache():
+    """Remove all cached entries from memory and disk"""
+    _memory_cache.clear()
+    if os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(CACHE_DIR, name))
+
+
+def memoize(version=1):
+    """
+    Decorator caching a pure function of game parameters in memory and on disk.
+    Bump version to invalidate entries when behaviour changes without a
+    source change (e.g. a changed library).
+    The code version is computed on the first call, when every function the
+    decorated one calls has been defined.
+    """
+    def decorator(func):
+        code_version = None
+
+        def current_version():
+            nonlocal code_version
+            if code_version is None:
+                code_version = _code_version(func, version)
+            return code_version
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _cache_enabled():
+                return func(*args, **kwargs)
+
+            key = _make_key(func, current_version(), args, kwargs)
+            payload = _recall(key)
+            if payload is None:
+                payload = _read_disk(key)
+                if payload is None:
+                    payload = pickle.dumps(func(*args, **kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+                    _write_disk(key, payload)
+                _remember(key, payload)
+
+            # Unpickle on every hit so callers can never modify the cached table
+            return pickle.loads(payload)
+
+        wrapper.cache_key = lambda *args, **kwargs: _make_key(func, current_version(), args, kwargs)
+        return wrapper
+
+    return decorator
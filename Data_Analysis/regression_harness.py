@@ -0,0 +1,434 @@
+"""
+Reference-equivalence and performance regression harness for the analysis scripts.
+
+The scripts of a frozen reference revision (REFERENCE_REV, any git revision
+via --reference) and of the working tree are copied into two sandboxes and
+run as separate processes on the same test histories:
+
+  fixed      - the full stored history
+  random_<s> - the stored ids and dates with numbers drawn from seed s,
+               cut at a random length (all eras are always covered)
+
+Every CSV and JSON file an engine writes is compared with the reference
+output numerically (relative tolerance RTOL, absolute ATOL); strings,
+columns and keys must match exactly. Wall time and peak memory (max RSS of
+the child process) are measured per engine on the fixed history, best of
+--repeat runs, and a regression beyond TIME_TOLERANCE / MEMORY_TOLERANCE
+against the reference run of the same session fails the harness.
+
+The theoretical-table cache is disabled in both sandboxes, so both sides
+compute everything. The history is staged under every file name the
+sandbox sources refer to (older revisions read dated snapshots such as
+drawing_results_20250808.csv), absolute paths of the original checkout
+are relocated into the sandbox, and inputs an engine reads from other
+scripts are produced by its setup scripts first. An engine that fails on
+either side is reported as a mismatch and not timed.
+
+Usage: python Data_Analysis/regression_harness.py [--reference REV] [--engines a,b] [--random N]
+                                                  [--repeat N] [--time-tolerance F] [--memory-tolerance F]
+"""
+
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from draw_store import DRAWING_RESULTS_FILE
+from game_config import (
+    MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN, MAIN_COLUMNS, EURO_COLUMNS, EURO_ERAS, era_mask
+)
+from versioned_dataset import REPO_ROOT
+
+# Implementation the outputs are compared against: the last revision before
+# the engines were rewritten for speed. Move it forward when a new set of
+# outputs has been accepted
+REFERENCE_REV = '5532451c1bc2cbe08b888ce6dbeef811f4e421d1'
+
+# Checkout locations hard-coded in older sources, replaced by the sandbox root
+ABSOLUTE_ROOTS = ['/Users/tobi/Documents/Lotto/Lotto_Website']
+# File names under which the scripts of any revision read the history
+HISTORY_FILE_PATTERN = re.compile(r'drawing_results(?:_\d{8})?\.csv')
+
+REPORT_FILE = os.path.join(REPO_ROOT, 'Data_Analysis', 'Reports', 'regression_report.json')
+
+# Scripts producing the frequency CSVs other engines read
+FREQUENCY_SETUP = [
+    {'script': 'Data_Analysis/Number_Frequency_Analysis/frequency_analysis_main_numbers_2.py', 'cwd': '.'},
+    {'script': 'Data_Analysis/Number_Frequency_Analysis/frequency_analysis_main_numbers.py', 'cwd': 'Data_Analysis'}
+]
+
+# Engines: script, working directory (relative to the sandbox root), output
+# directory scanned for CSV/JSON files, JSON keys that are allowed to differ,
+# JSON keys the candidate may add over the reference, extra seconds allowed
+# for work the candidate does on purpose, and setup scripts run (untimed)
+# before the engine
+ENGINES = {
+    'frequency': {
+        'script': 'Data_Analysis/Number_Frequency_Analysis/frequency_analysis_main_numbers.py',
+        'cwd': 'Data_Analysis',
+        'outputs': 'Data_Analysis/Number_Frequency_Analysis'
+    },
+    'sums': {
+        'script': 'Data_Analysis/Sum_Number_Analysis/sum_number_analysis.py',
+        'cwd': '.',
+        'outputs': 'Data_Analysis/Sum_Number_Analysis'
+    },
+    'even_odd': {
+        'script': 'Data_Analysis/Even_Odd_Analysis/generate_even_odd_csv.py',
+        'cwd': '.',
+        'outputs': 'Data_Analysis/Even_Odd_Analysis'
+    },
+    'hot_cold': {
+        'script': 'Data_Analysis/structured_pick_generator/generate_hot_cold_numbers.py',
+        'cwd': '.',
+        'outputs': 'Data_Analysis/structured_pick_generator',
+        'ignore_keys': {'lastUpdated'},
+        # Ranking stability from the bootstrap replicates added on top of the categories
+        'added_keys': {'bootstrap', 'frequencyCI', 'hotProbability', 'coldProbability'},
+        'extra_seconds': 1.0,
+        'setup': FREQUENCY_SETUP
+    }
+}
+
+RTOL = 1e-9
+ATOL = 1e-12
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.20
+# Differences below these are noise regardless of the relative tolerance
+TIME_SLACK = 0.2
+MEMORY_SLACK_MB = 16
+
+# The scripts pin this dataset version or use the latest one; the sandbox
+# publishes every test history under this single version
+SANDBOX_VERSION = '20250808'
+
+
+def _git(*args):
+    return subprocess.run(['git', *args], cwd=REPO_ROOT, check=True, capture_output=True).stdout
+
+
+def create_sandbox(revision=None):
+    """
+    Temporary tree with the Python sources of Data_Analysis, from a git
+    revision or (revision None) from the working tree.
+    """
+    root = tempfile.mkdtemp(prefix=f"regression_{'working' if revision is None else revision[:8]}_")
+    if revision is None:
+        paths = _git('ls-files', '--cached', '--others', '--exclude-standard', 'Data_Analysis').decode().split('\n')
+    else:
+        paths = _git('ls-tree', '-r', '--name-only', revision, 'Data_Analysis').decode().split('\n')
+    for path in paths:
+        if not path.endswith('.py'):
+            continue
+        target = os.path.join(root, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if revision is None:
+            shutil.copyfile(os.path.join(REPO_ROOT, path), target)
+        else:
+            source = _git('show', f'{revision}:{path}')
+            for absolute_root in ABSOLUTE_ROOTS:
+                source = source.replace(absolute_root.encode(), root.encode())
+            with open(target, 'wb') as f:
+                f.write(source)
+    os.makedirs(os.path.join(root, 'Data_Analysis', 'Data'), exist_ok=True)
+    return root
+
+
+def history_file_names(root):
+    """Names of the history files the sources of a sandbox read"""
+    names = {'drawing_results.csv'}
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if name.endswith('.py'):
+                with open(os.path.join(dirpath, name), encoding='utf-8', errors='replace') as f:
+                    names.update(HISTORY_FILE_PATTERN.findall(f.read()))
+    return sorted(names)
+
+
+def random_history(base, seed):
+    """The ids and dates of base with uniformly drawn numbers, cut at a random length"""
+    rng = np.random.default_rng(seed)
+    dates = pd.to_datetime(base['Datum'])
+    last_era_start = int((dates < pd.to_datetime(EURO_ERAS[-1]['start'])).sum())
+    length = int(rng.integers(last_era_start + 1, len(base) + 1))
+    df = base.iloc[:length][['id', 'Datum']].copy()
+
+    main = np.argsort(rng.random((length, MAIN_NUMBERS_TOTAL)), axis=1)[:, :MAIN_NUMBERS_DRAWN] + 1
+    df[MAIN_COLUMNS] = main
+    euro = np.zeros((length, EURO_NUMBERS_DRAWN), dtype=np.int64)
+    for era in EURO_ERAS:
+        mask = era_mask(dates.iloc[:length], era).to_numpy()
+        keys = rng.random((mask.sum(), era['max_euro']))
+        euro[mask] = np.argsort(keys, axis=1)[:, :EURO_NUMBERS_DRAWN] + 1
+    df[EURO_COLUMNS] = euro
+    return df
+
+
+def test_histories(n_random, seed=2025):
+    """Test histories by name"""
+    base = pd.read_csv(DRAWING_RESULTS_FILE)
+    histories = {'fixed': base}
+    for s in range(seed, seed + n_random):
+        histories[f'random_{s}'] = random_history(base, s)
+    return histories
+
+
+def install_history(root, df):
+    """Make df the only published version of the sandbox dataset, under every file name the sources read"""
+    data_dir = os.path.join(root, 'Data_Analysis', 'Data')
+    for name in history_file_names(root):
+        df.to_csv(os.path.join(data_dir, name), index=False)
+    marker = {
+        'version': SANDBOX_VERSION,
+        'draws': len(df),
+        'lastDrawId': int(df['id'].iloc[-1]),
+        'lastDrawDate': str(df['Datum'].iloc[-1])
+    }
+    with open(os.path.join(data_dir, 'dataset_versions.json'), 'w', encoding='utf-8') as f:
+        json.dump({'history': 'drawing_results.csv', 'versions': [marker]}, f, indent=2)
+
+
+def clear_outputs(root, engine):
+    """Remove CSV/JSON outputs of a previous run"""
+    for path in output_files(root, engine):
+        os.remove(os.path.join(root, engine['outputs'], path))
+
+
+def output_files(root, engine):
+    """CSV and JSON files below the output directory of an engine, relative to it"""
+    directory = os.path.join(root, engine['outputs'])
+    files = []
+    for dirpath, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(('.csv', '.json')):
+                files.append(os.path.relpath(os.path.join(dirpath, name), directory))
+    return sorted(files)
+
+
+def run_engine(root, engine):
+    """Run one engine in its sandbox; returns return code, wall time, peak RSS (MB) and output tail"""
+    env = dict(os.environ, EUROJACKPOT_CACHE='off', MPLBACKEND='Agg', PYTHONDONTWRITEBYTECODE='1')
+    with tempfile.TemporaryFile() as log:
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, os.path.join(root, engine['script'])],
+                                   cwd=os.path.join(root, engine['cwd']), env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        # wait4 reports the resource usage of exactly this child
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+        log.seek(0)
+        output = log.read().decode(errors='replace')
+    peak_mb = usage.ru_maxrss / 1024 if sys.platform != 'darwin' else usage.ru_maxrss / 1024 ** 2
+    return {'returncode': process.returncode, 'seconds': seconds, 'peak_mb': peak_mb,
+            'output': output[-2000:]}
+
+
+def _compare_values(reference, candidate, path, ignore_keys, differences, added_keys=frozenset()):
+    """Recursive JSON comparison with numeric tolerance; the candidate may have added_keys on top"""
+    if isinstance(reference, dict) and isinstance(candidate, dict):
+        unexpected = (set(reference) ^ set(candidate)) - (set(candidate) & added_keys - set(reference))
+        if unexpected:
+            differences.append(f"{path}: keys differ ({sorted(unexpected)})")
+        for key in reference.keys() & candidate.keys():
+            if key not in ignore_keys:
+                _compare_values(reference[key], candidate[key], f"{path}.{key}", ignore_keys, differences,
+                                added_keys)
+    elif isinstance(reference, list) and isinstance(candidate, list):
+        if len(reference) != len(candidate):
+            differences.append(f"{path}: length {len(reference)} != {len(candidate)}")
+        for i, (a, b) in enumerate(zip(reference, candidate)):
+            _compare_values(a, b, f"{path}[{i}]", ignore_keys, differences, added_keys)
+    elif (isinstance(reference, (int, float)) and isinstance(candidate, (int, float))
+          and not isinstance(reference, bool) and not isinstance(candidate, bool)):
+        if not math.isclose(reference, candidate, rel_tol=RTOL, abs_tol=ATOL):
+            differences.append(f"{path}: {reference} != {candidate}")
+    elif reference != candidate:
+        differences.append(f"{path}: {reference!r} != {candidate!r}")
+
+
+def compare_csv(reference_file, candidate_file):
+    """Differences between two CSV files, numeric columns with tolerance"""
+    reference = pd.read_csv(reference_file)
+    candidate = pd.read_csv(candidate_file)
+    if list(reference.columns) != list(candidate.columns):
+        return [f"columns {list(reference.columns)} != {list(candidate.columns)}"]
+    if len(reference) != len(candidate):
+        return [f"{len(reference)} rows != {len(candidate)} rows"]
+
+    differences = []
+    for column in reference.columns:
+        a, b = reference[column], candidate[column]
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+            a, b = a.to_numpy(dtype=float), b.to_numpy(dtype=float)
+            close = np.isclose(a, b, rtol=RTOL, atol=ATOL, equal_nan=True)
+            if not close.all():
+                row = int(np.argmin(close))
+                differences.append(f"{column}: {(~close).sum()} values differ, max |diff| "
+                                   f"{np.nanmax(np.abs(a - b)):.3g} (first at row {row}: {a[row]} != {b[row]})")
+        elif not a.astype(str).equals(b.astype(str)):
+            row = int(np.argmax(a.astype(str).to_numpy() != b.astype(str).to_numpy()))
+            differences.append(f"{column}: first difference at row {row}: {a.iloc[row]!r} != {b.iloc[row]!r}")
+    return differences
+
+
+def compare_outputs(reference_root, candidate_root, engine):
+    """{file: [differences]} for every output file that does not match"""
+    reference_files = output_files(reference_root, engine)
+    candidate_files = output_files(candidate_root, engine)
+    mismatches = {}
+    for name in sorted(set(reference_files) ^ set(candidate_files)):
+        mismatches[name] = ['missing in candidate' if name in reference_files else 'not written by reference']
+
+    for name in sorted(set(reference_files) & set(candidate_files)):
+        reference_file = os.path.join(reference_root, engine['outputs'], name)
+        candidate_file = os.path.join(candidate_root, engine['outputs'], name)
+        if name.endswith('.csv'):
+            differences = compare_csv(reference_file, candidate_file)
+        else:
+            with open(reference_file, encoding='utf-8') as f:
+                reference = json.load(f)
+            with open(candidate_file, encoding='utf-8') as f:
+                candidate = json.load(f)
+            differences = []
+            _compare_values(reference, candidate, '$', engine.get('ignore_keys', set()), differences,
+                            engine.get('added_keys', frozenset()))
+        if differences:
+            mismatches[name] = differences
+    return mismatches
+
+
+def check_performance(reference, candidate, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE,
+                      extra_seconds=0.0):
+    """Regression messages for one engine (empty when within tolerance)"""
+    regressions = []
+    time_limit = max(reference['seconds'] * (1 + time_tolerance), reference['seconds'] + TIME_SLACK) + extra_seconds
+    if candidate['seconds'] > time_limit:
+        regressions.append(f"time {candidate['seconds']:.2f}s > {time_limit:.2f}s "
+                           f"(reference {reference['seconds']:.2f}s)")
+    memory_limit = max(reference['peak_mb'] * (1 + memory_tolerance), reference['peak_mb'] + MEMORY_SLACK_MB)
+    if candidate['peak_mb'] > memory_limit:
+        regressions.append(f"peak memory {candidate['peak_mb']:.0f} MB > {memory_limit:.0f} MB "
+                           f"(reference {reference['peak_mb']:.0f} MB)")
+    return regressions
+
+
+def run_harness(reference_rev=REFERENCE_REV, engines=None, n_random=2, repeat=3,
+                time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """Run all checks; returns the report dict (report['ok'] is the overall result)"""
+    engines = {name: ENGINES[name] for name in (engines or ENGINES)}
+    roots = {'reference': create_sandbox(reference_rev), 'candidate': create_sandbox()}
+    report = {'reference': reference_rev, 'engines': {}, 'ok': True}
+    try:
+        for history_name, df in test_histories(n_random).items():
+            for root in roots.values():
+                install_history(root, df)
+            print(f"\nHistory {history_name}: {len(df)} draws")
+
+            for name, engine in engines.items():
+                entry = report['engines'].setdefault(name, {'equivalence': {}, 'performance': None})
+                runs = repeat if history_name == 'fixed' else 1
+                timings = {side: [] for side in roots}
+                setup_failures = {}
+                for side, root in roots.items():
+                    for step in engine.get('setup', []):
+                        run = run_engine(root, step)
+                        if run['returncode'] != 0:
+                            setup_failures[side] = [f"setup {step['script']} exited with {run['returncode']}",
+                                                    run['output']]
+                            break
+                for _ in range(runs):
+                    # Alternate the sides so drift affects both equally
+                    for side, root in roots.items():
+                        clear_outputs(root, engine)
+                        timings[side].append(run_engine(root, engine))
+
+                results = {side: min(runs_, key=lambda run: run['seconds']) for side, runs_ in timings.items()}
+                for side in roots:
+                    results[side]['peak_mb'] = max(run['peak_mb'] for run in timings[side])
+
+                returncodes = {side: results[side]['returncode'] for side in roots}
+                if setup_failures:
+                    mismatches = {f'<{side} setup>': failure for side, failure in setup_failures.items()}
+                elif any(returncodes.values()):
+                    # A crashed run writes nothing, two crashes would compare as equal
+                    mismatches = {f'<{side} exit code>': [f"exited with {returncodes[side]}", results[side]['output']]
+                                  for side in roots if returncodes[side] != 0}
+                else:
+                    mismatches = compare_outputs(roots['reference'], roots['candidate'], engine)
+                entry['equivalence'][history_name] = mismatches
+                status = 'match' if not mismatches else f"{len(mismatches)} file(s) differ"
+                print(f"  {name:10s} {status:22s} reference {results['reference']['seconds']:6.2f}s "
+                      f"{results['reference']['peak_mb']:5.0f} MB | candidate {results['candidate']['seconds']:6.2f}s "
+                      f"{results['candidate']['peak_mb']:5.0f} MB")
+                for file_name, differences in mismatches.items():
+                    for difference in differences[:3]:
+                        print(f"      {file_name}: {difference}")
+
+                # Timings of a failed run say nothing about the implementation
+                if history_name == 'fixed' and not setup_failures and not any(returncodes.values()):
+                    entry['performance'] = {
+                        side: {'seconds': round(results[side]['seconds'], 3), 'peak_mb': round(results[side]['peak_mb'], 1)}
+                        for side in roots
+                    }
+                    entry['performance']['regressions'] = check_performance(
+                        results['reference'], results['candidate'],
+                        time_tolerance, memory_tolerance, engine.get('extra_seconds', 0.0))
+                if mismatches or (entry['performance'] and entry['performance']['regressions']):
+                    report['ok'] = False
+    finally:
+        for root in roots.values():
+            shutil.rmtree(root, ignore_errors=True)
+    return report
+
+
+def main():
+    options = {'reference_rev': REFERENCE_REV, 'engines': None, 'n_random': 2, 'repeat': 3,
+               'time_tolerance': TIME_TOLERANCE, 'memory_tolerance': MEMORY_TOLERANCE}
+    parsers = {'--reference': ('reference_rev', str), '--engines': ('engines', lambda v: v.split(',')),
+               '--random': ('n_random', int), '--repeat': ('repeat', int),
+               '--time-tolerance': ('time_tolerance', float), '--memory-tolerance': ('memory_tolerance', float)}
+    args = sys.argv[1:]
+    while args:
+        arg = args.pop(0)
+        if arg not in parsers or not args:
+            print(__doc__)
+            return 2
+        key, parse = parsers[arg]
+        options[key] = parse(args.pop(0))
+    unknown = set(options['engines'] or ()) - set(ENGINES)
+    if unknown:
+        print(f"Unknown engines: {sorted(unknown)} (known: {', '.join(ENGINES)})")
+        return 2
+
+    print(f"Reference revision: {options['reference_rev']}")
+    report = run_harness(**options)
+
+    print("\n" + "="*60)
+    print("REGRESSION SUMMARY")
+    print("="*60)
+    for name, entry in report['engines'].items():
+        failed = [history for history, mismatches in entry['equivalence'].items() if mismatches]
+        print(f"  {name:10s} outputs: {'OK' if not failed else 'DIFFER on ' + ', '.join(failed)}")
+        if entry['performance']:
+            regressions = entry['performance']['regressions']
+            print(f"  {'':10s} performance: {'OK' if not regressions else '; '.join(regressions)}")
+
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport saved to: {REPORT_FILE}")
+    print("PASSED" if report['ok'] else "FAILED")
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
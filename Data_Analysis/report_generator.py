@@ -0,0 +1,270 @@
+"""
+Single-file HTML report of the analysis results.
+
+Collects the frequency, sum, even/odd and hot/cold results into one
+self-contained HTML file with inline SVG charts and compact data tables.
+No scripts, stylesheets or data are fetched when the file is opened, so a
+snapshot can be shared as a single file.
+
+The report only reads the aggregates the analysis scripts already wrote
+(the CSVs and hot_cold_numbers.json), it never touches the raw draws.
+
+Usage: python Data_Analysis/report_generator.py [output.html]
+"""
+
+import html
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from game_config import MAIN_NUMBERS_TOTAL, EURO_ERAS
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(base_dir, 'Reports')
+FREQUENCY_DIR = os.path.join(base_dir, 'Number_Frequency_Analysis')
+SUM_DIR = os.path.join(base_dir, 'Sum_Number_Analysis')
+EVEN_ODD_DIR = os.path.join(base_dir, 'Even_Odd_Analysis')
+HOT_COLD_FILE = os.path.join(base_dir, 'structured_pick_generator', 'hot_cold_numbers.json')
+
+CHART_WIDTH = 720
+CHART_HEIGHT = 240
+MARGIN = {'left': 52, 'right': 12, 'top': 12, 'bottom': 28}
+
+# Same palette as the Chart.js charts on the site
+COLORS = {
+    'bar': '#0d6efd',
+    'reference': '#dc3545',
+    'hot': '#dc3545',
+    'cold': '#0dcaf0',
+    'neutral': '#adb5bd'
+}
+
+STYLE = """
+body { font-family: -apple-system, "Segoe UI", Roboto, sans-serif; color: #333; max-width: 760px; margin: 0 auto; padding: 16px; }
+header { background: #343a40; color: white; padding: 12px 16px; border-radius: 4px; }
+h2 { border-bottom: 1px solid #dee2e6; padding-bottom: 4px; margin-top: 32px; }
+h3 { font-size: 1rem; color: #495057; }
+svg { display: block; max-width: 100%; height: auto; }
+svg text { font-size: 10px; fill: #495057; }
+.legend span { display: inline-block; margin-right: 12px; font-size: 0.85rem; }
+.legend i { display: inline-block; width: 10px; height: 10px; margin-right: 4px; }
+table { border-collapse: collapse; font-size: 0.8rem; margin: 8px 0; }
+th, td { padding: 2px 8px; text-align: right; border-bottom: 1px solid #e9ecef; }
+th { background: #f8f9fa; }
+details { margin: 8px 0 16px; }
+summary { cursor: pointer; color: #0d6efd; }
+.numbers span { display: inline-block; width: 28px; line-height: 28px; margin: 2px; border-radius: 50%; text-align: center; color: white; font-weight: bold; }
+footer { margin-top: 32px; font-size: 0.8rem; color: #6c757d; }
+"""
+
+
+def _fmt(value):
+    """Compact number formatting for axis labels"""
+    if abs(value) >= 1 or value == 0:
+        return f"{value:g}"
+    return f"{value:.3f}".rstrip('0')
+
+
+def svg_bar_chart(labels, values, reference=None, colors=None, label_step=1):
+    """
+    Inline SVG bar chart.
+
+    labels/values: one bar per label
+    reference: optional values drawn as a line over the bars (e.g. theory)
+    colors: optional color per bar, default is COLORS['bar']
+    label_step: label only every n-th bar on the x axis
+    """
+    values = [float(v) for v in values]
+    top = max(values + [float(v) for v in (reference or [])]) or 1.0
+    plot_width = CHART_WIDTH - MARGIN['left'] - MARGIN['right']
+    plot_height = CHART_HEIGHT - MARGIN['top'] - MARGIN['bottom']
+    slot = plot_width / len(values)
+    bottom = MARGIN['top'] + plot_height
+
+    def y(value):
+        return bottom - value / top * plot_height
+
+    parts = [f'<svg viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" xmlns="http://www.w3.org/2000/svg" role="img">']
+    for tick in range(5):
+        value = top * tick / 4
+        parts.append(f'<line x1="{MARGIN["left"]}" x2="{CHART_WIDTH - MARGIN["right"]}" y1="{y(value):.1f}" '
+                     f'y2="{y(value):.1f}" stroke="#e9ecef"/>')
+        parts.append(f'<text x="{MARGIN["left"] - 4}" y="{y(value) + 3:.1f}" text-anchor="end">{_fmt(round(value, 4))}</text>')
+
+    for i, (label, value) in enumerate(zip(labels, values)):
+        x = MARGIN['left'] + i * slot
+        color = colors[i] if colors else COLORS['bar']
+        parts.append(f'<rect x="{x + slot * 0.1:.1f}" y="{y(value):.1f}" width="{slot * 0.8:.1f}" '
+                     f'height="{bottom - y(value):.1f}" fill="{color}"><title>{html.escape(str(label))}: '
+                     f'{_fmt(value)}</title></rect>')
+        if i % label_step == 0:
+            parts.append(f'<text x="{x + slot / 2:.1f}" y="{bottom + 14}" text-anchor="middle">{html.escape(str(label))}</text>')
+
+    if reference is not None:
+        points = ' '.join(f'{MARGIN["left"] + (i + 0.5) * slot:.1f},{y(float(v)):.1f}' for i, v in enumerate(reference))
+        parts.append(f'<polyline points="{points}" fill="none" stroke="{COLORS["reference"]}" stroke-width="1.5"/>')
+
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def legend(*items):
+    """Legend line for (label, color) items"""
+    spans = ''.join(f'<span><i style="background:{color}"></i>{html.escape(label)}</span>' for label, color in items)
+    return f'<div class="legend">{spans}</div>'
+
+
+def html_table(df, formats=None):
+    """Compact HTML table of a DataFrame, formats maps column -> format spec"""
+    formats = formats or {}
+    head = ''.join(f'<th>{html.escape(str(c))}</th>' for c in df.columns)
+    rows = []
+    for record in df.itertuples(index=False):
+        cells = ''.join(f'<td>{format(value, formats.get(column, ""))}</td>'
+                        for column, value in zip(df.columns, record))
+        rows.append(f'<tr>{cells}</tr>')
+    return f'<table><thead><tr>{head}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
+
+
+def collapsible_table(summary, df, formats=None):
+    return f'<details><summary>{html.escape(summary)}</summary>{html_table(df, formats)}</details>'
+
+
+def euro_frequency_dir(era):
+    """Output folder of frequency_analysis_main_numbers.py for one era"""
+    return os.path.join(FREQUENCY_DIR, f"euro_numbers_{era['label'].lower().replace(' ', '_')}")
+
+
+def frequency_section():
+    main = pd.read_csv(os.path.join(FREQUENCY_DIR, 'main_numbers_frequency_analysis.csv'))
+    parts = ['<h2>Number frequencies</h2>', '<h3>Main numbers</h3>',
+             svg_bar_chart(main['Number'], main['Relative_Frequency'],
+                           reference=[1 / MAIN_NUMBERS_TOTAL] * len(main), label_step=5),
+             legend(('Relative frequency', COLORS['bar']), ('Uniform expectation', COLORS['reference'])),
+             collapsible_table('Main number table', main, {'Relative_Frequency': '.4f'})]
+
+    for era in EURO_ERAS:
+        folder = euro_frequency_dir(era)
+        euro = pd.read_csv(os.path.join(folder, 'absolute_frequencies.csv')).merge(
+            pd.read_csv(os.path.join(folder, 'relative_frequencies.csv')), on='Number')
+        parts += [f"<h3>Euro numbers, {html.escape(era['label'])}</h3>",
+                  svg_bar_chart(euro['Number'], euro['Relative_Frequency'],
+                                reference=[1 / era['max_euro']] * len(euro)),
+                  collapsible_table(f"Euro number table, {era['label']}", euro, {'Relative_Frequency': '.4f'})]
+    return ''.join(parts)
+
+
+def _sum_chart(prefix):
+    """Empirical sum distribution with the theoretical one as reference line"""
+    empirical = pd.read_csv(os.path.join(SUM_DIR, f'{prefix}_empirical_sum_distribution.csv'))
+    theoretical = pd.read_csv(os.path.join(SUM_DIR, f'{prefix}_theoretical_sum_distribution.csv'))
+    merged = theoretical[['sum', 'probability']].rename(columns={'probability': 'theoretical_probability'}).merge(
+        empirical, on='sum', how='left').fillna({'frequency': 0, 'probability': 0.0})
+    merged['frequency'] = merged['frequency'].astype(int)
+    chart = svg_bar_chart(merged['sum'], merged['probability'], reference=merged['theoretical_probability'].tolist(),
+                          label_step=max(1, len(merged) // 12))
+    observed = merged[merged['frequency'] > 0][['sum', 'frequency', 'probability', 'theoretical_probability']]
+    return chart, observed
+
+
+def sums_section():
+    formats = {'probability': '.4f', 'theoretical_probability': '.4f'}
+    chart, table = _sum_chart('main_numbers')
+    parts = ['<h2>Sum distributions</h2>', '<h3>Main numbers</h3>', chart,
+             legend(('Empirical', COLORS['bar']), ('Theoretical', COLORS['reference'])),
+             collapsible_table('Main number sums (observed values)', table, formats)]
+    for era in EURO_ERAS:
+        chart, table = _sum_chart(f"euro_numbers_{era['name']}")
+        parts += [f"<h3>Euro numbers, {html.escape(era['label'])}</h3>", chart,
+                  collapsible_table(f"Euro number sums, {era['label']}", table, formats)]
+    return ''.join(parts)
+
+
+def even_odd_section():
+    parts = ['<h2>Even/odd distribution</h2>',
+             legend(('Empirical', COLORS['bar']), ('Theoretical', COLORS['reference']))]
+    for kind, title in (('main', 'Main numbers'), ('euro', 'Euro numbers'), ('combined', 'Main and euro numbers')):
+        df = pd.read_csv(os.path.join(EVEN_ODD_DIR, f'{kind}_numbers_even_odd_analysis.csv'))
+        parts += [f'<h3>{title}</h3>',
+                  svg_bar_chart(df['even_count'].map(lambda k: f'{k} even'), df['empirical_relative_frequency'],
+                                reference=df['theoretical_probability'].tolist()),
+                  collapsible_table(f'{title} table', df, {'empirical_relative_frequency': '.4f',
+                                                           'theoretical_probability': '.4f'})]
+    return ''.join(parts)
+
+
+def hot_cold_section():
+    with open(HOT_COLD_FILE, encoding='utf-8') as f:
+        data = json.load(f)
+
+    parts = ['<h2>Hot and cold numbers</h2>']
+    for kind, title in (('main', 'Main numbers'), ('euro', 'Euro numbers (2022-present)')):
+        rows = [dict(item, category=category) for category in ('hot', 'cold', 'neutral') for item in data[kind][category]]
+        df = pd.DataFrame(rows).sort_values('number')
+        balls = ''.join(f'<span style="background:{COLORS[category]}">{item["number"]}</span>'
+                        for category in ('hot', 'cold') for item in data[kind][category])
+
+        columns = ['number', 'category', 'relativeFrequency']
+        if 'frequencyCI' in df.columns:
+            df['ciLow'] = df['frequencyCI'].str[0]
+            df['ciHigh'] = df['frequencyCI'].str[1]
+            columns += ['ciLow', 'ciHigh', 'hotProbability', 'coldProbability']
+
+        parts += [f'<h3>{title}</h3>', f'<div class="numbers">{balls}</div>',
+                  svg_bar_chart(df['number'], df['relativeFrequency'], colors=[COLORS[c] for c in df['category']],
+                                label_step=5 if len(df) > 20 else 1),
+                  legend(('Hot', COLORS['hot']), ('Cold', COLORS['cold']), ('Neutral', COLORS['neutral'])),
+                  collapsible_table(f'{title} table', df[columns],
+                                    {'relativeFrequency': '.4f', 'ciLow': '.4f', 'ciHigh': '.4f',
+                                     'hotProbability': '.3f', 'coldProbability': '.3f'})]
+    parts.append(f'<p>Hot/cold data last updated {html.escape(data.get("lastUpdated", "unknown"))}.</p>')
+    return ''.join(parts)
+
+
+SECTIONS = [frequency_section, sums_section, even_odd_section, hot_cold_section]
+
+
+def build_report(generated_at=None):
+    """The complete report as one HTML string"""
+    generated_at = generated_at or datetime.now()
+    body = ''.join(section() for section in SECTIONS)
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<title>Eurojackpot Analysis Report {generated_at:%Y-%m-%d}</title>'
+        f'<style>{STYLE}</style></head><body>'
+        f'<header><h1>Eurojackpot Analysis Report</h1>Generated {generated_at:%Y-%m-%d %H:%M}</header>'
+        f'{body}'
+        '<footer>Generated by report_generator.py from the analysis outputs in Data_Analysis/.</footer>'
+        '</body></html>'
+    )
+
+
+def main():
+    generated_at = datetime.now()
+    output_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        REPORT_DIR, f'eurojackpot_report_{generated_at:%Y%m%d_%H%M%S}.html')
+
+    started = time.perf_counter()
+    try:
+        report = build_report(generated_at)
+    except FileNotFoundError as e:
+        print(f"❌ Error: Missing analysis output {e.filename}, run the analysis scripts first")
+        return 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(report)
+    elapsed = time.perf_counter() - started
+
+    print(f"Report saved to: {output_file}")
+    print(f"File size: {os.path.getsize(output_file) / 1024:.1f} KB, built in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""
+Shared-memory arrays for process-pool workers.
+
+The parent process publishes named numpy arrays once into a single
+multiprocessing.shared_memory block. Workers receive only a small spec
+(block name plus dtype/shape/offset per array) and attach to the block by
+name; the arrays they get are read-only views on the shared pages, so
+nothing is pickled or copied per worker or per task and worker memory
+stays flat with the number of processes.
+
+Standard array sets:
+  draw_arrays(draws)          - draw matrix, dates, ids and bitmask encodings
+  combination_arrays(n, k)    - every k-of-n combination with its bitmask and sum
+
+Lifecycle: SharedArrays owns the block and unlinks it when closed (use it
+as a context manager around the pool). Attached blocks stay mapped for the
+life of the worker process and are not tracked there, so worker exits
+never remove a block the parent still uses.
+"""
+
+from itertools import combinations
+from math import comb
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from bitmask import encode
+from draw_store import DrawStore
+
+# Arrays start on cache line boundaries inside the block
+ALIGNMENT = 64
+
+# Blocks owned by this process, by name; attach() reuses them instead of
+# mapping the block a second time (forked workers inherit the mapping)
+_published = {}
+# Blocks attached by this process: name -> (SharedMemory, arrays)
+_attached = {}
+
+
+def _layout(arrays):
+    """Offset, dtype and shape of every array inside one block, plus the block size"""
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+    return layout, max(offset, 1)
+
+
+def _views(buffer, layout, writeable=False):
+    views = {}
+    for name, entry in layout.items():
+        shape = tuple(entry['shape'])
+        view = np.ndarray(shape, dtype=np.dtype(entry['dtype']), buffer=buffer, offset=entry['offset'])
+        view.flags.writeable = writeable
+        views[name] = view
+    return views
+
+
+class SharedArrays:
+    """
+    Named arrays copied once into a shared memory block.
+    `spec` is the picklable handle workers pass to attach().
+    """
+
+    def __init__(self, arrays):
+        arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+        layout, size = _layout(arrays)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        for name, view in _views(self._shm.buf, layout, writeable=True).items():
+            view[...] = arrays[name]
+        self.spec = {'name': self._shm.name, 'layout': layout}
+        self.arrays = _views(self._shm.buf, layout)
+        _published[self._shm.name] = self
+
+    @property
+    def nbytes(self):
+        return self._shm.size
+
+    def close(self):
+        """Unmap and remove the block. Safe to call more than once."""
+        if self._shm is None:
+            return
+        name = self._shm.name
+        _published.pop(name, None)
+        self.arrays = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views still referenced elsewhere keep the mapping alive until
+            # they are garbage collected; removing the name is still safe
+            pass
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _open_untracked(name):
+    """Attach to an existing block without registering it for cleanup in this process"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 every attach is registered with the resource
+        # tracker, which would unlink the block when the worker exits
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+def attach(spec):
+    """Read-only views of published arrays, attaching to the block once per process"""
+    name = spec['name']
+    if name in _published and _published[name].arrays is not None:
+        return _published[name].arrays
+    if name not in _attached:
+        shm = _open_untracked(name)
+        _attached[name] = (shm, _views(shm.buf, spec['layout']))
+    return _attached[name][1]
+
+
+def draw_arrays(draws):
+    """Columns of a DrawStore plus the main/euro bitmasks, ready to publish"""
+    return {
+        'ids': draws.ids,
+        'dates': draws.dates,
+        'main': draws.main,
+        'euro': draws.euro,
+        'main_masks': encode(draws.main),
+        'euro_masks': encode(draws.euro)
+    }
+
+
+def attach_draws(spec):
+    """DrawStore over published draw arrays (no copy) and the attached arrays"""
+    arrays = attach(spec)
+    return DrawStore(arrays['ids'], arrays['dates'], arrays['main'], arrays['euro']), arrays
+
+
+def combination_arrays(n_total, drawn):
+    """
+    Every combination of `drawn` numbers out of 1..n_total in lexicographic
+    order, with its bitmask and sum. For 5 of 50 these are 2,118,760 rows.
+    """
+    count = comb(n_total, drawn)
+    numbers = np.fromiter((n for combination in combinations(range(1, n_total + 1), drawn) for n in combination),
+                          dtype=np.int16, count=count * drawn).reshape(count, drawn)
+    return {
+        'combinations': numbers,
+        'combination_masks': encode(numbers),
+        'combination_sums': numbers.sum(axis=1, dtype=np.int16)
+    }
@@ -0,0 +1,256 @@
+"""
+Chunked streaming mode for very large draw histories.
+
+The in-memory scripts load the whole history into one DataFrame. For
+simulated or backtest histories with hundreds of millions of rows this
+module reads the CSV in fixed-size chunks and feeds them into mergeable
+accumulators, so memory stays constant regardless of history length.
+Accumulators produce the same tables as the in-memory path:
+
+  FrequencyAccumulator  - frequency_analysis_main_numbers.py
+  SumAccumulator        - create_empirical_distribution() in sum_number_analysis.py
+  EvenOddAccumulator    - analyze_even_odd_patterns() in generate_even_odd_csv.py
+  PatternAccumulator    - build_distributions() in Pattern_Analysis/pattern_analysis.py
+
+Accumulators from different files or workers can be combined with merge().
+
+Usage: python Data_Analysis/streaming_analysis.py [drawing_results.csv] [chunk_size]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Pattern_Analysis'))
+from pattern_analysis import draw_features, feature_value_range
+from draw_store import DRAWING_RESULTS_FILE
+from game_config import (
+    MAIN_NUMBERS_TOTAL, EURO_ERAS, MAIN_COLUMNS, EURO_COLUMNS, era_mask
+)
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def iter_draw_chunks(csv_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the drawing results file as DataFrames of at most chunk_size rows"""
+    dtypes = {column: np.int16 for column in MAIN_COLUMNS + EURO_COLUMNS}
+    dtypes['id'] = np.int64
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size, dtype=dtypes):
+        chunk['Datum'] = pd.to_datetime(chunk['Datum'])
+        yield chunk
+
+
+class FrequencyAccumulator:
+    """Absolute frequency of every number 1..max_number in the given columns"""
+
+    def __init__(self, columns, max_number):
+        self.columns = columns
+        self.max_number = max_number
+        self.counts = np.zeros(max_number + 1, dtype=np.int64)
+        self.draws = 0
+
+    def update(self, chunk):
+        numbers = chunk[self.columns].to_numpy(dtype=np.int64).ravel()
+        self.counts += np.bincount(numbers, minlength=self.max_number + 1)[:self.max_number + 1]
+        self.draws += len(chunk)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.draws += other.draws
+        return self
+
+    def result(self):
+        """(absolute_frequencies, relative_frequencies) dicts keyed by number"""
+        total = self.counts[1:].sum()
+        absolute = {number: int(self.counts[number]) for number in range(1, self.max_number + 1)}
+        relative = {number: freq / total for number, freq in absolute.items()}
+        return absolute, relative
+
+
+class SumAccumulator:
+    """Distribution of the per-draw sum of the given columns"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.draws = 0
+
+    def _add(self, counts):
+        if len(counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(counts) - len(self.counts)))
+        self.counts[:len(counts)] += counts
+
+    def update(self, chunk):
+        sums = chunk[self.columns].to_numpy(dtype=np.int64).sum(axis=1)
+        self._add(np.bincount(sums))
+        self.draws += len(chunk)
+
+    def merge(self, other):
+        self._add(other.counts)
+        self.draws += other.draws
+        return self
+
+    def result(self):
+        """DataFrame with sum, frequency and probability like create_empirical_distribution()"""
+        sums = np.nonzero(self.counts)[0]
+        frequency = self.counts[sums]
+        return pd.DataFrame({
+            'sum': sums,
+            'frequency': frequency,
+            'probability': frequency / self.draws
+        })
+
+
+class EvenOddAccumulator:
+    """Distribution of the number of even values per draw in the given columns"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.counts = np.zeros(len(columns) + 1, dtype=np.int64)
+        self.draws = 0
+
+    def update(self, chunk):
+        even_counts = (chunk[self.columns].to_numpy(dtype=np.int64) % 2 == 0).sum(axis=1)
+        self.counts += np.bincount(even_counts, minlength=len(self.columns) + 1)
+        self.draws += len(chunk)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.draws += other.draws
+        return self
+
+    def result(self, theoretical_probs=None):
+        """DataFrame in the layout of the *_even_odd_analysis.csv files"""
+        theoretical_probs = theoretical_probs or {}
+        return pd.DataFrame({
+            'even_count': np.arange(len(self.counts)),
+            'empirical_frequency': self.counts,
+            'empirical_relative_frequency': self.counts / self.draws,
+            'theoretical_probability': [theoretical_probs.get(k, 0.0) for k in range(len(self.counts))]
+        })
+
+
+class PatternAccumulator:
+    """Distributions of the structural draw features of pattern_analysis.py"""
+
+    def __init__(self, columns=MAIN_COLUMNS):
+        self.columns = columns
+        self.counts = {feature: np.zeros(feature_value_range(feature)[-1] + 1, dtype=np.int64)
+                       for feature in ('longest_run', 'decades_covered', 'low_count', 'spread')}
+        self.draws = 0
+
+    def update(self, chunk):
+        features = draw_features(np.sort(chunk[self.columns].to_numpy(), axis=1))
+        for feature, values in features.items():
+            self.counts[feature] += np.bincount(values, minlength=len(self.counts[feature]))
+        self.draws += len(chunk)
+
+    def merge(self, other):
+        for feature in self.counts:
+            self.counts[feature] += other.counts[feature]
+        self.draws += other.draws
+        return self
+
+    def result(self):
+        """{feature: DataFrame with value, frequency and empirical_probability}"""
+        tables = {}
+        for feature, counts in self.counts.items():
+            values = feature_value_range(feature)
+            tables[feature] = pd.DataFrame({
+                'value': values,
+                'frequency': counts[values],
+                'empirical_probability': counts[values] / self.draws
+            })
+        return tables
+
+
+class EraFilter:
+    """Feed only the draws of one euro era into a wrapped accumulator"""
+
+    def __init__(self, era, accumulator):
+        self.era = era
+        self.accumulator = accumulator
+
+    def update(self, chunk):
+        selected = chunk[era_mask(chunk['Datum'], self.era)]
+        if len(selected) > 0:
+            self.accumulator.update(selected)
+
+    def merge(self, other):
+        self.accumulator.merge(other.accumulator)
+        return self
+
+    def result(self, *args):
+        return self.accumulator.result(*args)
+
+
+def standard_accumulators():
+    """The accumulators covering the frequency, sum, even/odd and pattern analyses"""
+    accumulators = {
+        'main_frequency': FrequencyAccumulator(MAIN_COLUMNS, MAIN_NUMBERS_TOTAL),
+        'main_sum': SumAccumulator(MAIN_COLUMNS),
+        'main_even_odd': EvenOddAccumulator(MAIN_COLUMNS),
+        'euro_even_odd': EvenOddAccumulator(EURO_COLUMNS),
+        'combined_even_odd': EvenOddAccumulator(MAIN_COLUMNS + EURO_COLUMNS),
+        'main_patterns': PatternAccumulator(MAIN_COLUMNS)
+    }
+    for era in EURO_ERAS:
+        accumulators[f"euro_frequency_{era['name']}"] = EraFilter(era, FrequencyAccumulator(EURO_COLUMNS, era['max_euro']))
+        accumulators[f"euro_sum_{era['name']}"] = EraFilter(era, SumAccumulator(EURO_COLUMNS))
+    return accumulators
+
+
+def run_streaming(chunks, accumulators):
+    """Feed every chunk into every accumulator, returns the number of rows processed"""
+    rows = 0
+    for chunk in chunks:
+        for accumulator in accumulators.values():
+            accumulator.update(chunk)
+        rows += len(chunk)
+    return rows
+
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DRAWING_RESULTS_FILE
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_SIZE
+
+    print(f"Streaming {csv_path} in chunks of {chunk_size:,} draws...")
+    accumulators = standard_accumulators()
+    started = time.perf_counter()
+    rows = run_streaming(iter_draw_chunks(csv_path, chunk_size), accumulators)
+    elapsed = time.perf_counter() - started
+    print(f"Processed {rows:,} draws in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} draws/s)")
+
+    print("\n" + "="*60)
+    print("STREAMING RESULTS")
+    print("="*60)
+
+    main_absolute, _ = accumulators['main_frequency'].result()
+    most = max(main_absolute.items(), key=lambda x: x[1])
+    least = min(main_absolute.items(), key=lambda x: x[1])
+    print(f"Main numbers: most frequent #{most[0]} ({most[1]}), least frequent #{least[0]} ({least[1]})")
+
+    main_sums = accumulators['main_sum'].result()
+    print(f"Main number sum range: {main_sums['sum'].min()} - {main_sums['sum'].max()}")
+
+    for name in ('main_even_odd', 'euro_even_odd', 'combined_even_odd'):
+        table = accumulators[name].result()
+        distribution = ', '.join(f"{k}:{v}" for k, v in zip(table['even_count'], table['empirical_frequency']))
+        print(f"{name}: {distribution}")
+
+    for feature, table in accumulators['main_patterns'].result().items():
+        mean = (table['value'] * table['empirical_probability']).sum()
+        print(f"Pattern {feature}: mean {mean:.3f}")
+
+    for era in EURO_ERAS:
+        euro_sums = accumulators[f"euro_sum_{era['name']}"].result()
+        draws = accumulators[f"euro_sum_{era['name']}"].accumulator.draws
+        if draws > 0:
+            print(f"Euro {era['name']}: {draws} draws, sum range {euro_sums['sum'].min()} - {euro_sums['sum'].max()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from game_config import MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN
+from generate_hot_cold_numbers import categorize_numbers_with_frequencies
+
+MAIN_CSV = os.path.join(base_dir, '..', 'Number_Frequency_Analysis', 'main_numbers_frequency_analysis.csv')
+EURO_CSV = os.path.join(base_dir, '..', 'Number_Frequency_Analysis', 'euro_numbers_interval_3_(2022-present)', 'relative_frequencies.csv')
+
+# Quotas per strategy, same strategy names as structured-pick.js
+STRATEGIES = {
+    'hot-numbers': {'main': {'hot': 5}, 'euro': {'hot': 2}},
+    'cold-numbers': {'main': {'cold': 5}, 'euro': {'cold': 2}},
+    'mixed': {'main': {'hot': 2, 'cold': 2, 'neutral': 1}, 'euro': {'hot': 1, 'cold': 1}},
+    'weighted': {'main': None, 'euro': None}
+}
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table for O(1) sampling from a discrete distribution.
+    Sampled values are indices into the weights array.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=float)
+        if len(weights) == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Weights must be non-negative with a positive sum")
+
+        n = len(weights)
+        scaled = weights * n / weights.sum()
+        self.prob = np.ones(n)
+        self.alias = np.arange(n, dtype=np.int16)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Whatever is left over only differs from 1 by rounding errors
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng, size):
+        """Draw indices with the table's distribution, size may be a shape"""
+        columns = rng.integers(0, len(self.prob), size=size, dtype=np.int16)
+        accept = rng.random(size=size) < self.prob[columns]
+        return np.where(accept, columns, self.alias[columns])
+
+
+class WeightedPickGenerator:
+    """
+    Frequency-weighted picks of distinct numbers with per-category quotas.
+
+    numbers/weights describe the pool. categories maps a category name
+    (hot, cold, neutral) to the numbers in it, a quota of k draws k distinct
+    numbers from that category only. Picks are weighted draws without
+    replacement: every next number is drawn with probability proportional
+    to its weight among the numbers not picked yet. Each position is drawn
+    from the category's alias table and only the entries repeating an
+    earlier number of their row are redrawn; entries still repeating after
+    REDRAW_ROUNDS are drawn directly among the remaining numbers
+    (exponential keys log(u) / weight), so skewed weights cannot stall it.
+    """
+
+    REDRAW_ROUNDS = 8
+
+    def __init__(self, numbers, weights, categories=None):
+        numbers = np.asarray(numbers)
+        weights = np.asarray(weights, dtype=float)
+        lookup = dict(zip(numbers.tolist(), weights.tolist()))
+
+        categories = categories or {'all': numbers.tolist()}
+        self.categories = {}
+        for name, members in categories.items():
+            members = np.asarray(sorted(members))
+            member_weights = np.array([lookup[n] for n in members])
+            with np.errstate(divide='ignore'):
+                inverse_weights = 1.0 / member_weights
+            self.categories[name] = {
+                'members': members,
+                'table': AliasTable(member_weights),
+                'inverse_weights': inverse_weights,
+                'positive': int((member_weights > 0).sum())
+            }
+
+    def _draw_remaining(self, rng, entry, taken):
+        """One index per row of taken (rows x picked so far), weighted among the indices not taken"""
+        rows = np.arange(len(taken))[:, None]
+        keys = np.log(np.maximum(rng.random((len(taken), len(entry['members']))), 1e-300)) * entry['inverse_weights']
+        keys[rows, taken] = -np.inf
+        return keys.argmax(axis=1)
+
+    def sample_distinct(self, rng, category, count, batch_size):
+        """Sample batch_size rows of `count` distinct numbers from one category"""
+        entry = self.categories[category]
+        if count > entry['positive']:
+            raise ValueError(f"Quota {count} exceeds the {entry['positive']} numbers with a positive weight "
+                             f"in category '{category}'")
+
+        table = entry['table']
+        rows = np.empty((batch_size, count), dtype=table.alias.dtype)
+        for position in range(count):
+            column = table.sample(rng, batch_size)
+            earlier = rows[:, :position]
+            pending = np.nonzero((column[:, None] == earlier).any(axis=1))[0]
+            for _ in range(self.REDRAW_ROUNDS):
+                if len(pending) == 0:
+                    break
+                column[pending] = table.sample(rng, len(pending))
+                pending = pending[(column[pending, None] == earlier[pending]).any(axis=1)]
+            if len(pending):
+                column[pending] = self._draw_remaining(rng, entry, earlier[pending])
+            rows[:, position] = column
+        return entry['members'][rows]
+
+    def generate(self, rng, quotas, batch_size):
+        """
+        Generate batch_size picks, quotas maps category -> numbers per pick.
+        Returns an array of shape (batch_size, sum of quotas), sorted per row.
+        """
+        parts = [self.sample_distinct(rng, category, count, batch_size)
+                 for category, count in quotas.items() if count > 0]
+        return np.sort(np.hstack(parts), axis=1)
+
+
+def build_generators(main_csv=MAIN_CSV, euro_csv=EURO_CSV):
+    """Main and euro generators from the frequency analysis outputs"""
+    main_df = pd.read_csv(main_csv)
+    euro_df = pd.read_csv(euro_csv)
+    main_categories = categorize_numbers_with_frequencies(main_df, 10, 10, 'Relative_Frequency')
+    euro_categories = categorize_numbers_with_frequencies(euro_df, 3, 3, 'Relative_Frequency')
+
+    def generator(df, categories):
+        members = {name: [item['number'] for item in items] for name, items in categories.items()}
+        members['all'] = df['Number'].tolist()
+        return WeightedPickGenerator(df['Number'], df['Relative_Frequency'], members)
+
+    return generator(main_df, main_categories), generator(euro_df, euro_categories)
+
+
+def pick_stream(strategy='mixed', seed=None, batch_size=100_000, generators=None):
+    """
+    Endless stream of (main, euro) pick batches.
+    The same seed always yields the same sequence of batches.
+    """
+    main_generator, euro_generator = generators or build_generators()
+    quotas = STRATEGIES[strategy]
+    main_quotas = quotas['main'] or {'all': MAIN_NUMBERS_DRAWN}
+    euro_quotas = quotas['euro'] or {'all': EURO_NUMBERS_DRAWN}
+
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    while True:
+        yield (main_generator.generate(rng, main_quotas, batch_size),
+               euro_generator.generate(rng, euro_quotas, batch_size))
+
+
+def main():
+    total_picks = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    seed = 2025
+
+    print("Frequency-Weighted Pick Generator (alias method)")
+    print("=" * 50)
+    generators = build_generators()
+
+    for strategy in STRATEGIES:
+        stream = pick_stream(strategy, seed=seed, batch_size=min(total_picks, 250_000), generators=generators)
+
+        started = time.perf_counter()
+        generated = 0
+        first_batch = None
+        while generated < total_picks:
+            main_picks, euro_picks = next(stream)
+            if first_batch is None:
+                first_batch = (main_picks[:3], euro_picks[:3])
+            generated += len(main_picks)
+        elapsed = time.perf_counter() - started
+
+        print(f"\nStrategy: {strategy}")
+        print(f"  {generated:,} picks in {elapsed:.2f}s ({generated / elapsed:,.0f} picks/s)")
+        for main_numbers, euro_numbers in zip(*first_batch):
+            main_str = ' '.join(f"{num:2d}" for num in main_numbers)
+            euro_str = ' '.join(f"{num:2d}" for num in euro_numbers)
+            print(f"  Main: {main_str} | Euro: {euro_str}")
+
+
+if __name__ == "__main__":
+    main()
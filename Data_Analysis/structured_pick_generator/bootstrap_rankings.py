@@ -0,0 +1,100 @@
+import numpy as np
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from bitmask import encode, to_indicator
+from shared_arrays import SharedArrays, attach
+
+# Replicates are generated in fixed-size batches, each with its own seed.
+# Results therefore do not depend on the number of worker processes.
+BATCH_SIZE = 500
+
+# Below this many replicates a process pool costs more than it saves
+PARALLEL_MIN_REPLICATES = 20_000
+
+
+def _bootstrap_batch(indicator, batch_size, seed_sequence):
+    """
+    Absolute frequencies of every number for batch_size bootstrap replicates.
+    Resampling n draws with replacement is equivalent to drawing multinomial
+    weights per draw, so each replicate is one row of weights @ indicator.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    n_draws = indicator.shape[0]
+    weights = rng.multinomial(n_draws, np.full(n_draws, 1 / n_draws), size=batch_size)
+    return weights.astype(np.int32) @ indicator.astype(np.int32)
+
+
+def _bootstrap_shared_batch(spec, batch_size, seed_sequence):
+    """_bootstrap_batch on the indicator matrix published in shared memory"""
+    return _bootstrap_batch(attach(spec)['indicator'], batch_size, seed_sequence)
+
+
+def bootstrap_frequencies(numbers, max_number, replicates=2000, seed=2012, workers=None):
+    """
+    Bootstrap the absolute frequency of every number.
+
+    numbers: (draws, k) array of drawn numbers
+    Returns an array of shape (replicates, max_number).
+    """
+    indicator = to_indicator(encode(numbers), max_number)
+
+    batch_sizes = [BATCH_SIZE] * (replicates // BATCH_SIZE)
+    if replicates % BATCH_SIZE:
+        batch_sizes.append(replicates % BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and replicates >= PARALLEL_MIN_REPLICATES:
+        # Workers attach to one shared copy instead of receiving it with every batch
+        with SharedArrays({'indicator': indicator}) as shared, ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(_bootstrap_shared_batch, [shared.spec] * len(batch_sizes),
+                                        batch_sizes, seeds))
+    else:
+        batches = [_bootstrap_batch(indicator, size, seq) for size, seq in zip(batch_sizes, seeds)]
+
+    return np.vstack(batches)
+
+
+def ranking_stability(frequencies, hot_count, cold_count, confidence=0.95):
+    """
+    Summarize bootstrap frequencies per number.
+
+    frequencies: (replicates, max_number) absolute frequencies
+    Returns a dict keyed by number with the confidence interval of the
+    relative frequency and the probability of being in the hot / cold set.
+    Ties are broken towards the lower number, as a stable sort would.
+    """
+    replicates, max_number = frequencies.shape
+    relative = frequencies / frequencies.sum(axis=1, keepdims=True)
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(relative, [alpha, 1 - alpha], axis=0)
+
+    order = np.argsort(-frequencies, axis=1, kind='stable')
+    hot = np.zeros(max_number)
+    cold = np.zeros(max_number)
+    np.add.at(hot, order[:, :hot_count].ravel(), 1)
+    np.add.at(cold, order[:, max_number - cold_count:].ravel(), 1)
+
+    return {
+        number: {
+            'frequencyCI': [float(lower[number - 1]), float(upper[number - 1])],
+            'hotProbability': float(hot[number - 1] / replicates),
+            'coldProbability': float(cold[number - 1] / replicates)
+        }
+        for number in range(1, max_number + 1)
+    }
+
+
+def add_stability(categories, stability):
+    """Attach bootstrap statistics to every number of a hot/cold/neutral categorization"""
+    for group in ('hot', 'cold', 'neutral'):
+        for item in categories[group]:
+            item.update(stability[item['number']])
+    return categories
@@ -1,8 +1,21 @@
 import pandas as pd
 import json
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from game_config import MAIN_COLUMNS, EURO_COLUMNS, get_era, era_mask
+from bootstrap_rankings import bootstrap_frequencies, ranking_stability, add_stability
+from versioned_dataset import load_version, record_artifact
+
+# Bootstrap settings for the ranking stability statistics
+BOOTSTRAP_REPLICATES = 2000
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 2012
+# Dataset version of the frequency CSVs the categories are built from
+DATASET_VERSION = '20250808'
+
 def load_main_numbers_data(csv_path):
     """
     Load main numbers frequency data from CSV.
@@ -85,6 +98,17 @@ def categorize_numbers_with_frequencies(df, hot_count, cold_count, freq_column):
         'neutral': sorted(neutral_numbers, key=lambda x: x['number'])
     }
 
+def load_draws(version):
+    """
+    Load the drawing results the frequency CSVs were built from.
+    Returns main numbers of all draws, euro numbers of the current era
+    and the dataset version marker.
+    """
+    df, marker = load_version(version)
+    df['Datum'] = pd.to_datetime(df['Datum'])
+    euro_df = df[era_mask(df['Datum'], get_era('2022_present'))]
+    return df[MAIN_COLUMNS].to_numpy(), euro_df[EURO_COLUMNS].to_numpy(), marker
+
 def display_frequency_analysis(df, name, freq_column):
     """
     Display detailed frequency analysis for verification.
@@ -141,6 +165,14 @@ def generate_hot_cold_json():
         print(f"Categorizing euro numbers (3 hot, 3 cold)...")
         euro_categories = categorize_numbers_with_frequencies(euro_df, hot_count=3, cold_count=3, freq_column="Relative_Frequency")
         
+        # Bootstrap the draws to measure how stable the rankings are
+        print(f"Bootstrapping rankings ({BOOTSTRAP_REPLICATES} replicates)...")
+        main_draws, euro_draws, version = load_draws(DATASET_VERSION)
+        main_bootstrap = bootstrap_frequencies(main_draws, len(main_df), BOOTSTRAP_REPLICATES, seed=BOOTSTRAP_SEED)
+        euro_bootstrap = bootstrap_frequencies(euro_draws, len(euro_df), BOOTSTRAP_REPLICATES, seed=BOOTSTRAP_SEED + 1)
+        add_stability(main_categories, ranking_stability(main_bootstrap, 10, 10, BOOTSTRAP_CONFIDENCE))
+        add_stability(euro_categories, ranking_stability(euro_bootstrap, 3, 3, BOOTSTRAP_CONFIDENCE))
+        
         # Create final JSON structure
         hot_cold_data = {
             "main": main_categories,
@@ -158,7 +190,16 @@ def generate_hot_cold_json():
                     "mainNumbers": "main_numbers_frequency_analysis.csv",
                     "euroNumbers": "euro_numbers_interval_3_(2022-present)/relative_frequencies.csv"
                 },
-                "description": "Numbers categorized by relative frequency with frequency values included"
+                "description": "Numbers categorized by relative frequency with frequency values included",
+                "bootstrap": {
+                    "replicates": BOOTSTRAP_REPLICATES,
+                    "confidenceLevel": BOOTSTRAP_CONFIDENCE,
+                    "seed": BOOTSTRAP_SEED,
+                    "dataSource": "drawing_results.csv",
+                    "datasetVersion": version['version'],
+                    "description": "frequencyCI is the bootstrap confidence interval of the relative frequency, "
+                                   "hotProbability/coldProbability the share of replicates in which the number is hot/cold"
+                }
             }
         }
         
@@ -166,6 +207,7 @@ def generate_hot_cold_json():
         print(f"\nSaving to: {output_path}")
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(hot_cold_data, f, indent=2, ensure_ascii=False)
+        record_artifact(output_path, version, "generate_hot_cold_numbers.py")
         
         # Display results
         print("\n" + "="*70)
@@ -175,22 +217,22 @@ def generate_hot_cold_json():
         print(f"\nMain Numbers (1-50):")
         print(f"  Hot (10):")
         for item in main_categories['hot']:
-            print(f"    #{item['number']}: {item['relativeFrequency']:.6f}")
+            print(f"    #{item['number']}: {item['relativeFrequency']:.6f} (stays hot: {item['hotProbability']:.1%})")
         
         print(f"\n  Cold (10):")
         for item in main_categories['cold']:
-            print(f"    #{item['number']}: {item['relativeFrequency']:.6f}")
+            print(f"    #{item['number']}: {item['relativeFrequency']:.6f} (stays cold: {item['coldProbability']:.1%})")
         
         print(f"\n  Neutral ({len(main_categories['neutral'])}): [numbers with frequencies]")
         
         print(f"\nEuro Numbers (1-{len(euro_df)}):")
         print(f"  Hot (3):")
         for item in euro_categories['hot']:
-            print(f"    #{item['number']}: {item['relativeFrequency']:.6f}")
+            print(f"    #{item['number']}: {item['relativeFrequency']:.6f} (stays hot: {item['hotProbability']:.1%})")
         
         print(f"\n  Cold (3):")
         for item in euro_categories['cold']:
-            print(f"    #{item['number']}: {item['relativeFrequency']:.6f}")
+            print(f"    #{item['number']}: {item['relativeFrequency']:.6f} (stays cold: {item['coldProbability']:.1%})")
         
         print(f"\n  Neutral ({len(euro_categories['neutral'])}): [numbers with frequencies]")
         
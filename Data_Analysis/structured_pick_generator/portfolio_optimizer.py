@@ -0,0 +1,397 @@
+"""
+Portfolio optimizer for sets of tickets.
+
+Chooses N tickets that together cover as many main-number pairs/triples
+and euro pairs as possible, or overlap as little as possible, under
+user constraints. The rules of 6_additional_picks.py are special cases:
+fixed existing tickets, unique euro pairs and no shared main numbers
+between tickets with a common euro number.
+
+The search is simulated annealing over single-number swaps. Coverage
+counters are updated incrementally, so a move is scored by looking at
+the 4 pairs and 6 triples it touches instead of the whole portfolio.
+Pairwise overlap constraints are checked with bitmask ANDs over all
+tickets at once. Independent restarts run in parallel processes.
+
+Usage: python portfolio_optimizer.py [n_tickets] [objective] [iterations]
+"""
+
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(base_dir, '..'))
+
+from bitmask import encode, popcount
+from game_config import MAIN_NUMBERS_TOTAL, MAIN_NUMBERS_DRAWN, EURO_NUMBERS_DRAWN, EURO_ERAS
+
+MAX_EURO = EURO_ERAS[-1]['max_euro']
+
+# Weights of the score terms, the optimizer maximizes the weighted sum.
+# overlap is the number of shared numbers summed over all ticket pairs.
+OBJECTIVES = {
+    'pairs': {'main_pairs': 1.0, 'main_triples': 0.0, 'euro_pairs': 1.0, 'overlap': 0.0},
+    'triples': {'main_pairs': 0.0, 'main_triples': 1.0, 'euro_pairs': 1.0, 'overlap': 0.0},
+    'overlap': {'main_pairs': 0.0, 'main_triples': 0.0, 'euro_pairs': 0.0, 'overlap': -1.0}
+}
+
+# Score lost per unit of constraint violation
+VIOLATION_PENALTY = 50.0
+
+START_TEMPERATURE = 2.0
+END_TEMPERATURE = 0.01
+
+
+class PortfolioConstraints:
+    """
+    Constraints on the optimized tickets.
+
+    max_main_overlap: most main numbers any two tickets may share
+    max_main_overlap_shared_euro: same, for tickets with a common euro number
+    unique_euro_pairs: no two tickets may have the same euro pair
+    excluded_main / excluded_euro: numbers that must not be used
+    """
+
+    def __init__(self, max_main_overlap=None, max_main_overlap_shared_euro=None,
+                 unique_euro_pairs=False, excluded_main=(), excluded_euro=()):
+        self.max_main_overlap = MAIN_NUMBERS_DRAWN if max_main_overlap is None else max_main_overlap
+        self.max_main_overlap_shared_euro = (self.max_main_overlap if max_main_overlap_shared_euro is None
+                                             else max_main_overlap_shared_euro)
+        self.unique_euro_pairs = unique_euro_pairs
+        self.excluded_main = set(excluded_main)
+        self.excluded_euro = set(excluded_euro)
+
+    @property
+    def limits_overlap(self):
+        return min(self.max_main_overlap, self.max_main_overlap_shared_euro) < MAIN_NUMBERS_DRAWN
+
+
+def _index_tables(max_number):
+    """Flat lookup tables from (a, b) and (a, b, c) with a < b < c to a dense index"""
+    size = max_number + 1
+    pair_index = [-1] * (size * size)
+    for i, (a, b) in enumerate(combinations(range(1, size), 2)):
+        pair_index[a * size + b] = pair_index[b * size + a] = i
+    triple_index = {}
+    for i, triple in enumerate(combinations(range(1, size), 3)):
+        triple_index[triple] = i
+    return pair_index, triple_index
+
+
+class _AnnealingState:
+    """Tickets plus the incrementally maintained counters of one annealing run"""
+
+    def __init__(self, main, euro, n_fixed, weights, constraints):
+        self.main = [sorted(m) for m in main]
+        self.euro = [sorted(e) for e in euro]
+        self.n_fixed = n_fixed
+        self.weights = weights
+        self.constraints = constraints
+
+        self.main_size = MAIN_NUMBERS_TOTAL + 1
+        self.euro_size = MAX_EURO + 1
+        self.pair_index, triple_index = _index_tables(MAIN_NUMBERS_TOTAL)
+        self.euro_pair_index, _ = _index_tables(MAX_EURO)
+        # Triples are looked up by a flat integer key, which is faster than tuples
+        self.triple_index = {(a * self.main_size + b) * self.main_size + c: i
+                             for (a, b, c), i in triple_index.items()}
+
+        self.pair_count = [0] * (MAIN_NUMBERS_TOTAL * (MAIN_NUMBERS_TOTAL - 1) // 2)
+        self.triple_count = [0] * len(triple_index)
+        self.euro_pair_count = [0] * (MAX_EURO * (MAX_EURO - 1) // 2)
+        self.main_number_count = [0] * self.main_size
+        self.euro_number_count = [0] * self.euro_size
+
+        self.fixed_euro_pair_count = [0] * len(self.euro_pair_count)
+        for e in self.euro[:n_fixed]:
+            self.fixed_euro_pair_count[self.euro_pair_index[e[0] * self.euro_size + e[1]]] += 1
+
+        for m, e in zip(self.main, self.euro):
+            for a, b in combinations(m, 2):
+                self.pair_count[self.pair_index[a * self.main_size + b]] += 1
+            for a, b, c in combinations(m, 3):
+                self.triple_count[self.triple_index[(a * self.main_size + b) * self.main_size + c]] += 1
+            self.euro_pair_count[self.euro_pair_index[e[0] * self.euro_size + e[1]]] += 1
+            for n in m:
+                self.main_number_count[n] += 1
+            for n in e:
+                self.euro_number_count[n] += 1
+
+        self.main_masks = encode(np.array(self.main))
+        self.euro_masks = encode(np.array(self.euro))
+        self.score = self.full_score()
+
+    def _overlap_sum(self):
+        return (sum(c * (c - 1) // 2 for c in self.main_number_count) +
+                sum(c * (c - 1) // 2 for c in self.euro_number_count))
+
+    def _pair_violations(self, t, main_mask, euro_mask):
+        """Overlap excess of free ticket t (with the given masks) against all other tickets"""
+        overlaps = popcount(self.main_masks & main_mask).astype(np.int16)
+        shared_euro = (self.euro_masks & euro_mask) != 0
+        limits = np.where(shared_euro, self.constraints.max_main_overlap_shared_euro,
+                          self.constraints.max_main_overlap)
+        excess = np.maximum(overlaps - limits, 0)
+        excess[t] = 0
+        return int(excess.sum())
+
+    def _euro_pair_violations(self, pair, count):
+        """Duplicates of one euro pair, not counting those already among the fixed tickets"""
+        return max(0, count - max(1, self.fixed_euro_pair_count[pair]))
+
+    def violations(self):
+        """Constraint violations, pairs of two fixed tickets are not counted"""
+        total = 0
+        if self.constraints.limits_overlap:
+            overlaps = popcount(self.main_masks[:, None] & self.main_masks[None, :]).astype(np.int16)
+            shared_euro = (self.euro_masks[:, None] & self.euro_masks[None, :]) != 0
+            limits = np.where(shared_euro, self.constraints.max_main_overlap_shared_euro,
+                              self.constraints.max_main_overlap)
+            excess = np.triu(np.maximum(overlaps - limits, 0), k=1)
+            excess[:self.n_fixed, :self.n_fixed] = 0
+            total += int(excess.sum())
+        if self.constraints.unique_euro_pairs:
+            total += sum(self._euro_pair_violations(pair, count) for pair, count in enumerate(self.euro_pair_count))
+        return total
+
+    def metrics(self):
+        return {
+            'main_pairs': sum(1 for c in self.pair_count if c > 0),
+            'main_triples': sum(1 for c in self.triple_count if c > 0),
+            'euro_pairs': sum(1 for c in self.euro_pair_count if c > 0),
+            'overlap': self._overlap_sum(),
+            'violations': self.violations()
+        }
+
+    def full_score(self):
+        metrics = self.metrics()
+        return (sum(self.weights[key] * metrics[key] for key in self.weights) -
+                VIOLATION_PENALTY * metrics['violations'])
+
+    def main_swap_delta(self, t, x, y):
+        """Score change of replacing main number x by y in ticket t"""
+        size = self.main_size
+        others = [n for n in self.main[t] if n != x]
+        w = self.weights
+
+        pairs = 0
+        if w['main_pairs']:
+            for o in others:
+                pairs -= self.pair_count[self.pair_index[x * size + o]] == 1
+                pairs += self.pair_count[self.pair_index[y * size + o]] == 0
+
+        triples = 0
+        if w['main_triples']:
+            for o1, o2 in combinations(others, 2):
+                triples -= self.triple_count[self.triple_index[self._triple_key(x, o1, o2)]] == 1
+                triples += self.triple_count[self.triple_index[self._triple_key(y, o1, o2)]] == 0
+
+        overlap = self.main_number_count[y] - (self.main_number_count[x] - 1)
+
+        violations = 0
+        if self.constraints.limits_overlap:
+            old_mask = self.main_masks[t]
+            new_mask = old_mask ^ np.uint64(1 << (x - 1)) ^ np.uint64(1 << (y - 1))
+            violations = (self._pair_violations(t, new_mask, self.euro_masks[t]) -
+                          self._pair_violations(t, old_mask, self.euro_masks[t]))
+
+        return (w['main_pairs'] * pairs + w['main_triples'] * triples + w['overlap'] * overlap -
+                VIOLATION_PENALTY * violations)
+
+    def euro_swap_delta(self, t, x, y):
+        """Score change of replacing euro number x by y in ticket t"""
+        size = self.euro_size
+        other = self.euro[t][0] if self.euro[t][1] == x else self.euro[t][1]
+        old_pair = self.euro_pair_index[x * size + other]
+        new_pair = self.euro_pair_index[y * size + other]
+        old_count = self.euro_pair_count[old_pair]
+        new_count = self.euro_pair_count[new_pair]
+        w = self.weights
+
+        pairs = (new_count == 0) - (old_count == 1)
+        overlap = self.euro_number_count[y] - (self.euro_number_count[x] - 1)
+
+        violations = 0
+        if self.constraints.unique_euro_pairs:
+            violations += (self._euro_pair_violations(new_pair, new_count + 1) -
+                           self._euro_pair_violations(new_pair, new_count) +
+                           self._euro_pair_violations(old_pair, old_count - 1) -
+                           self._euro_pair_violations(old_pair, old_count))
+        if self.constraints.limits_overlap:
+            old_mask = self.euro_masks[t]
+            new_mask = old_mask ^ np.uint64(1 << (x - 1)) ^ np.uint64(1 << (y - 1))
+            violations += (self._pair_violations(t, self.main_masks[t], new_mask) -
+                           self._pair_violations(t, self.main_masks[t], old_mask))
+
+        return w['euro_pairs'] * pairs + w['overlap'] * overlap - VIOLATION_PENALTY * violations
+
+    def _triple_key(self, a, b, c):
+        if a > b:
+            a, b = b, a
+        if b > c:
+            b, c = c, b
+            if a > b:
+                a, b = b, a
+        return (a * self.main_size + b) * self.main_size + c
+
+    def apply_main_swap(self, t, x, y):
+        size = self.main_size
+        others = [n for n in self.main[t] if n != x]
+        for o in others:
+            self.pair_count[self.pair_index[x * size + o]] -= 1
+            self.pair_count[self.pair_index[y * size + o]] += 1
+        for o1, o2 in combinations(others, 2):
+            self.triple_count[self.triple_index[self._triple_key(x, o1, o2)]] -= 1
+            self.triple_count[self.triple_index[self._triple_key(y, o1, o2)]] += 1
+        self.main_number_count[x] -= 1
+        self.main_number_count[y] += 1
+        self.main[t] = sorted(others + [y])
+        self.main_masks[t] ^= np.uint64(1 << (x - 1)) ^ np.uint64(1 << (y - 1))
+
+    def apply_euro_swap(self, t, x, y):
+        size = self.euro_size
+        other = self.euro[t][0] if self.euro[t][1] == x else self.euro[t][1]
+        self.euro_pair_count[self.euro_pair_index[x * size + other]] -= 1
+        self.euro_pair_count[self.euro_pair_index[y * size + other]] += 1
+        self.euro_number_count[x] -= 1
+        self.euro_number_count[y] += 1
+        self.euro[t] = sorted([other, y])
+        self.euro_masks[t] ^= np.uint64(1 << (x - 1)) ^ np.uint64(1 << (y - 1))
+
+
+def _random_tickets(rng, n_tickets, main_pool, euro_pool):
+    main = [sorted(rng.choice(main_pool, MAIN_NUMBERS_DRAWN, replace=False).tolist()) for _ in range(n_tickets)]
+    euro = [sorted(rng.choice(euro_pool, EURO_NUMBERS_DRAWN, replace=False).tolist()) for _ in range(n_tickets)]
+    return main, euro
+
+
+def _anneal(n_tickets, weights, constraints, fixed, iterations, seed_sequence):
+    """One simulated annealing run, returns (score, main, euro, metrics) of the best portfolio seen"""
+    rng = np.random.default_rng(seed_sequence)
+    main_pool = np.array([n for n in range(1, MAIN_NUMBERS_TOTAL + 1) if n not in constraints.excluded_main])
+    euro_pool = np.array([n for n in range(1, MAX_EURO + 1) if n not in constraints.excluded_euro])
+
+    main, euro = _random_tickets(rng, n_tickets, main_pool, euro_pool)
+    fixed_main = [ticket['main_numbers'] for ticket in fixed]
+    fixed_euro = [ticket['euro_numbers'] for ticket in fixed]
+    state = _AnnealingState(fixed_main + main, fixed_euro + euro, len(fixed), weights, constraints)
+
+    # Pre-draw all random choices, the loop itself only does Python arithmetic
+    tickets = rng.integers(len(fixed), len(fixed) + n_tickets, size=iterations).tolist()
+    # Euro moves in proportion to the euro share of all numbers on a ticket
+    euro_move = (rng.random(iterations) < EURO_NUMBERS_DRAWN / (MAIN_NUMBERS_DRAWN + EURO_NUMBERS_DRAWN)).tolist()
+    positions = rng.random(iterations).tolist()
+    replacements = rng.random(iterations).tolist()
+    thresholds = rng.random(iterations).tolist()
+    main_pool = main_pool.tolist()
+    euro_pool = euro_pool.tolist()
+
+    cooling = (END_TEMPERATURE / START_TEMPERATURE) ** (1 / max(iterations - 1, 1))
+    temperature = START_TEMPERATURE
+    best_score = state.score
+    best = ([m[:] for m in state.main], [e[:] for e in state.euro])
+
+    for i in range(iterations):
+        t = tickets[i]
+        if euro_move[i]:
+            current, pool = state.euro[t], euro_pool
+        else:
+            current, pool = state.main[t], main_pool
+        x = current[int(positions[i] * len(current))]
+        y = pool[int(replacements[i] * len(pool))]
+        if y in current:
+            temperature *= cooling
+            continue
+
+        if euro_move[i]:
+            delta = state.euro_swap_delta(t, x, y)
+        else:
+            delta = state.main_swap_delta(t, x, y)
+
+        if delta >= 0 or thresholds[i] < math.exp(delta / temperature):
+            if euro_move[i]:
+                state.apply_euro_swap(t, x, y)
+            else:
+                state.apply_main_swap(t, x, y)
+            state.score += delta
+            if state.score > best_score + 1e-9:
+                best_score = state.score
+                best = ([m[:] for m in state.main], [e[:] for e in state.euro])
+        temperature *= cooling
+
+    best_state = _AnnealingState(best[0], best[1], len(fixed), weights, constraints)
+    return best_state.score, best[0][len(fixed):], best[1][len(fixed):], best_state.metrics()
+
+
+def optimize_portfolio(n_tickets, objective='pairs', constraints=None, fixed=(),
+                       iterations=200_000, restarts=None, seed=2025, workers=None):
+    """
+    Optimize a portfolio of n_tickets tickets.
+
+    objective: name in OBJECTIVES or a dict of weights with the same keys
+    fixed: already played tickets as dicts with main_numbers and euro_numbers;
+           they count towards coverage and constraints but are never changed
+    restarts: independent annealing runs, by default one per CPU core
+    Returns a dict with the best tickets, their score and coverage metrics.
+    """
+    weights = OBJECTIVES[objective] if isinstance(objective, str) else objective
+    constraints = constraints or PortfolioConstraints()
+    fixed = list(fixed)
+    restarts = restarts or os.cpu_count() or 1
+    workers = workers or os.cpu_count() or 1
+
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+    args = ([n_tickets] * restarts, [weights] * restarts, [constraints] * restarts,
+            [fixed] * restarts, [iterations] * restarts, seeds)
+    if workers > 1 and restarts > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, restarts)) as executor:
+            runs = list(executor.map(_anneal, *args))
+    else:
+        runs = [_anneal(*run_args) for run_args in zip(*args)]
+
+    score, main, euro, metrics = max(runs, key=lambda run: run[0])
+    return {
+        'tickets': [{'main_numbers': m, 'euro_numbers': e} for m, e in zip(main, euro)],
+        'score': score,
+        'metrics': metrics,
+        'restart_scores': [run[0] for run in runs]
+    }
+
+
+def main():
+    n_tickets = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    objective = sys.argv[2] if len(sys.argv) > 2 else 'pairs'
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+
+    print(f"Optimizing {n_tickets} tickets for objective '{objective}'")
+    print("=" * 50)
+    started = time.perf_counter()
+    result = optimize_portfolio(n_tickets, objective, iterations=iterations)
+    elapsed = time.perf_counter() - started
+
+    metrics = result['metrics']
+    total_pairs = MAIN_NUMBERS_TOTAL * (MAIN_NUMBERS_TOTAL - 1) // 2
+    total_triples = math.comb(MAIN_NUMBERS_TOTAL, 3)
+    total_euro_pairs = MAX_EURO * (MAX_EURO - 1) // 2
+    print(f"Finished {len(result['restart_scores'])} restarts in {elapsed:.2f}s")
+    print(f"Main pairs covered:   {metrics['main_pairs']}/{total_pairs} ({metrics['main_pairs'] / total_pairs:.1%})")
+    print(f"Main triples covered: {metrics['main_triples']}/{total_triples} ({metrics['main_triples'] / total_triples:.1%})")
+    print(f"Euro pairs covered:   {metrics['euro_pairs']}/{total_euro_pairs} ({metrics['euro_pairs'] / total_euro_pairs:.1%})")
+    print(f"Shared numbers over all ticket pairs: {metrics['overlap']}")
+    print(f"Constraint violations: {metrics['violations']}")
+
+    print("\nFirst tickets:")
+    for i, ticket in enumerate(result['tickets'][:10], start=1):
+        main_str = ' '.join(f"{num:2d}" for num in ticket['main_numbers'])
+        euro_str = ' '.join(f"{num:2d}" for num in ticket['euro_numbers'])
+        print(f"Pick {i:3d}: Main: {main_str} | Euro: {euro_str}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Versioned drawing results: one append-only history plus snapshot markers.
+
+Data/drawing_results.csv holds every draw once. A published version is a
+marker in Data/dataset_versions.json recording how many rows of the
+history belonged to it, so "the data as of version X" is a prefix of the
+history and slicing it costs O(1) - no duplicate snapshot files. Queries
+by date use a binary search over the sorted draw dates.
+
+Published artifacts record the version they were built from in
+artifact_versions.json next to this module.
+
+Usage:
+  python Data_Analysis/versioned_dataset.py                 (list versions, validate)
+  python Data_Analysis/versioned_dataset.py --publish VERSION
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from data_validation import DataValidationError, require_valid, validate_draws
+from draw_store import DATA_DIR, DRAWING_RESULTS_FILE, DrawStore
+
+VERSIONS_FILE = os.path.join(DATA_DIR, 'dataset_versions.json')
+ARTIFACT_VERSIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifact_versions.json')
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class VersionedDataset:
+    """The draw history with its published versions"""
+
+    def __init__(self, history_file=DRAWING_RESULTS_FILE, versions_file=VERSIONS_FILE):
+        self.history_file = history_file
+        self.versions_file = versions_file
+        self.frame = pd.read_csv(history_file)
+        self.store = DrawStore.from_frame(self.frame)
+        with open(versions_file, encoding='utf-8') as f:
+            self.versions = json.load(f)['versions']
+
+    def __len__(self):
+        return len(self.store)
+
+    @property
+    def latest(self):
+        """Latest published version marker"""
+        return self.versions[-1]
+
+    def version(self, version=None):
+        """Marker of a version, by default the latest published one"""
+        if version is None:
+            return self.latest
+        for marker in self.versions:
+            if marker['version'] == str(version):
+                return marker
+        known = ', '.join(marker['version'] for marker in self.versions)
+        raise KeyError(f"Unknown dataset version {version} (known: {known})")
+
+    def rows_as_of(self, version=None, date=None):
+        """
+        Number of history rows visible as of a version or a date.
+        A date includes the draws on that day; without a version the
+        date query runs over the whole history.
+        """
+        if date is None:
+            return self.version(version)['draws']
+        rows = int(np.searchsorted(self.store.dates, np.datetime64(date, 'D'), side='right'))
+        return rows if version is None else min(rows, self.version(version)['draws'])
+
+    def as_of(self, version=None, date=None):
+        """DrawStore view of the history as of a version or date (no copy)"""
+        rows = self.rows_as_of(version, date)
+        store = self.store
+        return DrawStore(store.ids[:rows], store.dates[:rows], store.main[:rows], store.euro[:rows])
+
+    def frame_as_of(self, version=None, date=None):
+        """DataFrame of the history as of a version or date, in drawing_results.csv layout"""
+        return self.frame.iloc[:self.rows_as_of(version, date)]
+
+    def version_of_rows(self, rows):
+        """Marker of the published version with exactly `rows` draws, None if there is none"""
+        for marker in self.versions:
+            if marker['draws'] == rows:
+                return marker
+        return None
+
+    def append(self, df):
+        """
+        Append new draws to the history file. The rows must continue the
+        history (newer ids and dates) and pass validation together with
+        the last stored draw; existing rows are never rewritten.
+        """
+        df = df[list(self.frame.columns)]
+        report = validate_draws(pd.concat([self.frame.tail(1), df], ignore_index=True), 'appended draws')
+        if not report.ok:
+            raise DataValidationError(report)
+        df.to_csv(self.history_file, mode='a', header=False, index=False)
+        self.frame = pd.concat([self.frame, df], ignore_index=True)
+        self.store = DrawStore.from_frame(self.frame)
+
+    def publish(self, version):
+        """Add a marker for the current end of the history"""
+        version = str(version)
+        if any(marker['version'] == version for marker in self.versions):
+            raise ValueError(f"Dataset version {version} already exists")
+        if version <= self.latest['version']:
+            raise ValueError(f"Version {version} must sort after the latest version {self.latest['version']}")
+        if len(self) <= self.latest['draws']:
+            raise ValueError(f"No draws appended since version {self.latest['version']}")
+
+        marker = {
+            'version': version,
+            'draws': len(self),
+            'lastDrawId': int(self.store.ids[-1]),
+            'lastDrawDate': str(self.store.dates[-1])
+        }
+        self.versions.append(marker)
+        with open(self.versions_file, 'w', encoding='utf-8') as f:
+            json.dump({'history': os.path.basename(self.history_file), 'versions': self.versions}, f, indent=2)
+            f.write('\n')
+        return marker
+
+    def validate(self):
+        """Validate the history and check that every marker matches it"""
+        report = validate_draws(self.frame, os.path.basename(self.history_file))
+        previous = 0
+        for marker in self.versions:
+            rows = marker['draws']
+            if rows <= previous or rows > len(self):
+                report.add('version_rows', 'error',
+                           f"Version {marker['version']} has {rows} draws, history has {len(self)}, "
+                           f"previous version {previous}")
+                continue
+            if (int(self.store.ids[rows - 1]) != marker['lastDrawId'] or
+                    str(self.store.dates[rows - 1]) != marker['lastDrawDate']):
+                report.add('version_marker', 'error',
+                           f"Version {marker['version']} ends at draw {marker['lastDrawId']} "
+                           f"({marker['lastDrawDate']}), history row {rows} is draw {self.store.ids[rows - 1]}",
+                           [self.store.ids[rows - 1]])
+            previous = rows
+        return report
+
+
+def load_version(version=None, dataset=None):
+    """
+    Validated DataFrame of the history as of a version, like DrawStore.load_validated().
+    Returns (df, marker); df is a copy the caller may modify.
+    """
+    if dataset is None:
+        dataset = VersionedDataset()
+    marker = dataset.version(version)
+    df = dataset.frame_as_of(marker['version']).copy()
+    return require_valid(df, f"drawing results {marker['version']}"), marker
+
+
+def record_artifact(paths, marker, generated_by):
+    """Record in artifact_versions.json which dataset version the given output files were built from"""
+    try:
+        with open(ARTIFACT_VERSIONS_FILE, encoding='utf-8') as f:
+            artifacts = json.load(f)
+    except FileNotFoundError:
+        artifacts = {}
+
+    for path in [paths] if isinstance(paths, str) else paths:
+        name = os.path.relpath(os.path.abspath(path), REPO_ROOT).replace(os.sep, '/')
+        artifacts[name] = {
+            'datasetVersion': marker['version'],
+            'draws': marker['draws'],
+            'lastDrawId': marker['lastDrawId'],
+            'generatedBy': generated_by
+        }
+
+    with open(ARTIFACT_VERSIONS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(artifacts.items())), f, indent=2)
+        f.write('\n')
+
+
+def main():
+    dataset = VersionedDataset()
+    args = sys.argv[1:]
+    if args[:1] == ['--publish']:
+        marker = dataset.publish(args[1])
+        print(f"Published version {marker['version']}: {marker['draws']} draws up to draw {marker['lastDrawId']}")
+        return 0
+
+    print(f"History {os.path.basename(dataset.history_file)}: {len(dataset)} draws")
+    for marker in dataset.versions:
+        print(f"  {marker['version']}: {marker['draws']} draws, last draw {marker['lastDrawId']} "
+              f"({marker['lastDrawDate']})")
+    unpublished = len(dataset) - dataset.latest['draws']
+    if unpublished:
+        print(f"  ({unpublished} draws not yet published)")
+
+    report = dataset.validate()
+    print(report.summary())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
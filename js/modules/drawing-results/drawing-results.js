@@ -1,104 +1,89 @@
+const RESULTS_DIR = 'Data_Analysis/Prize_Analysis/results';
+
 let drawingData = [];
 let prizeData = [];
+let resultsIndex = null;
+// Shard file -> promise of its rows, so every shard is requested at most once
+const loadedShards = new Map();
+
+function addResultRows(view) {
+    // Arrays are pre-joined and in draw order, numbers are already sorted
+    const draws = new Map(drawingData.map(result => [result.id, result]));
+    const prizes = new Map(prizeData.map(entry => [entry.id, entry]));
+    
+    view.ids.forEach((id, index) => {
+        draws.set(id, {
+            id: id,
+            date: view.dates[index],
+            mainNumbers: view.mainNumbers[index],
+            euroNumbers: view.euroNumbers[index]
+        });
+        if (view.prizes[index] !== null) {
+            prizes.set(id, {
+                id: id,
+                prizes: view.prizes[index],
+                winners: view.winners[index],
+                totalPayout: view.totalPayout[index],
+                rolloverChain: view.rolloverChain[index]
+            });
+        }
+    });
+    
+    drawingData = [...draws.values()].sort((a, b) => a.id - b.id);
+    prizeData = [...prizes.values()].sort((a, b) => a.id - b.id);
+}
 
-async function loadDrawingData() {
+async function loadResultsIndex() {
     try {
-        console.log('Attempting to load drawing data from: Data_Analysis/Data/drawing_results_20250829.csv');
-        const response = await fetch('Data_Analysis/Data/drawing_results_20250829.csv');
-        console.log('Drawing data response status:', response.status);
+        console.log(`Attempting to load results index from: ${RESULTS_DIR}/index.json`);
+        const response = await fetch(`${RESULTS_DIR}/index.json`);
+        console.log('Results index response status:', response.status);
         
         if (!response.ok) {
-            throw new Error(`Failed to load drawing data: ${response.status} ${response.statusText}`);
+            throw new Error(`Failed to load results index: ${response.status} ${response.statusText}`);
         }
-        const text = await response.text();
-        console.log('Drawing data loaded, first 100 chars:', text.substring(0, 100));
+        resultsIndex = await response.json();
         
-        const lines = text.trim().split('\n');
+        // The index embeds the latest draws, older ones live in the shards
+        addResultRows(resultsIndex.latest);
         
-        drawingData = lines.slice(1).map(line => {
-            const values = line.split(',');
-            return {
-                id: parseInt(values[0]),
-                date: values[1],
-                mainNumbers: [
-                    parseInt(values[2]),
-                    parseInt(values[3]),
-                    parseInt(values[4]),
-                    parseInt(values[5]),
-                    parseInt(values[6])
-                ].sort((a, b) => a - b),
-                euroNumbers: [
-                    parseInt(values[7]),
-                    parseInt(values[8])
-                ].sort((a, b) => a - b)
-            };
-        });
-        
-        console.log(`Loaded ${drawingData.length} drawing results`);
+        console.log(`Loaded ${drawingData.length} latest drawing results, ${resultsIndex.shards.length} shards available`);
         return drawingData;
         
     } catch (error) {
-        console.error('Error loading drawing data:', error);
-        throw new Error(`Drawing data: ${error.message}`);
+        console.error('Error loading results index:', error);
+        throw new Error(`Results index: ${error.message}`);
     }
 }
 
-async function loadPrizeData() {
-    try {
-        console.log('Attempting to load prize data from: Data_Analysis/Data/price_breakdown.csv');
-        const response = await fetch('Data_Analysis/Data/price_breakdown.csv');
-        console.log('Prize data response status:', response.status);
-        
-        if (!response.ok) {
-            throw new Error(`Failed to load prize data: ${response.status} ${response.statusText}`);
-        }
-        const text = await response.text();
-        console.log('Prize data loaded, first 100 chars:', text.substring(0, 100));
-        
-        const lines = text.trim().split('\n');
-        
-        prizeData = lines.slice(1).map(line => {
-            const values = line.split(',');
-            return {
-                id: parseInt(values[0]),
-                prizes: [
-                    parseFloat(values[1]),  // price_category_1
-                    parseFloat(values[2]),  // price_category_2
-                    parseFloat(values[3]),  // price_category_3
-                    parseFloat(values[4]),  // price_category_4
-                    parseFloat(values[5]),  // price_category_5
-                    parseFloat(values[6]),  // price_category_6
-                    parseFloat(values[7]),  // price_category_7
-                    parseFloat(values[8]),  // price_category_8
-                    parseFloat(values[9]),  // price_category_9
-                    parseFloat(values[10]), // price_category_10
-                    parseFloat(values[11]), // price_category_11
-                    parseFloat(values[12])  // price_category_12
-                ],
-                winners: [
-                    parseInt(values[13]), // winner_1
-                    parseInt(values[14]), // winner_2
-                    parseInt(values[15]), // winner_3
-                    parseInt(values[16]), // winner_4
-                    parseInt(values[17]), // winner_5
-                    parseInt(values[18]), // winner_6
-                    parseInt(values[19]), // winner_7
-                    parseInt(values[20]), // winner_8
-                    parseInt(values[21]), // winner_9
-                    parseInt(values[22]), // winner_10
-                    parseInt(values[23]), // winner_11
-                    parseInt(values[24])  // winner_12
-                ]
-            };
-        });
-        
-        console.log(`Loaded ${prizeData.length} price breakdown records`);
-        return prizeData;
-        
-    } catch (error) {
-        console.error('Error loading prize data:', error);
-        throw new Error(`Prize data: ${error.message}`);
+function loadShard(shard) {
+    if (!loadedShards.has(shard.file)) {
+        // The content hash busts cached copies only for shards that changed
+        const request = fetch(`${RESULTS_DIR}/${shard.file}?v=${shard.hash}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Failed to load ${shard.file}: ${response.status} ${response.statusText}`);
+                }
+                return response.json();
+            })
+            .then(view => {
+                addResultRows(view);
+                console.log(`Loaded shard ${shard.file} (${shard.draws} draws)`);
+            })
+            .catch(error => {
+                loadedShards.delete(shard.file);
+                throw error;
+            });
+        loadedShards.set(shard.file, request);
     }
+    return loadedShards.get(shard.file);
+}
+
+async function loadResultsSince(date) {
+    // Shards are ordered by date, load every shard that reaches into the range
+    const cutoff = date.toISOString().slice(0, 10);
+    const shards = resultsIndex.shards.filter(shard => shard.lastDate >= cutoff);
+    await Promise.all(shards.map(loadShard));
 }
 
 function formatCurrency(amount, isJackpot = false) {
@@ -258,18 +243,22 @@ function createResultDisplay(result) {
     `;
 }
 
+function twelveMonthsAgo() {
+    const date = new Date();
+    date.setMonth(date.getMonth() - 12);
+    return date;
+}
+
 function populateDropdown() {
     const dropdown = document.querySelector('#dateSelector');
     if (!dropdown || drawingData.length === 0) return;
     
     // Get last 12 months of data
-    const today = new Date();
-    const twelveMonthsAgo = new Date();
-    twelveMonthsAgo.setMonth(today.getMonth() - 12);
+    const cutoff = twelveMonthsAgo();
     
     const recentData = drawingData.filter(result => {
         const resultDate = new Date(result.date);
-        return resultDate >= twelveMonthsAgo;
+        return resultDate >= cutoff;
     });
     
     // Sort by date descending
@@ -317,8 +306,8 @@ function displayResult(result, isLatest = false) {
 
 function updateStatistics() {
     const totalElement = document.getElementById('total-drawings');
-    if (totalElement && drawingData.length > 0) {
-        totalElement.textContent = drawingData.length.toLocaleString();
+    if (totalElement && resultsIndex) {
+        totalElement.textContent = resultsIndex.metadata.totalDraws.toLocaleString();
     }
 }
 
@@ -352,22 +341,8 @@ async function loadDrawingResults() {
         console.log('Loading drawing results...');
         console.log('Current page URL:', window.location.href);
         
-        // Try to load drawing data first
-        try {
-            await loadDrawingData();
-        } catch (drawingError) {
-            console.error('Failed to load drawing data:', drawingError);
-            throw new Error(`Drawing data could not be loaded: ${drawingError.message}`);
-        }
-        
-        // Try to load prize data (optional - if it fails, continue without prizes)
-        try {
-            await loadPrizeData();
-            console.log('Prize data loaded successfully');
-        } catch (prizeError) {
-            console.warn('Prize data could not be loaded:', prizeError);
-            console.log('Continuing without prize breakdown data');
-        }
+        // The index carries the latest draws, enough for the first render
+        await loadResultsIndex();
         
         // Display latest result
         const latestResult = drawingData[drawingData.length - 1];
@@ -379,6 +354,11 @@ async function loadDrawingResults() {
         
         console.log('Drawing results module loaded successfully');
         
+        // The dropdown lists the last 12 months; load their shards after rendering
+        loadResultsSince(twelveMonthsAgo())
+            .then(populateDropdown)
+            .catch(error => console.error('Error loading older drawing results:', error));
+        
     } catch (error) {
         console.error('Error loading drawing results:', error);
         
@@ -389,7 +369,7 @@ async function loadDrawingResults() {
                     <i class="bi bi-exclamation-triangle me-2"></i>
                     <strong>Error loading data:</strong> ${error.message}
                     <br><small>Current URL: ${window.location.href}</small>
-                    <br><small>Expected files: Data_Analysis/Data/drawing_results_20250829.csv and Data_Analysis/Data/price_breakdown.csv</small>
+                    <br><small>Expected file: ${RESULTS_DIR}/index.json</small>
                     <br><small>Check browser console for detailed error information</small>
                 </div>
             `;
@@ -37,16 +37,27 @@ async function loadCSVData(filename) {
   }
 }
 
+// Dataset version the sum charts are built from (see Data_Analysis/Data/dataset_versions.json)
+const SUMS_DATASET_VERSION = '20250808';
+
 // Function to load raw drawing data with time filtering
 async function loadRawDrawingData() {
   try {
-    const response = await fetch('Data_Analysis/Data/drawing_results_20250808.csv');
+    const [response, versionsResponse] = await Promise.all([
+      fetch('Data_Analysis/Data/drawing_results.csv'),
+      fetch('Data_Analysis/Data/dataset_versions.json')
+    ]);
     const text = await response.text();
+    const { versions } = await versionsResponse.json();
     const rows = text.trim().split('\n');
     const headers = rows[0].split(',');
     
+    // The history is append-only, so a version is its first `draws` rows
+    const version = versions.find(v => v.version === SUMS_DATASET_VERSION) || versions[versions.length - 1];
+    const lastRow = Math.min(rows.length - 1, version.draws);
+    
     const data = [];
-    for (let i = 1; i < rows.length; i++) {
+    for (let i = 1; i <= lastRow; i++) {
       const columns = rows[i].split(',');
       if (columns.length >= headers.length) {
         const record = {};